@@ -1,150 +1,788 @@
 import sys
 import os
 import time
+import inspect
+import threading
 import requests
 import subprocess
 import configparser
 import re
-import json
 import qdarkstyle
 import html
-import os
-from pathlib import Path
-from lxml import etree
+import heapq
+import functools
+from collections import OrderedDict
 from datetime import datetime
-from dateutil import parser, tz
-import xml.etree.ElementTree as ET
-from PyQt5.QtGui import QIcon, QFont
+from iptv_core import (
+    DEFAULT_API_CACHE_TTLS, DEFAULT_EPG_CACHE_TTL, CATEGORY_ACTIONS, STREAM_ACTIONS,
+    DEFAULT_POOL_SIZE, DEFAULT_RETRIES, DEFAULT_BACKOFF_FACTOR, PLAYLIST_TABS, DEFAULT_HEALTH_TTL, DEFAULT_SLOW_AFTER,
+    AccountStatusCache, ApiCache, ApiFetch, UsageStats, EPGChannelMap, EPGStore, HealthCache, SeriesRecord, StreamRecord, XtreamClient,
+    SearchIndex, account_cache_dir, configure_http_clients, configure_tracing, span, tracer, fold_text, load_epg, load_m3u, parse_m3u_plus_url, resolve_epg_channel_ids,
+    check_accounts, probe_concurrency, probe_streams
+)
+from PyQt5.QtGui import QIcon, QFont, QFontDatabase, QPainter, QPen
 from PyQt5.QtCore import (
-    Qt, QTimer, QPropertyAnimation, QEasingCurve, QSize, QObject, pyqtSignal, QRunnable, pyqtSlot, QThreadPool, QDir
+    Qt, QTimer, QPropertyAnimation, QEasingCurve, QSize, QObject, pyqtSignal, QRunnable, pyqtSlot, QThreadPool, QThread,
+    QDir, QAbstractListModel, QAbstractProxyModel, QModelIndex, QEvent, QRect
 )
 from PyQt5 import QtWidgets
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QLineEdit, QLabel, QPushButton,
-    QListWidget, QWidget, QFileDialog, QCheckBox, QSizePolicy, QHBoxLayout,
-    QDialog, QFormLayout, QDialogButtonBox, QTabWidget, QListWidgetItem,
-    QSpinBox, QMenu, QAction, QTextEdit
+    QListView, QAbstractItemView, QWidget, QFileDialog, QCheckBox, QSizePolicy, QHBoxLayout,
+    QFormLayout, QTabWidget, QSpinBox, QMenu, QAction, QTextEdit, QToolTip, QComboBox
 )
 
 is_windows = sys.platform.startswith('win')
 is_mac = sys.platform.startswith('darwin')
 is_linux = sys.platform.startswith('linux')
 
-# EPG Cache File
-cache_file = Path.home() / '.iptv' / 'epg_cache1.xml'
-os.makedirs(cache_file.parent, exist_ok=True)
+# Delay between the last keystroke and running the search
+SEARCH_DEBOUNCE_MS = 150
 
-CUSTOM_USER_AGENT = (
-    "Connection: Keep-Alive User-Agent: okhttp/5.0.0-alpha.2 "
-    "Accept-Encoding: gzip, deflate"
-)
+# Now-playing labels are redrawn this long after the programme boundary they wait for,
+# and the refresh timer is never armed for longer than the cap
+NOW_PLAYING_SLACK_MS = 500
+NOW_PLAYING_MAX_WAIT_MS = 3600 * 1000
+
+# New stream-to-guide matches are written to disk this long after the first unsaved one
+EPG_MATCHES_SAVE_DELAY_MS = 2000
+
+# Rows kept across all built navigation levels before the least recently shown are dropped
+LEVEL_CACHE_MAX_ROWS = 300000
 
-def normalize_channel_name(name):
-    name = name.lower().strip()
-    name = re.sub(r'\s+', ' ', name)
-    name = re.sub(r'[^\w\s]', '', name)
-    name = re.sub(r'\b(hd|sd|channel|tv)\b', '', name)
-    name = name.strip()
-    return name
+# Background prefetch: how many of the most used categories to warm at login, how long
+# the pointer must rest on a series before its info is fetched, and the worker count
+PREFETCH_TOP_CATEGORIES = 5
+PREFETCH_HOVER_DELAY_MS = 300
+PREFETCH_THREADS = 2
+
+# Rows of a stream list that arrive after the first screenful are added to the list at
+# most this often
+STREAM_FLUSH_MS = 100
+
+# How often the Info tab's timing summary is redrawn while it is shown
+TIMING_REFRESH_MS = 1000
+
+# What happens to streams a health check found dead, by the [Health] DeadStreams value,
+# and how often a running check re-sorts or re-filters the list it is checking
+DEAD_STREAM_MODES = {
+    'mark': "Mark dead",
+    'last': "Dead last",
+    'hide': "Hide dead",
+}
+HEALTH_APPLY_MS = 1000
+
+# The address book rechecks every saved account this often while it is open; on opening
+# it rechecks those whose last status is older than that
+ACCOUNT_STATUS_REFRESH_MS = 5 * 60 * 1000
 
 class EPGWorkerSignals(QObject):
-    finished = pyqtSignal(dict, dict)
-    error = pyqtSignal(str)
+    # Every signal starts with the worker's session, so a guide of an account the
+    # user has since left is recognised and dropped
+    finished = pyqtSignal(int, object, object, dict)
+    download_progress = pyqtSignal(int, object, object)
+    progress = pyqtSignal(int, int, str)
+    error = pyqtSignal(int, str)
 
 class EPGWorker(QRunnable):
-    def __init__(self, server, username, password, http_method):
+    def __init__(self, epg_url, cache_dir, http_method, cache_ttl=DEFAULT_EPG_CACHE_TTL, session=0):
         super().__init__()
-        self.server = server
-        self.username = username
-        self.password = password
+        self.epg_url = epg_url
+        self.cache_dir = cache_dir
         self.http_method = http_method
+        self.cache_ttl = cache_ttl
+        self.session = session
         self.signals = EPGWorkerSignals()
 
     @pyqtSlot()
     def run(self):
         try:
-            cache_file = 'epg_cache1.xml'
-            cache_valid = False
-            if os.path.exists(cache_file):
-                cache_age = time.time() - os.path.getmtime(cache_file)
-                if cache_age < 3600:  
-                    cache_valid = True
-
-            if cache_valid:
-                with open(cache_file, 'rb') as f:
-                    epg_xml_data = f.read()
-            else:
-                epg_url = f"{self.server}/xmltv.php?username={self.username}&password={self.password}"
-                headers = {'User-Agent': CUSTOM_USER_AGENT}
-                if self.http_method == 'POST':
-                    response = requests.post(epg_url, headers=headers, timeout=10)
-                else:
-                    response = requests.get(epg_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                epg_xml_data = response.content
-                with open(cache_file, 'wb') as f:
-                    f.write(epg_xml_data)
-
-            epg_data, channel_id_to_names = self.parse_epg_data(epg_xml_data)
-            self.signals.finished.emit(epg_data, channel_id_to_names)
+            epg_data, channel_id_to_names = load_epg(
+                self.epg_url, self.cache_dir, self.http_method, self.cache_ttl,
+                download_progress=lambda received, total: self.signals.download_progress.emit(self.session, received, total),
+                progress=lambda percent, text: self.signals.progress.emit(self.session, percent, text)
+            )
+            self.signals.finished.emit(self.session, self.cache_dir, epg_data, channel_id_to_names)
         except Exception as e:
-            self.signals.error.emit(str(e))
+            self.signals.error.emit(self.session, str(e))
+
+class RequestWorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(object)
+    batch = pyqtSignal(object)
+
+class RequestWorker(QRunnable):
+    """
+    Runs one blocking call (typically a player_api.php request) on the thread pool
+    and hands the result or the raised exception back to the GUI thread. If the call
+    returns a generator, every value it yields is emitted as a `batch` and its return
+    value is the result. A cancelled worker stops at the next batch and never emits;
+    a call that can stop sooner is handed `cancel_event`, which cancel() sets.
+    """
+
+    def __init__(self, fn, *args, cancel_event=None):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.cancel_event = cancel_event
+        self.cancelled = False
+        self.signals = RequestWorkerSignals()
+
+    def cancel(self):
+        self.cancelled = True
+        if self.cancel_event is not None:
+            self.cancel_event.set()
 
-    def parse_epg_data(self, epg_xml_data):
-        epg_dict = {}
-        channel_id_to_names = {}
+    @pyqtSlot()
+    def run(self):
+        if self.cancelled:
+            return
         try:
-            epg_tree = ET.fromstring(epg_xml_data)
-            for channel in epg_tree.findall('channel'):
-                channel_id = channel.get('id')
-                if channel_id:
-                    channel_id = channel_id.strip().lower()
-                    display_names = []
-                    for display_name_elem in channel.findall('display-name'):
-                        if display_name_elem.text:
-                            display_name = display_name_elem.text.strip()
-                            normalized_name = normalize_channel_name(display_name)
-                            display_names.append(normalized_name)
-                    channel_id_to_names[channel_id] = display_names
-
-            for programme in epg_tree.findall('programme'):
-                channel_id = programme.get('channel')
-                if channel_id:
-                    channel_id = channel_id.strip().lower()
-                start_time = programme.get('start')
-                stop_time = programme.get('stop')
-                title_elem = programme.find('title')
-                description_elem = programme.find('desc')
-
-                title = title_elem.text.strip() if title_elem is not None and title_elem.text else ''
-                description = description_elem.text.strip() if description_elem is not None and description_elem.text else ''
-
-                epg_entry = {
-                    'start_time': start_time,
-                    'stop_time': stop_time,
-                    'title': title,
-                    'description': description
-                }
+            result = self.fn(*self.args)
+            if inspect.isgenerator(result):
+                result = self.drain(result)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(e)
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+    def drain(self, generator):
+        while True:
+            try:
+                batch = next(generator)
+            except StopIteration as stop:
+                return stop.value
+            if self.cancelled:
+                generator.close()
+                return None
+            self.signals.batch.emit(batch)
+
+class EntryListModel(QAbstractListModel):
+    """
+    Flat list model over raw entry data (category dicts, stream dicts, season numbers...).
+    Display text and tooltips come from `formatter`, which turns a list of entries into
+    (text, tooltip) pairs. It is only called for rows the view actually asks for, and
+    the result is cached per row. A formatter may add a third item, the epoch time the
+    text goes out of date; expire() then drops and repaints just those rows. `label`
+    gives the plain text a row is sorted and searched by. An optional "Go Back" row is
+    pinned at the top.
+    """
+
+    def __init__(self, entries, formatter, label, icon, go_back=False, go_back_icon=None):
+        super().__init__()
+        self.entries = entries
+        self.formatter = formatter
+        self.label = label
+        self.icon = icon
+        self.go_back = go_back
+        self.go_back_icon = go_back_icon
+        self._formatted = [None] * len(entries)
+        self._expiries = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.entries) + (1 if self.go_back else 0)
+
+    def entry_index(self, row):
+        """Entry index for a model row, or None for the "Go Back" row."""
+        if self.go_back:
+            return row - 1 if row > 0 else None
+        return row
+
+    def source_row(self, entry_index):
+        return entry_index + 1 if self.go_back else entry_index
+
+    def ensure_formatted(self, entry_indexes):
+        """Format every not-yet-formatted entry in `entry_indexes` with one formatter call."""
+        missing = [i for i in entry_indexes if self._formatted[i] is None]
+        if missing:
+            rows = self.formatter([self.entries[i] for i in missing])
+            for i, row in zip(missing, rows):
+                self._formatted[i] = row
+                if len(row) > 2 and row[2] is not None:
+                    heapq.heappush(self._expiries, (row[2], i))
+
+    def expire(self, now):
+        """Drop the text of rows that went out of date by `now` and repaint those rows."""
+        expired = []
+        while self._expiries and self._expiries[0][0] <= now:
+            expires, i = heapq.heappop(self._expiries)
+            row = self._formatted[i]
+            # Skip heap entries left over from text that was already reformatted
+            if row is not None and len(row) > 2 and row[2] == expires:
+                self._formatted[i] = None
+                expired.append(i)
+        for i in expired:
+            index = self.index(self.source_row(i))
+            self.dataChanged.emit(index, index)
+        return expired
+
+    def next_expiry(self):
+        return self._expiries[0][0] if self._expiries else None
+
+    def append_entries(self, entries):
+        """Add rows at the end, e.g. as a streamed response arrives."""
+        if not entries:
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.entries.extend(entries)
+        self._formatted.extend([None] * len(entries))
+        self.endInsertRows()
+
+    def refresh_entries(self, entry_indexes):
+        """Drop the cached text of just these entries and repaint their rows."""
+        for i in entry_indexes:
+            self._formatted[i] = None
+            index = self.index(self.source_row(i))
+            self.dataChanged.emit(index, index)
+
+    def invalidate(self):
+        """Drop the cached text, e.g. once EPG data arrives, and repaint."""
+        self._formatted = [None] * len(self.entries)
+        self._expiries = []
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry_index = self.entry_index(index.row())
+        if entry_index is None:
+            if role == Qt.DisplayRole:
+                return "Go Back"
+            if role == Qt.DecorationRole:
+                return self.go_back_icon
+            return None
+
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            self.ensure_formatted((entry_index,))
+            text, tooltip = self._formatted[entry_index][:2]
+            if role == Qt.DisplayRole:
+                return text
+            return tooltip or None
+        if role == Qt.DecorationRole:
+            return self.icon
+        if role == Qt.UserRole:
+            return self.entries[entry_index]
+        return None
+
+class EntryProxyModel(QAbstractProxyModel):
+    """
+    Sort/filter proxy for an EntryListModel. The visible order is a plain list of entry
+    indexes, so sorting is one Python sort over the rows' labels and filtering swaps in
+    a list of matching entries; neither calls data() per row. The source's "Go Back"
+    row always stays first, and when no entries are visible a disabled placeholder row
+    is shown ("Not Found" while filtered, otherwise `empty_text` if set). Demoted
+    entries (dead streams) can be moved after all others or left out.
+    """
+
+    # Visible rows are formatted in blocks of this size so the formatter can batch work
+    FORMAT_BLOCK = 64
+
+    def __init__(self, source_model, empty_text=None):
+        super().__init__()
+        self._order = list(range(len(source_model.entries)))
+        self._rows = self._order
+        self._filter = None
+        self._demoted = frozenset()
+        self._demote_mode = None
+        self._positions = None
+        self._search_index = None
+        self.filtered = False
+        self.empty_text = empty_text
+        self.setSourceModel(source_model)
+        self._update_row_count()
+        source_model.dataChanged.connect(self.on_source_data_changed)
+        source_model.rowsInserted.connect(self.on_source_rows_inserted)
+
+    def _offset(self):
+        return 1 if self.sourceModel().go_back else 0
+
+    def placeholder(self):
+        if self._rows:
+            return None
+        return "Not Found" if self.filtered else self.empty_text
+
+    def is_placeholder_row(self, row):
+        return row == self._offset() and self.placeholder() is not None
+
+    def _update_row_count(self):
+        # Views call index() once per row while laying out, so keep it free of Python calls
+        extra = 1 if self.placeholder() is not None else 0
+        self._row_count = self._offset() + len(self._rows) + extra
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if column or not 0 <= row < self._row_count or parent.isValid():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        source = self.sourceModel()
+        row = proxy_index.row()
+        offset = self._offset()
+        if row < offset:
+            return source.index(0)
+        position = row - offset
+        if position >= len(self._rows):
+            return QModelIndex()
+        return source.index(source.source_row(self._rows[position]))
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        source = self.sourceModel()
+        entry_index = source.entry_index(source_index.row())
+        if entry_index is None:
+            return self.index(0)
+        if self._positions is None:
+            self._positions = {entry: position for position, entry in enumerate(self._rows)}
+        position = self._positions.get(entry_index)
+        if position is None:
+            return QModelIndex()
+        return self.index(self._offset() + position)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if self.is_placeholder_row(row):
+            return self.placeholder() if role == Qt.DisplayRole else None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            position = row - self._offset()
+            if position >= 0:
+                block = position - position % self.FORMAT_BLOCK
+                self.sourceModel().ensure_formatted(self._rows[block:block + self.FORMAT_BLOCK])
+        return self.sourceModel().data(self.mapToSource(index), role)
+
+    def flags(self, index):
+        if not index.isValid() or self.is_placeholder_row(index.row()):
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def sort(self, column=0, order=Qt.AscendingOrder):
+        """Order all entries by their label."""
+        source = self.sourceModel()
+        labels = [source.label(entry) for entry in source.entries]
+        self.beginResetModel()
+        self._order.sort(key=labels.__getitem__, reverse=(order == Qt.DescendingOrder))
+        self._search_index = None
+        if self.filtered:
+            rank = {entry: position for position, entry in enumerate(self._order)}
+            self._filter.sort(key=rank.__getitem__)
+        self._rows = self._arranged()
+        self._positions = None
+        self._update_row_count()
+        self.endResetModel()
+
+    def build_search_index(self):
+        if self._search_index is None:
+            source = self.sourceModel()
+            self._search_index = SearchIndex([source.label(source.entries[i]) for i in self._order])
+        return self._search_index
+
+    def search(self, text):
+        """Show only rows whose label contains `text`, ignoring case and accents."""
+        positions = self.build_search_index().search(text)
+        if positions is None:
+            if self.filtered:
+                self.set_filter(None)
+            return
+        order = self._order
+        self.set_filter([order[position] for position in positions])
+
+    def visible_entries(self):
+        """The entries currently shown, in display order."""
+        entries = self.sourceModel().entries
+        return [entries[i] for i in self._rows]
+
+    def visible_entry_indexes(self):
+        return list(self._rows)
+
+    def set_filter(self, entry_indexes):
+        """Show only `entry_indexes` (in display order), or everything again when None."""
+        self.beginResetModel()
+        if entry_indexes is None:
+            self._filter = None
+            self.filtered = False
+        else:
+            self._filter = list(entry_indexes)
+            self.filtered = True
+        self._rows = self._arranged()
+        self._positions = None
+        self._update_row_count()
+        self.endResetModel()
+
+    def set_demoted(self, entry_indexes, mode):
+        """
+        Move `entry_indexes` after every other row (mode 'last') or leave them out (mode
+        'hide'). Any other mode, or no entries, restores the plain order.
+        """
+        demoted = frozenset(entry_indexes) if mode in ('last', 'hide') else frozenset()
+        if demoted == self._demoted and (not demoted or mode == self._demote_mode):
+            return
+        self.beginResetModel()
+        self._demoted = demoted
+        self._demote_mode = mode
+        self._rows = self._arranged()
+        self._positions = None
+        self._update_row_count()
+        self.endResetModel()
+
+    def _arranged(self):
+        """The rows to show: the filter's (or all) entries with demoted ones moved or dropped."""
+        rows = self._filter if self.filtered else self._order
+        demoted = self._demoted
+        if not demoted:
+            return rows
+        arranged = [i for i in rows if i not in demoted]
+        if self._demote_mode == 'last':
+            arranged.extend(i for i in rows if i in demoted)
+        return arranged
+
+    def on_source_data_changed(self, top_left, bottom_right, roles=()):
+        if top_left == bottom_right:
+            index = self.mapFromSource(top_left)
+            if index.isValid():
+                self.dataChanged.emit(index, index, roles)
+        elif self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), roles)
+
+    def on_source_rows_inserted(self, parent, first, last):
+        """Entries appended to the source show up at the end, in arrival order."""
+        source = self.sourceModel()
+        new_entries = range(source.entry_index(first), source.entry_index(last) + 1)
+        self._search_index = None
+        if self.filtered:
+            self._order.extend(new_entries)
+            return
+        if self.placeholder() is not None or self._rows is not self._order:
+            # The placeholder row gives way to the first real rows, or demoted rows are
+            # kept last
+            self.beginResetModel()
+            self._order.extend(new_entries)
+            self._rows = self._arranged()
+            self._positions = None
+            self._update_row_count()
+            self.endResetModel()
+            return
+        start = self._offset() + len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_entries) - 1)
+        self._order.extend(new_entries)
+        self._positions = None
+        self._update_row_count()
+        self.endInsertRows()
+
+class EPGGridView(QtWidgets.QAbstractScrollArea):
+    """
+    Channels x time programme grid. Nothing is laid out ahead of time: every paint asks
+    the EPGStore for the programmes of the visible rows inside the visible time window
+    only, so scrolling costs the same with ten channels or ten thousand and a day or a
+    week of guide. The channel column and time header stay pinned while scrolling.
+    """
+
+    ROW_HEIGHT = 32
+    HEADER_HEIGHT = 24
+    CHANNEL_WIDTH = 180
+    PIXELS_PER_MINUTE = 4
+    TICK_SECONDS = 1800
+
+    # The entry of a double-clicked channel row
+    channel_activated = pyqtSignal(object)
+
+    def __init__(self, store, channels, parent=None):
+        """`channels` is a list of (name, epg_channel_id, entry) in display order."""
+        super().__init__(parent)
+        self.store = store
+        self.channels = channels
+        now = time.time()
+        guide_range = store.time_span(channel_id for _, channel_id, _ in channels) or (now, now + 86400)
+        # Start on a whole hour so the header ticks line up
+        self.span_start = int(min(guide_range[0], now)) // 3600 * 3600
+        self.span_stop = max(guide_range[1], now + 3600)
+        self.viewport().setMouseTracking(True)
+        self.update_scrollbars()
+
+    def seconds_per_pixel(self):
+        return 60 / self.PIXELS_PER_MINUTE
+
+    def grid_size(self):
+        viewport = self.viewport()
+        return viewport.width() - self.CHANNEL_WIDTH, viewport.height() - self.HEADER_HEIGHT
+
+    def update_scrollbars(self):
+        grid_width, grid_height = self.grid_size()
+        total_width = int((self.span_stop - self.span_start) / self.seconds_per_pixel())
+        horizontal = self.horizontalScrollBar()
+        horizontal.setRange(0, max(0, total_width - grid_width))
+        horizontal.setPageStep(max(1, grid_width))
+        horizontal.setSingleStep(self.PIXELS_PER_MINUTE * 15)
+        vertical = self.verticalScrollBar()
+        vertical.setRange(0, max(0, len(self.channels) * self.ROW_HEIGHT - grid_height))
+        vertical.setPageStep(max(1, grid_height))
+        vertical.setSingleStep(self.ROW_HEIGHT)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def visible_time(self):
+        """The (start, stop) epoch window currently on screen."""
+        grid_width, _ = self.grid_size()
+        start = self.span_start + self.horizontalScrollBar().value() * self.seconds_per_pixel()
+        return start, start + grid_width * self.seconds_per_pixel()
+
+    def scroll_to_time(self, timestamp):
+        """Scroll horizontally so `timestamp` sits a little right of the channel column."""
+        self.horizontalScrollBar().setValue(int((timestamp - self.span_start) / self.seconds_per_pixel()))
+
+    def jump_to_now(self):
+        self.scroll_to_time(time.time() - self.TICK_SECONDS)
+
+    def scroll_by_time(self, seconds):
+        self.scroll_to_time(self.visible_time()[0] + seconds)
+
+    def x_for_time(self, timestamp):
+        return self.CHANNEL_WIDTH + (timestamp - self.span_start) / self.seconds_per_pixel() - self.horizontalScrollBar().value()
+
+    def row_at(self, y):
+        if y < self.HEADER_HEIGHT:
+            return None
+        row = (y - self.HEADER_HEIGHT + self.verticalScrollBar().value()) // self.ROW_HEIGHT
+        return row if 0 <= row < len(self.channels) else None
+
+    def programme_at(self, pos):
+        """(row, programme) under a viewport position; programme is None over the channel column."""
+        row = self.row_at(pos.y())
+        if row is None:
+            return None, None
+        if pos.x() < self.CHANNEL_WIDTH:
+            return row, None
+        timestamp = self.visible_time()[0] + (pos.x() - self.CHANNEL_WIDTH) * self.seconds_per_pixel()
+        programmes = self.store.programmes_between(self.channels[row][1], timestamp, timestamp + 1)
+        return row, programmes[0] if programmes else None
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        palette = self.palette()
+        metrics = painter.fontMetrics()
+        width, height = self.viewport().width(), self.viewport().height()
+        now = time.time()
+        start, stop = self.visible_time()
+        offset_y = self.verticalScrollBar().value()
+        first_row = offset_y // self.ROW_HEIGHT
+        last_row = min(len(self.channels), (offset_y + height - self.HEADER_HEIGHT) // self.ROW_HEIGHT + 1)
+
+        painter.fillRect(0, 0, width, height, palette.base())
+        painter.setClipRect(self.CHANNEL_WIDTH, self.HEADER_HEIGHT, width, height)
+        grid_pen = QPen(palette.mid().color())
+        for row in range(first_row, last_row):
+            y = self.HEADER_HEIGHT + row * self.ROW_HEIGHT - offset_y
+            for programme in self.store.programmes_between(self.channels[row][1], start, stop):
+                left = max(self.x_for_time(programme.start), self.CHANNEL_WIDTH - 1)
+                right = min(self.x_for_time(programme.stop), width + 1)
+                rect = QRect(int(left), y, int(right - left), self.ROW_HEIGHT)
+                if programme.start <= now < programme.stop:
+                    painter.fillRect(rect, palette.highlight())
+                    painter.setPen(palette.highlightedText().color())
+                else:
+                    painter.fillRect(rect, palette.alternateBase())
+                    painter.setPen(palette.text().color())
+                text_rect = rect.adjusted(4, 0, -4, 0)
+                painter.drawText(
+                    text_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                    metrics.elidedText(programme.title, Qt.ElideRight, text_rect.width())
+                )
+                painter.setPen(grid_pen)
+                painter.drawRect(rect)
+        now_x = int(self.x_for_time(now))
+        painter.setPen(QPen(Qt.red, 2))
+        painter.drawLine(now_x, self.HEADER_HEIGHT, now_x, height)
+
+        # Time header
+        painter.setClipRect(self.CHANNEL_WIDTH, 0, width, self.HEADER_HEIGHT)
+        painter.fillRect(0, 0, width, self.HEADER_HEIGHT, palette.button())
+        painter.setPen(palette.buttonText().color())
+        tick = -(-int(start) // self.TICK_SECONDS) * self.TICK_SECONDS
+        while tick < stop:
+            x = int(self.x_for_time(tick))
+            moment = datetime.fromtimestamp(tick)
+            label = moment.strftime("%a %I:%M %p") if moment.hour == 0 and moment.minute == 0 else moment.strftime("%I:%M %p")
+            painter.drawLine(x, self.HEADER_HEIGHT - 6, x, self.HEADER_HEIGHT)
+            painter.drawText(x + 4, 0, 200, self.HEADER_HEIGHT, Qt.AlignVCenter | Qt.AlignLeft, label)
+            tick += self.TICK_SECONDS
+
+        # Channel column and the date in the corner
+        painter.setClipping(False)
+        painter.fillRect(0, 0, self.CHANNEL_WIDTH, height, palette.button())
+        painter.drawText(
+            4, 0, self.CHANNEL_WIDTH - 8, self.HEADER_HEIGHT, Qt.AlignVCenter | Qt.AlignLeft,
+            datetime.fromtimestamp(start).strftime("%a %d %b")
+        )
+        painter.setClipRect(0, self.HEADER_HEIGHT, self.CHANNEL_WIDTH, height)
+        for row in range(first_row, last_row):
+            y = self.HEADER_HEIGHT + row * self.ROW_HEIGHT - offset_y
+            rect = QRect(0, y, self.CHANNEL_WIDTH, self.ROW_HEIGHT)
+            painter.setPen(palette.buttonText().color())
+            painter.drawText(
+                rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignLeft,
+                metrics.elidedText(self.channels[row][0], Qt.ElideRight, self.CHANNEL_WIDTH - 12)
+            )
+            painter.setPen(grid_pen)
+            painter.drawLine(0, y + self.ROW_HEIGHT, self.CHANNEL_WIDTH, y + self.ROW_HEIGHT)
+        painter.end()
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip:
+            row, programme = self.programme_at(event.pos())
+            if programme is not None:
+                times = (
+                    f"{datetime.fromtimestamp(programme.start).strftime('%a %I:%M %p')} - "
+                    f"{datetime.fromtimestamp(programme.stop).strftime('%I:%M %p')}"
+                )
+                text = f"<b>{html.escape(programme.title)}</b><br>{times}"
+                if programme.description:
+                    text += f"<div style=\"max-width: 300px; white-space: normal;\">{html.escape(programme.description)}</div>"
+                QToolTip.showText(event.globalPos(), text, self.viewport())
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        row = self.row_at(event.pos().y())
+        if row is not None:
+            self.channel_activated.emit(self.channels[row][2])
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Home:
+            self.jump_to_now()
+        else:
+            super().keyPressEvent(event)
 
-                if channel_id not in epg_dict:
-                    epg_dict[channel_id] = []
-                epg_dict[channel_id].append(epg_entry)
+class EPGGridDialog(QtWidgets.QDialog):
+    # Repaint this often so the now line and the highlighted programmes keep moving
+    NOW_REFRESH_MS = 60 * 1000
 
-            return epg_dict, channel_id_to_names
+    def __init__(self, store, channels, title, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"TV Guide - {title}")
+        self.resize(1000, 600)
 
-        except Exception as e:
-            print(f"Error parsing EPG data: {e}")
-            return {}, {}
+        layout = QtWidgets.QVBoxLayout(self)
+        buttons_layout = QHBoxLayout()
+        self.previous_day_button = QPushButton("Previous Day")
+        self.previous_day_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaSeekBackward))
+        self.now_button = QPushButton("Now")
+        self.now_button.setToolTip("Jump to the programmes airing now (Home)")
+        self.next_day_button = QPushButton("Next Day")
+        self.next_day_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaSeekForward))
+        buttons_layout.addWidget(self.previous_day_button)
+        buttons_layout.addWidget(self.now_button)
+        buttons_layout.addWidget(self.next_day_button)
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+
+        self.grid = EPGGridView(store, channels, self)
+        layout.addWidget(self.grid)
+
+        self.previous_day_button.clicked.connect(lambda: self.grid.scroll_by_time(-86400))
+        self.next_day_button.clicked.connect(lambda: self.grid.scroll_by_time(86400))
+        self.now_button.clicked.connect(self.grid.jump_to_now)
+
+        self.now_timer = QTimer(self)
+        self.now_timer.setInterval(self.NOW_REFRESH_MS)
+        self.now_timer.timeout.connect(self.grid.viewport().update)
+        self.now_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Scroll ranges depend on the final size, so position once the dialog is laid out
+        QTimer.singleShot(0, self.grid.jump_to_now)
+
+class LevelViewCache:
+    """
+    Built proxy models of navigation levels, keyed by the level's navigation stack
+    entry (or the tab name for the category list), so a level can be shown again
+    without rebuilding it. Least recently shown levels are dropped once the cached
+    models hold more than `max_rows` rows.
+    """
+
+    def __init__(self, max_rows=LEVEL_CACHE_MAX_ROWS):
+        self.max_rows = max_rows
+        self.rows = 0
+        self._views = OrderedDict()
+
+    def get(self, level):
+        item = self._views.get(id(level))
+        if item is None or item[0] is not level:
+            return None
+        self._views.move_to_end(id(level))
+        return item[2]
+
+    def put(self, level, tab_name, proxy):
+        self.discard(level)
+        rows = proxy.sourceModel().rowCount()
+        self._views[id(level)] = (level, tab_name, proxy, rows)
+        self.rows += rows
+        while self.rows > self.max_rows and len(self._views) > 1:
+            _, (_, _, _, evicted_rows) = self._views.popitem(last=False)
+            self.rows -= evicted_rows
+
+    def discard(self, level):
+        item = self._views.get(id(level))
+        if item is not None and item[0] is level:
+            del self._views[id(level)]
+            self.rows -= item[3]
+
+    def views(self, tab_name):
+        return [proxy for _, name, proxy, _ in self._views.values() if name == tab_name]
+
+    def clear(self):
+        self._views.clear()
+        self.rows = 0
 
 class AddressBookDialog(QtWidgets.QDialog):
+    """
+    The accounts saved in credentials.ini with their status, expiry, connections and
+    latency. The last known status of each shows at once; the Xtream accounts (and
+    get.php playlists, by their credentials) are then checked concurrently in the
+    background, and again every few minutes while the dialog is open.
+    """
+
+    COLUMNS = ["Name", "Status", "Expires", "Connections", "Latency", "Checked"]
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Address Book")
-        self.setMinimumSize(400, 300)
+        self.setMinimumSize(700, 300)
         self.parent = parent
 
         layout = QtWidgets.QVBoxLayout(self)
-        self.credentials_list = QtWidgets.QListWidget()
+        self.credentials_list = QtWidgets.QTreeWidget()
+        self.credentials_list.setHeaderLabels(self.COLUMNS)
+        self.credentials_list.setRootIsDecorated(False)
+        self.credentials_list.setUniformRowHeights(True)
+        self.credentials_list.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
         layout.addWidget(self.credentials_list)
 
         button_layout = QHBoxLayout()
@@ -154,25 +792,131 @@ class AddressBookDialog(QtWidgets.QDialog):
         self.select_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_DialogYesButton))
         self.delete_button = QPushButton("Delete")
         self.delete_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_DialogCancelButton))
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_BrowserReload))
         button_layout.addWidget(self.add_button)
         button_layout.addWidget(self.select_button)
         button_layout.addWidget(self.delete_button)
+        button_layout.addWidget(self.refresh_button)
         layout.addLayout(button_layout)
 
+        self.status_cache = AccountStatusCache()
+        self.status_worker = None
+        self.check_again = False
+        self.items = {}
         self.load_saved_credentials()
 
         self.add_button.clicked.connect(self.add_credentials)
         self.select_button.clicked.connect(self.select_credentials)
         self.delete_button.clicked.connect(self.delete_credentials)
+        self.refresh_button.clicked.connect(lambda: self.check_accounts())
         self.credentials_list.itemDoubleClicked.connect(self.double_click_credentials)
 
-    def load_saved_credentials(self):
-        self.credentials_list.clear()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(ACCOUNT_STATUS_REFRESH_MS)
+        self.refresh_timer.timeout.connect(lambda: self.check_accounts())
+        self.refresh_timer.start()
+        self.check_accounts(stale_only=True)
+
+    def saved_accounts(self):
+        """
+        {name: (server, username, password)} of every saved entry, in file order; None
+        for a playlist whose URL carries no Xtream credentials.
+        """
         config = configparser.ConfigParser()
         config.read('credentials.ini')
+        accounts = {}
         if 'Credentials' in config:
-            for key in config['Credentials']:
-                self.credentials_list.addItem(key)
+            for name, data in config['Credentials'].items():
+                if data.startswith('manual|'):
+                    _, server, username, password = data.split('|', 3)
+                    accounts[name] = (server, username, password)
+                elif data.startswith('m3u_plus|'):
+                    accounts[name] = parse_m3u_plus_url(data.split('|', 1)[1])
+        return accounts
+
+    def load_saved_credentials(self):
+        self.credentials_list.clear()
+        self.items = {}
+        for name, credentials in self.saved_accounts().items():
+            item = QtWidgets.QTreeWidgetItem([name])
+            self.credentials_list.addTopLevelItem(item)
+            self.items[name] = item
+            if credentials is None:
+                item.setText(1, "Playlist")
+            else:
+                self.show_account_status(item, self.status_cache.get(credentials[0], credentials[1]))
+        for column in range(1, len(self.COLUMNS)):
+            self.credentials_list.resizeColumnToContents(column)
+
+    def show_account_status(self, item, status):
+        if status is None:
+            item.setText(1, "Not checked")
+            return
+        texts = [status.status, "", "", "", datetime.fromtimestamp(status.checked).strftime("%b %d, %H:%M")]
+        if status.error is None:
+            texts[1] = datetime.fromtimestamp(status.expires).strftime("%B %d, %Y") if status.expires else "Unlimited"
+            texts[2] = f"{status.active_connections or 0} / {status.max_connections or 'Unlimited'}"
+        if status.latency is not None:
+            texts[3] = f"{status.latency * 1000:.0f} ms"
+        for column, text in enumerate(texts, 1):
+            item.setText(column, text)
+        item.setToolTip(1, status.error or "")
+
+    def check_accounts(self, stale_only=False):
+        """
+        Check the saved accounts in the background, all at once; with `stale_only`, just
+        those not checked within ACCOUNT_STATUS_REFRESH_MS.
+        """
+        if self.status_worker is not None:
+            # Accounts added meanwhile are picked up once the running check is done
+            self.check_again = True
+            return
+        now = time.time()
+        accounts = {}
+        for name, credentials in self.saved_accounts().items():
+            if credentials is None:
+                continue
+            status = self.status_cache.get(credentials[0], credentials[1])
+            if stale_only and status is not None and (now - status.checked) * 1000 < ACCOUNT_STATUS_REFRESH_MS:
+                continue
+            accounts[name] = credentials
+            if status is None and name in self.items:
+                self.items[name].setText(1, "Checking...")
+        if not accounts:
+            return
+
+        worker = RequestWorker(check_accounts, accounts, self.status_cache)
+        worker.signals.batch.connect(self.on_account_statuses)
+        worker.signals.finished.connect(lambda result: self.on_accounts_checked())
+        worker.signals.error.connect(lambda error: self.on_accounts_checked(error))
+        self.status_worker = worker
+        self.refresh_button.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def on_account_statuses(self, batch):
+        for name, status in batch:
+            item = self.items.get(name)
+            if item is not None:
+                self.show_account_status(item, status)
+        for column in range(1, len(self.COLUMNS)):
+            self.credentials_list.resizeColumnToContents(column)
+
+    def on_accounts_checked(self, error=None):
+        if error is not None:
+            print(f"Error checking accounts: {error}")
+        self.status_worker = None
+        self.refresh_button.setEnabled(True)
+        if self.check_again:
+            self.check_again = False
+            self.check_accounts(stale_only=True)
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        if self.status_worker is not None:
+            self.status_worker.cancel()
+            self.status_worker = None
+        super().done(result)
 
     def add_credentials(self):
         dialog = AddCredentialsDialog(self)
@@ -192,11 +936,12 @@ class AddressBookDialog(QtWidgets.QDialog):
                 with open('credentials.ini', 'w') as config_file:
                     config.write(config_file)
                 self.load_saved_credentials()
+                self.check_accounts(stale_only=True)
 
     def select_credentials(self):
         selected_item = self.credentials_list.currentItem()
         if selected_item:
-            name = selected_item.text()
+            name = selected_item.text(0)
             config = configparser.ConfigParser()
             config.read('credentials.ini')
             if 'Credentials' in config and name in config['Credentials']:
@@ -209,18 +954,17 @@ class AddressBookDialog(QtWidgets.QDialog):
                     self.parent.login()
                 elif data.startswith('m3u_plus|'):
                     _, m3u_url = data.split('|', 1)
-                    self.parent.extract_credentials_from_m3u_plus_url(m3u_url)
-                    self.parent.login()
+                    self.parent.login_m3u_plus(m3u_url)
                 self.accept()
 
-    def double_click_credentials(self, item):
+    def double_click_credentials(self, item, column=0):
         self.select_credentials()
         self.accept()
 
     def delete_credentials(self):
         selected_item = self.credentials_list.currentItem()
         if selected_item:
-            name = selected_item.text()
+            name = selected_item.text(0)
             config = configparser.ConfigParser()
             config.read('credentials.ini')
             if 'Credentials' in config and name in config['Credentials']:
@@ -325,6 +1069,13 @@ class IPTVPlayerApp(QMainWindow):
         }
         self.external_player_command = ""
         self.load_external_player_command()
+        self.load_network_settings()
+        self.load_tracing_settings()
+        self.api_cache_ttls = self.load_api_cache_ttls()
+        self.api_cache = None
+        self.load_health_settings()
+        self.stream_health = None
+        self.account_connections = None
 
         self.top_level_scroll_positions = {
             'LIVE': 0,
@@ -336,13 +1087,40 @@ class IPTVPlayerApp(QMainWindow):
         self.username = ""
         self.password = ""
         self.login_type = None  
-        self.epg_data = {}  
+        self.playlist = None
+        self.local_epg_path = None
+        self.pending_category_tabs = set()
+        self.category_errors = {}
+        self.catalogs = {}
+        self.global_search_tabs = set()
+        self.epg_data = EPGStore()
         self.channel_id_to_names = {}  
         self.epg_last_updated = None  
         self.threadpool = QThreadPool()
         self.threadpool.setMaxThreadCount(10)
+        # Cache warming gets its own small pool so it never queues ahead of user requests
+        self.prefetch_pool = QThreadPool()
+        self.prefetch_pool.setMaxThreadCount(PREFETCH_THREADS)
+        self.prefetched = set()
+        self.usage = None
+        self.hovered_series = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(PREFETCH_HOVER_DELAY_MS)
+        self.hover_timer.timeout.connect(self.prefetch_hovered_series)
+        self.active_requests = {}
         self.epg_id_mapping = {}
-        self.epg_name_map = {}
+        self.epg_channel_map = None
+        # Bumped for every guide load and every new login; EPG workers of an older one are ignored
+        self.epg_session = 0
+        self.epg_map_save_timer = QTimer(self)
+        self.epg_map_save_timer.setSingleShot(True)
+        self.epg_map_save_timer.setInterval(EPG_MATCHES_SAVE_DELAY_MS)
+        self.epg_map_save_timer.timeout.connect(self.save_epg_channel_map)
+        self.now_playing_timer = QTimer(self)
+        self.now_playing_timer.setSingleShot(True)
+        self.now_playing_timer.timeout.connect(self.refresh_now_playing)
+        self.epg_grid_dialog = None
         
 
         self.go_back_icon = self.style().standardIcon(QtWidgets.QStyle.SP_ArrowBack)
@@ -402,6 +1180,11 @@ class IPTVPlayerApp(QMainWindow):
         self.m3u_plus_button.setIcon(search_icon)
         self.m3u_plus_button.clicked.connect(self.open_m3u_plus_dialog)
 
+        self.open_file_button = QPushButton("Open File")
+        self.open_file_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_DialogOpenButton))
+        self.open_file_button.setToolTip("Open a local M3U playlist or XMLTV guide")
+        self.open_file_button.clicked.connect(self.open_local_file)
+
         self.address_book_button = QPushButton("Address Book")
         self.address_book_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_DirIcon))
         self.address_book_button.setToolTip("Manage Saved Credentials")
@@ -413,6 +1196,7 @@ class IPTVPlayerApp(QMainWindow):
 
         buttons_layout.addWidget(self.login_button)
         buttons_layout.addWidget(self.m3u_plus_button)
+        buttons_layout.addWidget(self.open_file_button)
         buttons_layout.addWidget(self.address_book_button)
         buttons_layout.addWidget(self.choose_player_button)
 
@@ -434,6 +1218,30 @@ class IPTVPlayerApp(QMainWindow):
         self.epg_checkbox.stateChanged.connect(self.on_epg_checkbox_toggled)
         checkbox_layout.addWidget(self.epg_checkbox)
 
+        self.full_catalog_checkbox = QCheckBox("Full Catalog")
+        self.full_catalog_checkbox.setToolTip(
+            "Load every channel, movie and series at login so categories open instantly "
+            "and search covers all categories"
+        )
+        self.full_catalog_checkbox.stateChanged.connect(self.on_full_catalog_checkbox_toggled)
+        checkbox_layout.addWidget(self.full_catalog_checkbox)
+
+        self.health_checkbox = QCheckBox("Check Streams")
+        self.health_checkbox.setToolTip(
+            "Probe every stream of an opened category in the background, within the account's "
+            "free connections, and mark the dead and slow ones"
+        )
+        self.health_checkbox.stateChanged.connect(self.on_health_checkbox_toggled)
+        checkbox_layout.addWidget(self.health_checkbox)
+
+        self.dead_streams_combo = QComboBox()
+        self.dead_streams_combo.setToolTip("What to do with streams found dead")
+        for mode, text in DEAD_STREAM_MODES.items():
+            self.dead_streams_combo.addItem(text, mode)
+        self.dead_streams_combo.setCurrentIndex(list(DEAD_STREAM_MODES).index(self.dead_streams))
+        self.dead_streams_combo.currentIndexChanged.connect(self.on_dead_streams_mode_changed)
+        checkbox_layout.addWidget(self.dead_streams_combo)
+
         # **Add Dark Theme Checkbox**
         self.dark_theme_checkbox = QCheckBox("Dark Theme")
         self.dark_theme_checkbox.setToolTip("Enable or disable dark theme")
@@ -486,34 +1294,60 @@ class IPTVPlayerApp(QMainWindow):
         self.search_bar_live.setPlaceholderText("Search Live Channels...")
         self.search_bar_live.setClearButtonEnabled(True)
         self.add_search_icon(self.search_bar_live)
-        self.search_bar_live.textChanged.connect(lambda text: self.search_in_list('LIVE', text))
 
         self.search_bar_movies = QLineEdit()
         self.search_bar_movies.setPlaceholderText("Search Movies...")
         self.search_bar_movies.setClearButtonEnabled(True)
         self.add_search_icon(self.search_bar_movies)
-        self.search_bar_movies.textChanged.connect(lambda text: self.search_in_list('Movies', text))
 
         self.search_bar_series = QLineEdit()
         self.search_bar_series.setPlaceholderText("Search Series...")
         self.search_bar_series.setClearButtonEnabled(True)
         self.add_search_icon(self.search_bar_series)
-        self.search_bar_series.textChanged.connect(lambda text: self.search_in_list('Series', text))
 
-        self.add_search_bar(self.live_layout, self.search_bar_live)
+        # Search runs once typing pauses rather than on every keystroke
+        self.search_timers = {}
+        self.search_bars = {}
+        for tab_name, search_bar in (
+            ('LIVE', self.search_bar_live),
+            ('Movies', self.search_bar_movies),
+            ('Series', self.search_bar_series),
+        ):
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(SEARCH_DEBOUNCE_MS)
+            timer.timeout.connect(lambda tab_name=tab_name, search_bar=search_bar: self.search_in_list(tab_name, search_bar.text()))
+            search_bar.textChanged.connect(lambda text, timer=timer: timer.start())
+            self.search_timers[tab_name] = timer
+            self.search_bars[tab_name] = search_bar
+
+        live_search_layout = QHBoxLayout()
+        self.add_search_bar(live_search_layout, self.search_bar_live)
+        self.tv_guide_button = QPushButton("TV Guide")
+        self.tv_guide_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_FileDialogDetailedView))
+        self.tv_guide_button.setToolTip("Show the programme guide of the channels listed below")
+        self.tv_guide_button.clicked.connect(self.open_epg_grid)
+        live_search_layout.addWidget(self.tv_guide_button)
+        self.live_layout.addLayout(live_search_layout)
         self.add_search_bar(self.movies_layout, self.search_bar_movies)
         self.add_search_bar(self.series_layout, self.search_bar_series)
 
-        self.channel_list_live = QListWidget()
-        self.channel_list_movies = QListWidget()
-        self.channel_list_series = QListWidget()
+        self.channel_list_live = QListView()
+        self.channel_list_movies = QListView()
+        self.channel_list_series = QListView()
 
         standard_icon_size = QSize(24, 24)
         for list_widget in [self.channel_list_live, self.channel_list_movies, self.channel_list_series]:
             list_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
             list_widget.setIconSize(standard_icon_size)
+            # Size every row from the first one instead of asking the model for all of them,
+            # and lay out long lists in batches so the first screenful paints right away
+            list_widget.setUniformItemSizes(True)
+            list_widget.setLayoutMode(QListView.Batched)
+            list_widget.setBatchSize(2000)
+            list_widget.setEditTriggers(QAbstractItemView.NoEditTriggers)
             list_widget.setStyleSheet("""
-                QListWidget::item {
+                QListView::item {
                     padding-top: 5px;
                     padding-bottom: 5px;
                 }
@@ -530,9 +1364,18 @@ class IPTVPlayerApp(QMainWindow):
         }
 
         self.tab_widget.currentChanged.connect(self.on_tab_change)
-        self.channel_list_live.itemDoubleClicked.connect(self.channel_item_double_clicked)
-        self.channel_list_movies.itemDoubleClicked.connect(self.channel_item_double_clicked)
-        self.channel_list_series.itemDoubleClicked.connect(self.channel_item_double_clicked)
+        self.list_models = {}
+        self.level_views = LevelViewCache()
+        self.streaming_models = {}
+        self.streaming_rows = {}
+        for tab_name in self.list_widgets:
+            self.clear_list(tab_name)
+        self.channel_list_live.doubleClicked.connect(self.channel_item_double_clicked)
+        self.channel_list_movies.doubleClicked.connect(self.channel_item_double_clicked)
+        self.channel_list_series.doubleClicked.connect(self.channel_item_double_clicked)
+        # Hovering a series warms its info ahead of the click
+        self.channel_list_series.setMouseTracking(True)
+        self.channel_list_series.entered.connect(self.on_series_entry_hovered)
 
         self.info_tab = QWidget()
         self.info_tab_layout = QVBoxLayout(self.info_tab)
@@ -542,6 +1385,15 @@ class IPTVPlayerApp(QMainWindow):
         default_font.setPointSize(self.default_font_size)
         self.result_display.setFont(default_font)
         self.info_tab_layout.addWidget(self.result_display)
+        self.info_tab_layout.addWidget(QLabel(f"Timings (ms over recent calls, logged to {tracer.log_path()})"))
+        self.timing_display = QTextEdit(self.info_tab)
+        self.timing_display.setReadOnly(True)
+        self.timing_display.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.timing_display.setLineWrapMode(QTextEdit.NoWrap)
+        self.info_tab_layout.addWidget(self.timing_display)
+        self.timing_timer = QTimer(self)
+        self.timing_timer.setInterval(TIMING_REFRESH_MS)
+        self.timing_timer.timeout.connect(self.update_timing_summary)
         info_icon = self.style().standardIcon(QtWidgets.QStyle.SP_MessageBoxInformation)
         self.tab_widget.addTab(self.info_tab, info_icon, "Info")
         self.info_tab_initialized = False
@@ -623,49 +1475,233 @@ class IPTVPlayerApp(QMainWindow):
     def get_http_method(self):
         return 'POST' if self.http_method_checkbox.isChecked() else 'GET'
 
-    def make_request(self, method, url, params=None, timeout=10):
-        headers = {'User-Agent': CUSTOM_USER_AGENT}
-        if method == 'POST':
-            return requests.post(url, data=params, headers=headers, timeout=timeout)
-        else:
-            return requests.get(url, params=params, headers=headers, timeout=timeout)
+    def xtream_client(self):
+        """Client for the logged in account, using the currently selected HTTP method."""
+        return XtreamClient(self.server, self.username, self.password, self.get_http_method())
+
+    def start_request(self, key, on_result, on_error, fn, *args, on_batch=None, cancel_event=None):
+        """
+        Run `fn(*args)` on the thread pool and deliver its result to `on_result` (or the
+        exception to `on_error`) on the GUI thread. `key` names the request slot, usually
+        a tab name: starting a new request for the same key supersedes the pending one.
+        When `fn` is a generator, `on_batch` receives each value it yields as it comes.
+        A threading.Event given as `cancel_event` is set when the request is cancelled.
+        """
+        self.cancel_request(key)
+        worker = RequestWorker(fn, *args, cancel_event=cancel_event)
+        worker.signals.finished.connect(lambda result: self.on_request_done(key, worker, on_result, result))
+        worker.signals.error.connect(lambda error: self.on_request_done(key, worker, on_error, error))
+        if on_batch is not None:
+            worker.signals.batch.connect(lambda batch: self.on_request_batch(key, worker, on_batch, batch))
+        self.active_requests[key] = worker
+        self.threadpool.start(worker)
+
+    def prefetch(self, key, fn, *args):
+        """
+        Warm the account's response cache with `fn(*args)` on the low-priority prefetch
+        pool. Nothing is shown; a later start_api_request for the same data hits the cache.
+        """
+        if key in self.prefetched or self.api_cache is None:
+            return
+        self.prefetched.add(key)
+        worker = RequestWorker(self.run_prefetch, functools.partial(fn, api=ApiFetch(self.api_cache, revalidate=True)), args)
+        worker.signals.error.connect(lambda error: print(f"Error prefetching {key}: {error}"))
+        self.prefetch_pool.start(worker)
+
+    @staticmethod
+    def run_prefetch(fn, args):
+        QThread.currentThread().setPriority(QThread.LowestPriority)
+        result = fn(*args)
+        if inspect.isgenerator(result):
+            for _ in result:
+                pass
+
+    def prefetch_top_categories(self):
+        client = self.xtream_client()
+        for tab_name, category_key in self.usage.top_categories(PREFETCH_TOP_CATEGORIES):
+            # Use the id exactly as the server sent it so the cache key matches a later click
+            category_id = next(
+                (group["category_id"] for group in self.groups.get(tab_name, []) if str(group.get("category_id")) == category_key),
+                None
+            )
+            if category_id is None:
+                continue
+            self.prefetch((tab_name, category_id), client.streams, tab_name, category_id)
+
+    def on_series_entry_hovered(self, index):
+        stack = self.navigation_stacks['Series']
+        if not stack or stack[-1]['level'] != 'series_categories' or not index.isValid():
+            return
+        series_entry = index.data(Qt.UserRole)
+        if isinstance(series_entry, SeriesRecord):
+            self.hovered_series = series_entry
+            self.hover_timer.start()
+
+    def prefetch_hovered_series(self):
+        series_entry = self.hovered_series
+        stack = self.navigation_stacks['Series']
+        if series_entry is None or not stack or stack[-1]['level'] != 'series_categories':
+            return
+        self.prefetch(
+            ('get_series_info', series_entry.series_id),
+            self.xtream_client().series_info, series_entry.series_id
+        )
+
+    def start_api_request(self, key, on_result, on_error, on_refresh, fn, *args, on_batch=None):
+        """
+        start_request for player_api.php reads: `fn` is called with an `api` keyword and
+        answers from the account's disk cache when it can. If that answer was past its
+        TTL, the request is repeated in the background and `on_refresh(old, new)` is
+        called on the GUI thread when the server's response changed.
+        """
+        api = ApiFetch(self.api_cache)
+        self.start_request(
+            key,
+            lambda result: self.on_api_result(key, api, result, on_result, on_refresh, fn, args),
+            on_error,
+            functools.partial(fn, api=api), *args,
+            on_batch=on_batch
+        )
+
+    def on_api_result(self, key, api, result, on_result, on_refresh, fn, args):
+        on_result(result)
+        if not api.stale:
+            return
+        refresh = ApiFetch(api.cache, revalidate=True)
+        self.start_request(
+            f"refresh:{key}",
+            lambda new_result: refresh.changed and on_refresh(result, new_result),
+            lambda error: print(f"Error refreshing cached response: {error}"),
+            functools.partial(fn, api=refresh), *args
+        )
+
+    def refresh_level(self, tab_name, field, old, new):
+        """
+        Swap a refreshed response into the tab's current level if that level is still
+        showing `old`, and redraw it unless the user is in the middle of a search.
+        """
+        stack = self.navigation_stacks[tab_name]
+        if not stack or stack[-1]['data'].get(field) is not old:
+            return False
+        stack[-1]['data'][field] = new
+        self.level_views.discard(stack[-1])
+        if tab_name not in self.active_requests and not self.search_bars[tab_name].text():
+            stack[-1]['scroll_position'] = self.get_list_widget(tab_name).verticalScrollBar().value()
+            self.show_current_level(tab_name)
+        return True
+
+    def on_request_batch(self, key, worker, callback, batch):
+        if not worker.cancelled and self.active_requests.get(key) is worker:
+            callback(batch)
+
+    def on_request_done(self, key, worker, callback, value):
+        if worker.cancelled or self.active_requests.get(key) is not worker:
+            return
+        del self.active_requests[key]
+        callback(value)
+
+    def cancel_request(self, key):
+        """Cancel the pending request for `key`. Returns True if one was pending."""
+        worker = self.active_requests.pop(key, None)
+        if worker is None:
+            return False
+        worker.cancel()
+        return True
+
+    def show_loading(self, tab_name, go_back=True):
+        self.set_list_model(tab_name, [], None, empty_text="Loading...", go_back=go_back)
+
+    def tab_icon(self, tab_name):
+        if tab_name == 'LIVE':
+            return self.live_channel_icon
+        elif tab_name == 'Movies':
+            return self.movies_channel_icon
+        elif tab_name == 'Series':
+            return self.series_channel_icon
+        return self.style().standardIcon(QtWidgets.QStyle.SP_FileIcon)
+
+    def set_list_model(self, tab_name, entries, label, formatter=None, icon=None, sort=False, empty_text=None, go_back=None):
+        """
+        Show `entries` in the tab's list view through a fresh EntryListModel/EntryProxyModel
+        pair. `label(entry)` is the plain row text used for sorting and searching;
+        `formatter` defaults to showing just that label.
+        """
+        if formatter is None:
+            formatter = lambda entries: [(label(entry), '') for entry in entries]
+        if go_back is None:
+            go_back = bool(self.navigation_stacks[tab_name])
+        model = EntryListModel(
+            entries, formatter, label, icon or self.tab_icon(tab_name),
+            go_back=go_back, go_back_icon=self.go_back_icon
+        )
+        proxy = EntryProxyModel(model, empty_text)
+        if sort:
+            proxy.sort()
+        # Build the search index once the level has painted, ahead of the first keystroke
+        QTimer.singleShot(0, proxy.build_search_index)
+        self.attach_model(tab_name, proxy)
+        return proxy
+
+    def attach_model(self, tab_name, proxy):
+        list_widget = self.get_list_widget(tab_name)
+        list_widget.setModel(proxy)
+        # Keep a reference: the view does not own its model
+        self.list_models[tab_name] = proxy
+        if tab_name == 'Series':
+            # setModel replaces the selection model, so reconnect every time
+            list_widget.selectionModel().currentChanged.connect(self.on_series_entry_hovered)
+
+    def clear_list(self, tab_name):
+        self.set_list_model(tab_name, [], None, go_back=False)
 
     def open_m3u_plus_dialog(self):
         text, ok = QtWidgets.QInputDialog.getText(self, 'M3u_plus Login', 'Enter m3u_plus URL:')
         if ok and text:
-            m3u_plus_url = text.strip()
-            self.extract_credentials_from_m3u_plus_url(m3u_plus_url)
-            self.login()
+            self.login_m3u_plus(text.strip())
+
+    def open_local_file(self):
+        """Open a playlist on disk as the current source, or a guide file for the current login."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Playlist or Guide", "",
+            "Playlists and guides (*.m3u *.m3u8 *.xml *.xmltv *.gz);;All files (*)"
+        )
+        if not path:
+            return
+        if not path.lower().endswith(('.xml', '.xmltv', '.gz')):
+            self.login_m3u_plus(path)
+            return
+        if not self.login_type:
+            self.animate_progress(0, 100, "Log in or open a playlist before the guide")
+            return
+        self.local_epg_path = path
+        self.save_epg_channel_map()
+        self.epg_data = EPGStore()
+        self.epg_channel_map = None
+        self.reset_progress_bar()
+        self.animate_progress(0, 5, "Loading EPG data...")
+        self.load_epg_data_async()
 
     def update_font_size(self, value):
         self.default_font_size = value
-        for tab_name, list_widget in self.list_widgets.items():
-            for i in range(list_widget.count()):
-                item = list_widget.item(i)
-                font = item.font()
-                font.setPointSize(value)
-                item.setFont(font)
-
         font = QFont()
         font.setPointSize(value)
+        for tab_name, list_widget in self.list_widgets.items():
+            list_widget.setFont(font)
         self.result_display.setFont(font)
 
     def extract_credentials_from_m3u_plus_url(self, url):
+        """Fill in the Xtream credentials of a get.php URL. Returns False for other playlist URLs."""
         try:
-            pattern = r'(http[s]?://[^/]+)/get\.php\?username=([^&]*)&password=([^&]*)&type=(m3u_plus|m3u|&output=m3u8)'
-            match = re.match(pattern, url)
-            if match:
-                self.server = match.group(1)
-                self.username = match.group(2)
-                self.password = match.group(3)
+            credentials = parse_m3u_plus_url(url)
+            if credentials:
+                self.server, self.username, self.password = credentials
                 self.server_entry.setText(self.server)
                 self.username_entry.setText(self.username)
                 self.password_entry.setText(self.password)
-            else:
-                self.animate_progress(0, 100, "Invalid m3u_plus or m3u URL")
+                return True
         except Exception as e:
             print(f"Error extracting credentials: {e}")
-            self.animate_progress(0, 100, "Error extracting credentials")
+        return False
 
     def set_progress_text(self, text):
         self.progress_bar.setFormat(text)
@@ -682,23 +1718,38 @@ class IPTVPlayerApp(QMainWindow):
         self.progress_bar.setValue(0)
         self.set_progress_text("")
 
-    def login(self):
+    def reset_session(self):
+        """Drop everything of the previous account or playlist before loading another."""
         # When logging into another server, reset the progress bar
         self.reset_progress_bar()
-        self.epg_data = {}
+        for key in list(self.active_requests):
+            self.cancel_request(key)
+        self.login_type = None
+        self.playlist = None
+        self.local_epg_path = None
+        self.stream_health = None
+        self.account_connections = None
+        self.epg_session += 1
+        self.save_epg_channel_map()
+        self.epg_data = EPGStore()
         self.channel_id_to_names = {}
+        self.epg_channel_map = None
         self.epg_last_updated = None
-        for tab_name, list_widget in self.list_widgets.items():
-            list_widget.clear()
+        for tab_name in self.list_widgets:
+            self.clear_list(tab_name)
+
+    def reset_navigation(self):
+        self.groups = {tab_name: [] for tab_name in CATEGORY_ACTIONS}
+        self.catalogs = {}
+        self.global_search_tabs = set()
+        self.navigation_stacks = {'LIVE': [], 'Movies': [], 'Series': []}
+        self.top_level_scroll_positions = {'LIVE': 0, 'Movies': 0, 'Series': 0}
+        self.level_views.clear()
+        self.category_errors = {}
+        self.prefetched = set()
 
-        cache_file = 'epg_cache1.xml'
-        if os.path.exists(cache_file):
-            try:
-                os.remove(cache_file)
-            except Exception as e:
-                print(f"Error deleting EPG cache: {e}")
-                self.animate_progress(0, 100, "Error deleting EPG cache")
-                return
+    def login(self):
+        self.reset_session()
 
         server = self.server_entry.text().strip()
         username = self.username_entry.text().strip()
@@ -714,79 +1765,191 @@ class IPTVPlayerApp(QMainWindow):
         self.fetch_categories_only(server, username, password)
 
     def fetch_categories_only(self, server, username, password):
+        """
+        Fire the three category requests and the account info request concurrently.
+        Each tab is populated as soon as its own response arrives.
+        """
+        self.server = server
+        self.username = username
+        self.password = password
+        client = self.xtream_client()
+        self.reset_navigation()
+        self.pending_category_tabs = set(CATEGORY_ACTIONS)
+        self.api_cache = ApiCache(account_cache_dir(server, username) / 'api', self.api_cache_ttls)
+        self.usage = UsageStats(account_cache_dir(server, username) / 'usage.json')
+        self.stream_health = HealthCache(account_cache_dir(server, username) / 'health.json', self.health_ttl)
+
+        for tab_name in CATEGORY_ACTIONS:
+            self.show_loading(tab_name, go_back=False)
+            self.start_api_request(
+                tab_name,
+                lambda categories, tab_name=tab_name: self.on_categories_loaded(tab_name, categories),
+                lambda error, tab_name=tab_name: self.on_categories_error(tab_name, error),
+                lambda old, new, tab_name=tab_name: self.on_categories_refreshed(tab_name, old, new),
+                client.categories, tab_name
+            )
+        self.fetch_additional_data(server, username, password)
+
+    def on_categories_loaded(self, tab_name, categories):
         try:
-            http_method = self.get_http_method()
-
-            params = {
-                'username': username,
-                'password': password,
-                'action': 'get_live_categories'
-            }
-
-            categories_url = f"{server}/player_api.php"
-            live_response = self.make_request(http_method, categories_url, params, timeout=10)
-            live_response.raise_for_status()
-
-            params['action'] = 'get_vod_categories'
-            movies_response = self.make_request(http_method, categories_url, params, timeout=10)
-            movies_response.raise_for_status()
-
-            params['action'] = 'get_series_categories'
-            series_response = self.make_request(http_method, categories_url, params, timeout=10)
-            series_response.raise_for_status()
-
-            self.groups = {
-                "LIVE": live_response.json(),
-                "Movies": movies_response.json(),
-                "Series": series_response.json(),
-            }
-            self.server = server
-            self.username = username
-            self.password = password
+            self.groups[tab_name] = categories
             self.login_type = 'xtream'
-            self.navigation_stacks = {'LIVE': [], 'Movies': [], 'Series': []}
-            self.top_level_scroll_positions = {'LIVE': 0, 'Movies': 0, 'Series': 0}
-            self.update_category_lists('LIVE')
-            self.update_category_lists('Movies')
-            self.update_category_lists('Series')
-            self.fetch_additional_data(server, username, password)
-
-            # Playlist loading complete
+            self.update_category_lists(tab_name)
+            self.on_category_tab_done(tab_name)
+        except Exception as e:
+            self.on_categories_error(tab_name, e)
+
+    def on_categories_refreshed(self, tab_name, old, new):
+        if self.groups.get(tab_name) is not old:
+            return
+        self.groups[tab_name] = new
+        stack = self.navigation_stacks[tab_name]
+        if not stack and tab_name not in self.active_requests and not self.search_bars[tab_name].text():
+            self.top_level_scroll_positions[tab_name] = self.get_list_widget(tab_name).verticalScrollBar().value()
+            self.update_category_lists(tab_name)
+
+    def on_categories_error(self, tab_name, error):
+        self.clear_list(tab_name)
+        if isinstance(error, requests.exceptions.Timeout):
+            print("Request timed out")
+            message = "Login timed out"
+        elif isinstance(error, requests.RequestException):
+            print(f"Network error: {error}")
+            message = "Network Error"
+        elif isinstance(error, ValueError):
+            print(f"JSON decode error: {error}")
+            message = "Invalid server response"
+        else:
+            print(f"Error fetching categories: {error}")
+            message = "Error fetching categories"
+        self.category_errors[tab_name] = message
+        self.on_category_tab_done(tab_name)
+
+    def on_category_tab_done(self, tab_name):
+        self.pending_category_tabs.discard(tab_name)
+        if self.pending_category_tabs:
+            done = len(CATEGORY_ACTIONS) - len(self.pending_category_tabs)
+            self.animate_progress(self.progress_bar.value(), 30 + 20 * done, "Loading playlist...")
+            return
+
+        if self.login_type != 'xtream':
+            # Every category request failed
+            self.animate_progress(self.progress_bar.value(), 100, next(iter(self.category_errors.values())))
+            return
+
+        # Playlist loading complete
+        if self.category_errors:
+            failed = ", ".join(f"{name}: {message}" for name, message in self.category_errors.items())
+            self.animate_progress(self.progress_bar.value(), 100, f"Playlist loaded ({failed})")
+        else:
             self.animate_progress(self.progress_bar.value(), 100, "Playlist loaded")
 
-            # After playlist is fully loaded, if EPG is checked and not loaded, load EPG now
-            if self.epg_checkbox.isChecked() and not self.epg_data:
-                # Reset to 0 before loading EPG
-                self.reset_progress_bar()
-                self.animate_progress(0, 50, "Loading EPG data...")
-                self.load_epg_data_async()
+        if self.full_catalog_checkbox.isChecked():
+            self.load_catalogs()
+        else:
+            self.prefetch_top_categories()
 
-        except requests.exceptions.Timeout:
-            print("Request timed out")
-            self.animate_progress(self.progress_bar.value(), 100, "Login timed out")
-        except requests.RequestException as e:
-            print(f"Network error: {e}")
-            self.animate_progress(self.progress_bar.value(), 100, "Network Error")
-        except ValueError as e:
-            print(f"JSON decode error: {e}")
-            self.animate_progress(self.progress_bar.value(), 100, "Invalid server response")
-        except Exception as e:
-            print(f"Error fetching categories: {e}")
-            self.animate_progress(self.progress_bar.value(), 100, "Error fetching categories")
+        # After playlist is fully loaded, if EPG is checked and not loaded, load EPG now
+        if self.epg_checkbox.isChecked() and not self.epg_data:
+            # Reset to 0 before loading EPG
+            self.reset_progress_bar()
+            self.animate_progress(0, 5, "Loading EPG data...")
+            self.load_epg_data_async()
 
-    def fetch_additional_data(self, server, username, password):
+    def login_m3u_plus(self, url):
+        """
+        Load an M3U/M3U_plus playlist straight into the tabs, for providers that only
+        serve get.php. Xtream credentials found in the URL are filled in, so the guide
+        can still come from xmltv.php and Login goes through player_api.php.
+        """
+        self.reset_session()
+        if not self.extract_credentials_from_m3u_plus_url(url):
+            self.server = self.username = self.password = ""
+        self.reset_navigation()
+        self.pending_category_tabs = set()
+        self.api_cache = None
+        self.usage = UsageStats(account_cache_dir(url, '') / 'usage.json')
+        self.stream_health = HealthCache(account_cache_dir(url, '') / 'health.json', self.health_ttl)
+
+        for tab_name in PLAYLIST_TABS:
+            self.show_loading(tab_name, go_back=False)
+        self.animate_progress(0, 30, "Loading playlist...")
+        self.start_request(
+            'playlist', self.on_playlist_loaded, self.on_playlist_error,
+            self.load_playlist, url,
+            on_batch=lambda count: self.set_progress_text(f"Loading playlist... {count} entries")
+        )
+
+    @staticmethod
+    def load_playlist(url):
+        """load_m3u, then the per-tab catalogs, both on the worker thread."""
+        playlist = yield from load_m3u(url)
+        return playlist, playlist.catalogs()
+
+    def on_playlist_loaded(self, result):
         try:
-            if not server.startswith("http://") and not server.startswith("https://"):
-                server = f"http://{server}"
+            playlist, catalogs = result
+            self.playlist = playlist
+            self.login_type = 'm3u'
+            self.groups = playlist.groups
+            self.catalogs = catalogs
+            for tab_name in PLAYLIST_TABS:
+                self.update_category_lists(tab_name)
+            loaded = ", ".join(f"{tab_name}: {len(entries)}" for tab_name, entries in playlist.entries.items())
+            self.animate_progress(self.progress_bar.value(), 100, f"Playlist loaded ({loaded})")
+            self.show_playlist_info(playlist)
+        except Exception as e:
+            self.on_playlist_error(e)
+            return
 
-            headers = {'User-Agent': CUSTOM_USER_AGENT}
-            payload = {'username': username, 'password': password}
-            url = f"{server}/player_api.php"
+        if self.epg_checkbox.isChecked() and not self.epg_data and self.epg_source():
+            self.reset_progress_bar()
+            self.animate_progress(0, 5, "Loading EPG data...")
+            self.load_epg_data_async()
 
-            response = requests.post(url, headers=headers, data=payload, timeout=10)
-            response.raise_for_status()
+    def on_playlist_error(self, error):
+        for tab_name in PLAYLIST_TABS:
+            self.clear_list(tab_name)
+        if isinstance(error, requests.exceptions.Timeout):
+            print("Request timed out")
+            message = "Login timed out"
+        elif isinstance(error, requests.RequestException):
+            print(f"Network error: {error}")
+            message = "Network Error"
+        elif isinstance(error, OSError):
+            print(f"Error reading playlist file: {error}")
+            message = "Cannot read playlist file"
+        elif isinstance(error, ValueError):
+            print(f"Playlist error: {error}")
+            message = "Invalid playlist"
+        else:
+            print(f"Error loading playlist: {error}")
+            message = "Error loading playlist"
+        self.animate_progress(self.progress_bar.value(), 100, message)
+
+    def show_playlist_info(self, playlist):
+        source = self.epg_source()
+        self.result_display.setText(
+            f"Playlist: {playlist.url}\n"
+            f"Live Channels: {len(playlist.entries['LIVE'])}\n"
+            f"Movies: {len(playlist.entries['Movies'])}\n"
+            f"Series Episodes: {len(playlist.entries['Series'])}\n"
+            f"Guide: {source[0] if source else 'None'}\n"
+        )
+        self.info_tab_initialized = True
 
-            additional_data = response.json()
+    def fetch_additional_data(self, server, username, password):
+        if not server.startswith("http://") and not server.startswith("https://"):
+            server = f"http://{server}"
+        self.start_request(
+            'info',
+            lambda additional_data: self.show_additional_data(server, additional_data),
+            lambda error: print(f"Error fetching additional data: {error}"),
+            XtreamClient(server, username, password).account_info
+        )
+
+    def show_additional_data(self, server, additional_data):
+        try:
             user_info = additional_data.get("user_info", {})
             server_info = additional_data.get("server_info", {})
 
@@ -798,6 +1961,7 @@ class IPTVPlayerApp(QMainWindow):
             password = user_info.get("password", "Unknown")
             max_connections = user_info.get("max_connections", "Unlimited")
             active_connections = user_info.get("active_cons", "0")
+            self.account_connections = (max_connections, active_connections)
             trial = "Yes" if user_info.get("is_trial") == "1" else "No"
             expire_timestamp = user_info.get("exp_date")
             expiry = (
@@ -832,35 +1996,86 @@ class IPTVPlayerApp(QMainWindow):
         except Exception as e:
             print(f"Error fetching additional data: {e}")
 
+    def epg_source(self):
+        """
+        (XMLTV URL, cache directory, HTTP method) of the guide for the current login: a
+        guide file opened for it, the playlist's url-tvg for playlists that name one, else
+        the account's xmltv.php. None if there is none of these.
+        """
+        if self.local_epg_path:
+            return self.local_epg_path, account_cache_dir(self.local_epg_path, '') / 'epg', 'GET'
+        if self.playlist is not None and self.playlist.epg_url:
+            # A guide named by the playlist is a plain file, whatever the account's method
+            return self.playlist.epg_url, account_cache_dir(self.playlist.url, '') / 'epg', 'GET'
+        if self.server and self.username and self.password:
+            client = XtreamClient(self.server, self.username, self.password)
+            return client.epg_url(), account_cache_dir(self.server, self.username) / 'epg', self.get_http_method()
+        return None
+
     def load_epg_data_async(self):
-        if not self.server or not self.username or not self.password:
+        source = self.epg_source()
+        if source is None:
             # Can't load EPG if not logged in
             return
-        http_method = self.get_http_method()
-        epg_worker = EPGWorker(self.server, self.username, self.password, http_method)
+        epg_url, cache_dir, http_method = source
+        self.epg_session += 1
+        epg_worker = EPGWorker(epg_url, cache_dir, http_method, self.load_epg_cache_ttl(), self.epg_session)
         epg_worker.signals.finished.connect(self.on_epg_loaded)
+        epg_worker.signals.download_progress.connect(self.on_epg_download_progress)
+        epg_worker.signals.progress.connect(self.on_epg_progress)
         epg_worker.signals.error.connect(self.on_epg_error)
         self.threadpool.start(epg_worker)
 
-    def on_epg_loaded(self, epg_data, channel_id_to_names):
+    def on_epg_loaded(self, session, cache_dir, epg_data, channel_id_to_names):
+        if session != self.epg_session:
+            # A guide of a previous login or an earlier load
+            return
         self.epg_data = epg_data
         self.channel_id_to_names = channel_id_to_names
+        self.save_epg_channel_map()
+        self.epg_channel_map = EPGChannelMap(
+            cache_dir / 'matches.json',
+            epg_data.generation, channel_id_to_names
+        )
 
-        name_to_id = {}
-        for cid, names in channel_id_to_names.items():
-            for n in names:
-                if n not in name_to_id:
-                    name_to_id[n] = cid
-        self.epg_name_map = name_to_id
+        # Channels on screen or cached pick up their now-playing text
+        for proxy in {*self.level_views.views('LIVE'), self.list_models['LIVE']}:
+            proxy.sourceModel().invalidate()
 
         # EPG done
         self.animate_progress(self.progress_bar.value(), 100, "EPG data loaded")
 
-    def on_epg_error(self, error_message):
+    def save_epg_channel_map(self):
+        if self.epg_channel_map is not None:
+            self.epg_map_save_timer.stop()
+            self.epg_channel_map.save()
+
+    def on_epg_download_progress(self, session, received, total):
+        if session != self.epg_session:
+            return
+        # Downloading fills the first half of the bar, parsing the second
+        self.playlist_progress_animation.stop()
+        received_mb = received / (1024 * 1024)
+        if total:
+            self.progress_bar.setValue(min(50, int(received * 50 / total)))
+            self.set_progress_text(f"Downloading EPG data... {received_mb:.1f} / {total / (1024 * 1024):.1f} MB")
+        else:
+            self.set_progress_text(f"Downloading EPG data... {received_mb:.1f} MB")
+
+    def on_epg_progress(self, session, percent, text):
+        if session != self.epg_session:
+            return
+        self.playlist_progress_animation.stop()
+        self.progress_bar.setValue(50 + percent // 2)
+        self.set_progress_text(text)
+
+    def on_epg_error(self, session, error_message):
+        if session != self.epg_session:
+            return
         print(f"Error fetching EPG data: {error_message}")
         self.animate_progress(self.progress_bar.value(), 100, "Error fetching EPG data")
 
-    def channel_item_double_clicked(self, item):
+    def channel_item_double_clicked(self, index):
         try:
             sender = self.sender()
             category = {
@@ -872,16 +2087,19 @@ class IPTVPlayerApp(QMainWindow):
             if not category:
                 return
 
-            selected_item = sender.currentItem()
-            if not selected_item:
+            selected_item = sender.currentIndex()
+            if not selected_item.isValid() or not selected_item.flags() & Qt.ItemIsEnabled:
                 return
 
-            selected_text = selected_item.text()
+            selected_text = selected_item.data(Qt.DisplayRole)
             list_widget = self.get_list_widget(category)
             current_scroll_position = list_widget.verticalScrollBar().value()
             stack = self.navigation_stacks[category]
 
-            if stack:
+            if category in self.active_requests:
+                # The list only shows the loading placeholder; keep the saved position
+                pass
+            elif stack:
                 stack[-1]['scroll_position'] = current_scroll_position
             else:
                 self.top_level_scroll_positions[category] = current_scroll_position
@@ -900,34 +2118,10 @@ class IPTVPlayerApp(QMainWindow):
             self.search_bar_series.clear()
 
         try:
+            self.global_search_tabs.discard(tab_name)
             list_widget = self.get_list_widget(tab_name)
-            list_widget.clear()
-
-            if self.navigation_stacks[tab_name]:
-                go_back_item = QListWidgetItem("Go Back")
-                go_back_item.setIcon(self.go_back_icon)
-                list_widget.addItem(go_back_item)
-
-            if tab_name == 'LIVE':
-                channel_icon = self.live_channel_icon
-            elif tab_name == 'Movies':
-                channel_icon = self.movies_channel_icon
-            elif tab_name == 'Series':
-                channel_icon = self.series_channel_icon
-            else:
-                channel_icon = self.style().standardIcon(QtWidgets.QStyle.SP_FileIcon)
-
-            group_list = self.groups[tab_name]
-            category_names = sorted(group["category_name"] for group in group_list)
-            items = []
-            for category_name in category_names:
-                item = QListWidgetItem(category_name)
-                item.setIcon(channel_icon)
-                items.append(item)
-
-            items.sort(key=lambda x: x.text())
-            for item in items:
-                list_widget.addItem(item)
+            self.set_list_model(tab_name, self.groups[tab_name], lambda group: group["category_name"], sort=True)
+            self.cache_level_view(tab_name)
 
             scroll_position = self.top_level_scroll_positions.get(tab_name, 0)
             list_widget.verticalScrollBar().setValue(scroll_position)
@@ -947,89 +2141,85 @@ class IPTVPlayerApp(QMainWindow):
             else:
                 self.top_level_scroll_positions[tab_name] = current_scroll_position
 
-            http_method = self.get_http_method()
-            params = {
-                'username': self.username,
-                'password': self.password,
-                'action': '',
-                'category_id': category_id
-            }
-
-            if tab_name == "LIVE":
-                params['action'] = 'get_live_streams'
-                stream_type = "live"
-            elif tab_name == "Movies":
-                params['action'] = 'get_vod_streams'
-                stream_type = "movie"
-
-            streams_url = f"{self.server}/player_api.php"
-            response = self.make_request(http_method, streams_url, params)
-            response.raise_for_status()
-
-            data = response.json()
-            if not isinstance(data, list):
-                raise ValueError("Expected a list of channels")
-            self.entries_per_tab[tab_name] = data
-
-            entries = self.entries_per_tab[tab_name]
-
-            for entry in entries:
-                stream_id = entry.get("stream_id")
-                epg_channel_id = entry.get("epg_channel_id")
-                if epg_channel_id:
-                    epg_channel_id = epg_channel_id.strip().lower()
-                else:
-                    epg_channel_id = None
+            self.usage.record_category(tab_name, category_id)
+            catalog = self.catalogs.get(tab_name)
+            if catalog is not None:
+                self.on_channels_loaded(tab_name, catalog.category_entries(category_id))
+                return
 
-                container_extension = entry.get("container_extension", "m3u8")
-                if stream_id:
-                    entry["url"] = f"{self.server}/{stream_type}/{self.username}/{self.password}/{stream_id}.{container_extension}"
-                else:
-                    entry["url"] = None
-                entry["epg_channel_id"] = epg_channel_id
+            self.show_loading(tab_name)
+            self.streaming_models.pop(tab_name, None)
+            self.start_api_request(
+                tab_name,
+                lambda entries: self.on_channels_loaded(tab_name, entries),
+                lambda error: self.on_channels_error(tab_name, error),
+                lambda old, new: self.refresh_level(tab_name, 'entries', old, new),
+                self.xtream_client().streams, tab_name, category_id,
+                on_batch=lambda batch: self.show_streamed_batch(
+                    tab_name, batch, lambda entry: entry.name,
+                    formatter=lambda entries: self.format_channel_rows(tab_name, entries)
+                )
+            )
+        except Exception as e:
+            self.on_channels_error(tab_name, e)
+
+    def load_catalogs(self):
+        """Fetch each tab's whole catalog in the background, one request per tab."""
+        client = self.xtream_client()
+        for tab_name in STREAM_ACTIONS:
+            if tab_name in self.catalogs:
+                continue
+            self.start_api_request(
+                f"catalog:{tab_name}",
+                lambda catalog, tab_name=tab_name: self.on_catalog_loaded(tab_name, catalog),
+                lambda error, tab_name=tab_name: print(f"Error loading {tab_name} catalog: {error}"),
+                lambda old, new, tab_name=tab_name: self.on_catalog_refreshed(tab_name, old, new),
+                client.catalog, tab_name
+            )
+
+    def on_catalog_loaded(self, tab_name, catalog):
+        self.catalogs[tab_name] = catalog
+        loaded = ", ".join(f"{name}: {len(self.catalogs[name])}" for name in STREAM_ACTIONS if name in self.catalogs)
+        self.set_progress_text(f"Full catalog loaded ({loaded})")
+
+    def on_catalog_refreshed(self, tab_name, old, new):
+        if self.catalogs.get(tab_name) is old:
+            self.on_catalog_loaded(tab_name, new)
+
+    def on_full_catalog_checkbox_toggled(self, state):
+        if state == Qt.Checked and self.login_type == 'xtream' and not self.pending_category_tabs:
+            self.load_catalogs()
 
+    def on_channels_loaded(self, tab_name, entries):
+        try:
+            self.entries_per_tab[tab_name] = entries
             self.navigation_stacks[tab_name].append({'level': 'channels', 'data': {'tab_name': tab_name, 'entries': entries}, 'scroll_position': 0})
-            self.show_channels(list_widget, tab_name)
+            if not self.finish_streamed_level(tab_name):
+                self.show_channels(self.get_list_widget(tab_name), tab_name)
+        except Exception as e:
+            self.on_channels_error(tab_name, e)
 
-        except requests.RequestException as e:
-            print(f"Network error: {e}")
+    def on_channels_error(self, tab_name, error):
+        self.show_current_level(tab_name)
+        if isinstance(error, requests.RequestException):
+            print(f"Network error: {error}")
             self.animate_progress(self.progress_bar.value(), 100, "Network Error")
-        except ValueError as e:
-            print(f"Data validation error: {e}")
+        elif isinstance(error, ValueError):
+            print(f"Data validation error: {error}")
             self.animate_progress(self.progress_bar.value(), 100, "Invalid channel data received")
-        except Exception as e:
-            print(f"Error fetching channels: {e}")
+        else:
+            print(f"Error fetching channels: {error}")
             self.animate_progress(self.progress_bar.value(), 100, "Error fetching channels")
 
     def handle_xtream_double_click(self, selected_item, selected_text, tab_name, sender):
         try:
-            list_widget = self.get_list_widget(tab_name)
             stack = self.navigation_stacks[tab_name]
 
             if selected_text == "Go Back":
-                if stack:
-                    stack.pop()
-                    if stack:
-                        last_level = stack[-1]
-                        level = last_level['level']
-                        data = last_level['data']
-                        scroll_position = last_level.get('scroll_position', 0)
-                        if level == 'channels':
-                            self.entries_per_tab[tab_name] = data['entries']
-                            self.show_channels(list_widget, tab_name)
-                            list_widget.verticalScrollBar().setValue(scroll_position)
-                        elif level == 'series_categories':
-                            self.show_series_in_category(data['series_list'], restore_scroll_position=True, scroll_position=scroll_position)
-                        elif level == 'series':
-                            self.show_seasons(data['seasons'], restore_scroll_position=True, scroll_position=scroll_position)
-                        elif level == 'season':
-                            self.show_episodes(data['episodes'], restore_scroll_position=True, scroll_position=scroll_position)
-                    else:
-                        self.update_category_lists(tab_name)
-                        list_widget.verticalScrollBar().setValue(self.top_level_scroll_positions.get(tab_name, 0))
-                else:
-                    self.update_category_lists(tab_name)
-                    list_widget.verticalScrollBar().setValue(self.top_level_scroll_positions.get(tab_name, 0))
+                # Backing out of a level that is still loading just abandons the request
+                if not self.cancel_request(tab_name) and stack:
+                    self.level_views.discard(stack.pop())
+                self.show_current_level(tab_name)
                 return
 
             if tab_name != "Series":
@@ -1037,7 +2227,7 @@ class IPTVPlayerApp(QMainWindow):
                     self.fetch_channels(selected_text, tab_name)
                 else:
                     selected_entry = selected_item.data(Qt.UserRole)
-                    if selected_entry and "url" in selected_entry:
+                    if isinstance(selected_entry, StreamRecord):
                         self.play_channel(selected_entry)
                 return
 
@@ -1047,11 +2237,24 @@ class IPTVPlayerApp(QMainWindow):
                     if selected_text in [group["category_name"] for group in self.groups["Series"]]:
                         self.fetch_series_in_category(selected_text)
                         return
+                    # A series picked straight from the global search results
+                    series_entry = selected_item.data(Qt.UserRole)
+                    if isinstance(series_entry, SeriesRecord):
+                        self.fetch_seasons(series_entry)
+                        return
+                    if isinstance(series_entry, StreamRecord):
+                        # Playlist episodes are listed straight under their group
+                        self.play_channel(series_entry)
+                        return
                 elif stack[-1]['level'] == 'series_categories':
                     series_entry = selected_item.data(Qt.UserRole)
-                    if series_entry and "series_id" in series_entry:
+                    if isinstance(series_entry, SeriesRecord):
                         self.fetch_seasons(series_entry)
                         return
+                    if isinstance(series_entry, StreamRecord):
+                        # Playlist episodes are listed straight under their group
+                        self.play_channel(series_entry)
+                        return
                 elif stack[-1]['level'] == 'series':
                     season_number = selected_item.data(Qt.UserRole)
                     series_entry = stack[-1]['data']['series_entry']
@@ -1066,90 +2269,346 @@ class IPTVPlayerApp(QMainWindow):
         except Exception as e:
             print(f"Error loading channels: {e}")
 
-    def show_channels(self, list_widget, tab_name):
-        try:
-            list_widget.clear()
-
-            if self.navigation_stacks[tab_name]:
-                go_back_item = QListWidgetItem("Go Back")
-                go_back_item.setIcon(self.go_back_icon)
-                list_widget.addItem(go_back_item)
-
-            if tab_name == 'LIVE':
-                channel_icon = self.live_channel_icon
-            elif tab_name == 'Movies':
-                channel_icon = self.movies_channel_icon
-            elif tab_name == 'Series':
-                channel_icon = self.series_channel_icon
-            else:
-                channel_icon = self.style().standardIcon(QtWidgets.QStyle.SP_FileIcon)
-
-            items = []
-            now = datetime.now(tz=tz.tzlocal()) if self.epg_data else None
+    def show_current_level(self, tab_name):
+        """
+        Show whatever sits on top of the tab's navigation stack, reattaching the level's
+        cached model when there is one and rebuilding it otherwise.
+        """
+        list_widget = self.get_list_widget(tab_name)
+        stack = self.navigation_stacks[tab_name]
+        level_key = stack[-1] if stack else tab_name
+        proxy = self.level_views.get(level_key)
+        if proxy is not None:
+            self.show_cached_level(tab_name, proxy)
+            return
 
-            for idx, entry in enumerate(self.entries_per_tab[tab_name]):
-                display_text = entry.get("name", "Unnamed Channel")
-                tooltip_text = ""
+        if not stack:
+            self.update_category_lists(tab_name)
+            list_widget.verticalScrollBar().setValue(self.top_level_scroll_positions.get(tab_name, 0))
+            return
 
-                if tab_name == "LIVE" and self.epg_data:
-                    epg_channel_id = entry.get('epg_channel_id')
-                    if epg_channel_id and epg_channel_id in self.epg_data:
-                        epg_info_list = self.epg_data[epg_channel_id]
-                    else:
-                        channel_name = normalize_channel_name(entry.get('name', ''))
-                        epg_channel_id = self.epg_name_map.get(channel_name, None)
-                        epg_info_list = self.epg_data.get(epg_channel_id, [])
-
-                    if epg_info_list:
-                        current_epg = None
-                        for epg in epg_info_list:
-                            start_time = parser.parse(epg['start_time'])
-                            stop_time = parser.parse(epg['stop_time'])
-                            if start_time <= now <= stop_time:
-                                current_epg = epg
-                                break
-                            elif start_time > now:
-                                current_epg = epg
-                                break
-
-                        if current_epg:
-                            start_time = parser.parse(current_epg['start_time']).astimezone(tz.tzlocal())
-                            stop_time = parser.parse(current_epg['stop_time']).astimezone(tz.tzlocal())
-                            start_time_formatted = start_time.strftime("%I:%M %p")
-                            stop_time_formatted = stop_time.strftime("%I:%M %p")
-                            title = current_epg['title']
-                            display_text += f" - {title} ({start_time_formatted} - {stop_time_formatted})"
-                            tooltip_text = current_epg['description']
-                        else:
-                            display_text += " - No Current EPG Data Available"
-                            tooltip_text = "No current EPG information found."
-                    else:
-                        display_text += " - No EPG Data"
-                        tooltip_text = "No EPG information found."
+        last_level = stack[-1]
+        level = last_level['level']
+        data = last_level['data']
+        scroll_position = last_level.get('scroll_position', 0)
+        if level == 'channels':
+            self.entries_per_tab[tab_name] = data['entries']
+            self.show_channels(list_widget, tab_name)
+            list_widget.verticalScrollBar().setValue(scroll_position)
+        elif level == 'series_categories':
+            self.show_series_in_category(data['series_list'], restore_scroll_position=True, scroll_position=scroll_position)
+        elif level == 'series':
+            self.show_seasons(data['seasons'], restore_scroll_position=True, scroll_position=scroll_position)
+        elif level == 'season':
+            self.show_episodes(data['episodes'], restore_scroll_position=True, scroll_position=scroll_position)
+
+    def show_cached_level(self, tab_name, proxy):
+        list_widget = self.get_list_widget(tab_name)
+        if list_widget.model() is proxy:
+            # Still on screen (e.g. a plain tab switch): leave sort, filter and scroll alone
+            return
 
-                item = QListWidgetItem(display_text)
-                item.setData(Qt.UserRole, entry)
-                item.setIcon(channel_icon)
+        stack = self.navigation_stacks[tab_name]
+        if stack:
+            scroll_position = stack[-1].get('scroll_position', 0)
+            proxy.search(self.search_bars[tab_name].text())
+            if stack[-1]['level'] == 'channels':
+                self.entries_per_tab[tab_name] = stack[-1]['data']['entries']
+        else:
+            scroll_position = self.top_level_scroll_positions.get(tab_name, 0)
+            self.global_search_tabs.discard(tab_name)
+            self.search_bars[tab_name].clear()
+            proxy.search('')
 
-                if tooltip_text:
-                    description_html = html.escape(tooltip_text)
-                    tooltip_text_formatted = f"""
-                    <div style="max-width: 300px; white-space: normal;">
-                        {description_html}
-                    </div>
-                    """
-                    item.setToolTip(tooltip_text_formatted)
+        self.attach_model(tab_name, proxy)
+        if tab_name == 'LIVE':
+            # Programmes may have ended while this level was off screen
+            self.refresh_now_playing()
+        self.check_streams(tab_name)
+        list_widget.verticalScrollBar().setValue(scroll_position)
+        QTimer.singleShot(0, lambda: list_widget.verticalScrollBar().setValue(scroll_position))
 
-                items.append(item)
+    def cache_level_view(self, tab_name):
+        """
+        Remember the model just built for the tab's current level, apply the query typed
+        while it was loading (search_in_list skips a level that is not there yet), and
+        check its streams.
+        """
+        stack = self.navigation_stacks[tab_name]
+        self.level_views.put(stack[-1] if stack else tab_name, tab_name, self.list_models[tab_name])
+        text = self.search_bars[tab_name].text()
+        if text:
+            self.search_in_list(tab_name, text)
+        self.check_streams(tab_name)
+
+    def show_streamed_batch(self, tab_name, batch, label, formatter=None):
+        """
+        Show the entries of a level that is still downloading, in arrival order. The
+        first batch replaces the loading placeholder; later ones are appended.
+        """
+        proxy = self.streaming_models.get(tab_name)
+        if proxy is None or proxy is not self.list_models[tab_name]:
+            self.streaming_models[tab_name] = self.set_list_model(
+                tab_name, list(batch), label, formatter=formatter, go_back=True
+            )
+            self.streaming_rows[tab_name] = []
+            return
+        # Coalesce the rest so the view lays out a few large inserts, not one per chunk
+        pending = self.streaming_rows[tab_name]
+        if not pending:
+            QTimer.singleShot(STREAM_FLUSH_MS, lambda: self.flush_streamed_rows(tab_name, proxy))
+        pending.extend(batch)
+
+    def flush_streamed_rows(self, tab_name, proxy):
+        if self.streaming_models.get(tab_name) is not proxy:
+            return
+        pending = self.streaming_rows[tab_name]
+        self.streaming_rows[tab_name] = []
+        proxy.sourceModel().append_entries(pending)
 
-            items.sort(key=lambda x: x.text())
-            for item in items:
-                list_widget.addItem(item)
+    def finish_streamed_level(self, tab_name):
+        """
+        Sort the streamed list once it is complete and cache it as the tab's current
+        level. Returns False if nothing was streamed, so the caller builds the level.
+        """
+        proxy = self.streaming_models.get(tab_name)
+        if proxy is None or proxy is not self.list_models[tab_name]:
+            self.streaming_models.pop(tab_name, None)
+            return False
+        with span('render.finish_stream', tab=tab_name) as fields:
+            self.flush_streamed_rows(tab_name, proxy)
+            del self.streaming_models[tab_name]
+            proxy.sort()
+            QTimer.singleShot(0, proxy.build_search_index)
+            self.cache_level_view(tab_name)
+            fields['items'] = proxy.sourceModel().rowCount()
+        return True
 
-            list_widget.verticalScrollBar().setValue(0)
+    def show_channels(self, list_widget, tab_name):
+        try:
+            with span('render.show_channels', tab=tab_name, items=len(self.entries_per_tab[tab_name])):
+                self.set_list_model(
+                    tab_name,
+                    self.entries_per_tab[tab_name],
+                    lambda entry: entry.name,
+                    formatter=lambda entries: self.format_channel_rows(tab_name, entries),
+                    sort=True
+                )
+                self.cache_level_view(tab_name)
+                list_widget.verticalScrollBar().setValue(0)
         except Exception as e:
             print(f"Error displaying channels: {e}")
 
+    def format_channel_rows(self, tab_name, entries):
+        """
+        Display text and tooltip for a block of stream entries, with the stream health
+        mark and, on LIVE, now-playing info.
+        """
+        names = [entry.name + self.health_mark(entry) for entry in entries]
+        if tab_name != "LIVE" or not self.epg_data:
+            return [(name, '') for name in names]
+
+        entry_epg_ids = self.resolve_epg_channel_ids(entries)
+        now = time.time()
+        now_playing = self.epg_data.now_playing(entry_epg_ids, now)
+
+        rows = []
+        next_expiry = None
+        for display_text, epg_channel_id in zip(names, entry_epg_ids):
+            expires = None
+            if epg_channel_id in self.epg_data:
+                current_epg = now_playing.get(epg_channel_id)
+                if current_epg:
+                    start_time_formatted = datetime.fromtimestamp(current_epg.start).strftime("%I:%M %p")
+                    stop_time_formatted = datetime.fromtimestamp(current_epg.stop).strftime("%I:%M %p")
+                    display_text += f" - {current_epg.title} ({start_time_formatted} - {stop_time_formatted})"
+                    tooltip_text = current_epg.description
+                    # The label stays right until the programme on air ends or, when
+                    # it shows the next one, until that one starts
+                    expires = current_epg.start if current_epg.start > now else current_epg.stop
+                    if next_expiry is None or expires < next_expiry:
+                        next_expiry = expires
+                else:
+                    display_text += " - No Current EPG Data Available"
+                    tooltip_text = "No current EPG information found."
+            else:
+                display_text += " - No EPG Data"
+                tooltip_text = "No EPG information found."
+            rows.append((display_text, self.format_tooltip(tooltip_text), expires))
+        if next_expiry is not None:
+            self.schedule_now_playing_refresh(next_expiry)
+        return rows
+
+    def resolve_epg_channel_ids(self, entries):
+        """Guide channel ids of stream entries; new name matches are saved shortly after."""
+        channel_ids = resolve_epg_channel_ids(self.epg_data, self.epg_channel_map, entries)
+        if self.epg_channel_map.dirty and not self.epg_map_save_timer.isActive():
+            self.epg_map_save_timer.start()
+        return channel_ids
+
+    def stream_url(self, entry):
+        if isinstance(entry, StreamRecord):
+            return entry.play_url(self.server, self.username, self.password)
+        return None
+
+    def health_mark(self, entry):
+        """' [Dead]' or ' [Slow 3.2s]' after a checked stream's name while Check Streams is on."""
+        if self.stream_health is None or not self.health_checkbox.isChecked():
+            return ''
+        url = self.stream_url(entry)
+        health = self.stream_health.get(url) if url else None
+        if health is None or health.status == 'ok':
+            return ''
+        if health.status == 'dead':
+            return " [Dead]"
+        return f" [Slow {health.latency:.1f}s]"
+
+    def check_streams(self, tab_name):
+        """
+        Probe the streams of the tab's current level in the background, top of the list
+        first, when Check Streams is on. As many probes run at once as the account has
+        free connections; one check runs at a time, and a new one supersedes it.
+        """
+        if not self.health_checkbox.isChecked() or self.stream_health is None:
+            return
+        stack = self.navigation_stacks[tab_name]
+        proxy = self.list_models.get(tab_name)
+        if not stack or stack[-1]['level'] not in ('channels', 'series_categories') or proxy is None:
+            return
+        model = proxy.sourceModel()
+        rows_by_url = {}
+        for i in proxy.visible_entry_indexes():
+            url = self.stream_url(model.entries[i])
+            if url:
+                rows_by_url.setdefault(url, []).append(i)
+        if not rows_by_url:
+            return
+
+        max_connections, active_connections = self.account_connections or (None, None)
+        concurrency = probe_concurrency(max_connections, active_connections)
+        if not concurrency:
+            self.set_progress_text("No free connections to check streams")
+            return
+        check = {'tab_name': tab_name, 'proxy': proxy, 'rows': rows_by_url, 'dead': set(), 'slow': 0, 'done': 0, 'pending': False}
+        # Set on cancel (Play, another level, a new login): probes in flight are let finish
+        # and no new ones start, so the check gives the account's connections back
+        cancelled = threading.Event()
+        self.start_request(
+            'health',
+            lambda result: self.on_streams_checked(check),
+            lambda error: print(f"Error checking streams: {error}"),
+            probe_streams, list(rows_by_url), self.stream_health, concurrency, self.health_slow_after, cancelled,
+            on_batch=lambda batch: self.on_stream_health(check, batch),
+            cancel_event=cancelled
+        )
+
+    def on_stream_health(self, check, batch):
+        model = check['proxy'].sourceModel()
+        for url, health in batch:
+            entry_indexes = check['rows'][url]
+            check['done'] += 1
+            if health.status == 'dead':
+                check['dead'].update(entry_indexes)
+            elif health.status == 'slow':
+                check['slow'] += 1
+            if health.status != 'ok':
+                model.refresh_entries(entry_indexes)
+        if check['dead'] and self.dead_streams != 'mark' and not check['pending']:
+            # Reorder at most once a second rather than jumping the list on every result
+            check['pending'] = True
+            QTimer.singleShot(HEALTH_APPLY_MS, lambda: self.apply_dead_streams(check))
+        self.set_progress_text(
+            f"Checked {check['done']}/{len(check['rows'])} streams: {len(check['dead'])} dead, {check['slow']} slow"
+        )
+
+    def on_streams_checked(self, check):
+        self.apply_dead_streams(check)
+
+    def apply_dead_streams(self, check):
+        """Move or hide the dead streams found so far, keeping the list's scroll position."""
+        check['pending'] = False
+        proxy = check['proxy']
+        list_widget = self.get_list_widget(check['tab_name'])
+        scroll_position = list_widget.verticalScrollBar().value()
+        proxy.set_demoted(check['dead'], self.dead_streams)
+        if list_widget.model() is proxy:
+            list_widget.verticalScrollBar().setValue(scroll_position)
+
+    def on_health_checkbox_toggled(self, state):
+        if state == Qt.Checked:
+            tab_name = self.tab_widget.tabText(self.tab_widget.currentIndex())
+            if tab_name in self.navigation_stacks:
+                self.check_streams(tab_name)
+            return
+        self.cancel_request('health')
+        self.set_progress_text("")
+        # Take the marks off, and put dead streams back in place, on every built level
+        for tab_name in self.navigation_stacks:
+            for proxy in self.level_views.views(tab_name):
+                proxy.set_demoted((), None)
+                proxy.sourceModel().invalidate()
+
+    def on_dead_streams_mode_changed(self, index):
+        self.dead_streams = self.dead_streams_combo.itemData(index)
+        self.save_dead_streams_mode()
+        if self.health_checkbox.isChecked():
+            tab_name = self.tab_widget.tabText(self.tab_widget.currentIndex())
+            if tab_name in self.navigation_stacks:
+                self.check_streams(tab_name)
+
+    def open_epg_grid(self):
+        """Open the TV guide grid for the LIVE channels currently listed, in list order."""
+        stack = self.navigation_stacks['LIVE']
+        proxy = self.list_models.get('LIVE')
+        if not self.epg_data:
+            self.animate_progress(0, 100, "No EPG data loaded")
+            return
+        if not stack or stack[-1]['level'] != 'channels' or proxy is None:
+            self.animate_progress(0, 100, "Open a LIVE category first")
+            return
+        entries = [entry for entry in proxy.visible_entries() if isinstance(entry, StreamRecord)]
+        channel_ids = self.resolve_epg_channel_ids(entries)
+        channels = [(entry.name, channel_id, entry) for entry, channel_id in zip(entries, channel_ids)]
+        if self.epg_grid_dialog is not None:
+            self.epg_grid_dialog.close()
+        category_id = entries[0].category_id if entries else None
+        title = next(
+            (g['category_name'] for g in self.groups.get('LIVE', []) if str(g['category_id']) == category_id), 'LIVE'
+        )
+        self.epg_grid_dialog = EPGGridDialog(self.epg_data, channels, title, self)
+        self.epg_grid_dialog.grid.channel_activated.connect(self.play_channel)
+        self.epg_grid_dialog.show()
+
+    def schedule_now_playing_refresh(self, expires):
+        """Arm the refresh timer for `expires` unless it already fires sooner."""
+        delay = min(max(0, int((expires - time.time()) * 1000)) + NOW_PLAYING_SLACK_MS, NOW_PLAYING_MAX_WAIT_MS)
+        if not self.now_playing_timer.isActive() or delay < self.now_playing_timer.remainingTime():
+            self.now_playing_timer.start(delay)
+
+    def refresh_now_playing(self):
+        """
+        Redraw the LIVE rows whose programme has ended. Only those rows are reformatted
+        (when the view repaints them), which re-arms the timer for their new programme.
+        """
+        proxy = self.list_models.get('LIVE')
+        if proxy is None:
+            return
+        model = proxy.sourceModel()
+        model.expire(time.time())
+        next_expiry = model.next_expiry()
+        if next_expiry is not None:
+            self.schedule_now_playing_refresh(next_expiry)
+
+    def format_tooltip(self, tooltip_text):
+        if not tooltip_text:
+            return ''
+        description_html = html.escape(tooltip_text)
+        return f"""
+        <div style="max-width: 300px; white-space: normal;">
+            {description_html}
+        </div>
+        """
+
     def fetch_series_in_category(self, category_name):
         try:
             list_widget = self.get_list_widget('Series')
@@ -1162,46 +2621,47 @@ class IPTVPlayerApp(QMainWindow):
 
             category_id = next(g["category_id"] for g in self.groups["Series"] if g["category_name"] == category_name)
 
-            http_method = self.get_http_method()
-            params = {
-                'username': self.username,
-                'password': self.password,
-                'action': 'get_series',
-                'category_id': category_id
-            }
+            self.usage.record_category('Series', category_id)
+            catalog = self.catalogs.get('Series')
+            if catalog is not None:
+                self.on_series_in_category_loaded(catalog.category_entries(category_id))
+                return
 
-            streams_url = f"{self.server}/player_api.php"
-            response = self.make_request(http_method, streams_url, params)
-            response.raise_for_status()
+            self.show_loading('Series')
+            self.streaming_models.pop('Series', None)
+            self.start_api_request(
+                'Series',
+                self.on_series_in_category_loaded,
+                lambda error: self.on_series_error("Error fetching series", error),
+                lambda old, new: self.refresh_level('Series', 'series_list', old, new),
+                self.xtream_client().streams, 'Series', category_id,
+                on_batch=lambda batch: self.show_streamed_batch('Series', batch, lambda entry: entry.name)
+            )
 
-            series_list = response.json()
+        except Exception as e:
+            self.on_series_error("Error fetching series", e)
 
-            self.navigation_stacks['Series'].append({'level': 'series_categories', 'data': {'series_list': series_list}, 'scroll_position': 0})
+    def on_series_in_category_loaded(self, series_list):
+        self.navigation_stacks['Series'].append({'level': 'series_categories', 'data': {'series_list': series_list}, 'scroll_position': 0})
+        if self.finish_streamed_level('Series'):
+            self.current_series_list = series_list
+        else:
             self.show_series_in_category(series_list)
 
-        except Exception as e:
-            print(f"Error fetching series: {e}")
+    def on_series_error(self, message, error):
+        print(f"{message}: {error}")
+        self.show_current_level('Series')
 
     def show_series_in_category(self, series_list, restore_scroll_position=False, scroll_position=0):
         try:
             list_widget = self.channel_list_series
-
-            list_widget.clear()
-            if self.navigation_stacks['Series']:
-                go_back_item = QListWidgetItem("Go Back")
-                go_back_item.setIcon(self.go_back_icon)
-                list_widget.addItem(go_back_item)
-
-            items = []
-            for entry in series_list:
-                item = QListWidgetItem(entry["name"])
-                item.setData(Qt.UserRole, entry)
-                item.setIcon(self.series_channel_icon)
-                items.append(item)
-
-            items.sort(key=lambda x: x.text())
-            for item in items:
-                list_widget.addItem(item)
+            self.set_list_model(
+                'Series', series_list, lambda entry: entry.name,
+                # Playlist groups list their episodes, which can be checked like channels
+                formatter=lambda entries: self.format_channel_rows('Series', entries),
+                sort=True
+            )
+            self.cache_level_view('Series')
 
             if restore_scroll_position:
                 QTimer.singleShot(0, lambda: list_widget.verticalScrollBar().setValue(scroll_position))
@@ -1220,54 +2680,52 @@ class IPTVPlayerApp(QMainWindow):
             if stack:
                 stack[-1]['scroll_position'] = current_scroll_position
 
-            http_method = self.get_http_method()
-            params = {
-                'username': self.username,
-                'password': self.password,
-                'action': 'get_series_info',
-                'series_id': series_entry["series_id"]
-            }
+            self.show_loading('Series')
+            self.start_api_request(
+                'Series',
+                lambda series_info: self.on_seasons_loaded(series_entry, series_info),
+                lambda error: self.on_series_error("Error fetching seasons", error),
+                self.on_series_info_refreshed,
+                self.xtream_client().series_info, series_entry.series_id
+            )
 
-            episodes_url = f"{self.server}/player_api.php"
-            response = self.make_request(http_method, episodes_url, params)
-            response.raise_for_status()
+        except Exception as e:
+            self.on_series_error("Error fetching seasons", e)
 
-            series_info = response.json()
+    def on_seasons_loaded(self, series_entry, series_info):
+        try:
             self.series_info = series_info
 
             seasons = list(series_info.get("episodes", {}).keys())
             self.navigation_stacks['Series'].append({'level': 'series', 'data': {'series_entry': series_entry, 'seasons': seasons}, 'scroll_position': 0})
             self.show_seasons(seasons)
-
         except Exception as e:
-            print(f"Error fetching seasons: {e}")
+            self.on_series_error("Error fetching seasons", e)
+
+    def on_series_info_refreshed(self, old, new):
+        if self.series_info is not old:
+            return
+        self.series_info = new
+        stack = self.navigation_stacks['Series']
+        if stack and stack[-1]['level'] == 'series':
+            self.refresh_level('Series', 'seasons', stack[-1]['data']['seasons'], list(new.get("episodes", {}).keys()))
+        elif stack and stack[-1]['level'] == 'season':
+            season_number = stack[-1]['data']['season_number']
+            episodes = new.get("episodes", {}).get(str(season_number), [])
+            self.refresh_level('Series', 'episodes', stack[-1]['data']['episodes'], episodes)
 
     def show_seasons(self, seasons, restore_scroll_position=False, scroll_position=0):
         try:
             list_widget = self.channel_list_series
-            list_widget.clear()
-            if self.navigation_stacks['Series']:
-                go_back_item = QListWidgetItem("Go Back")
-                go_back_item.setIcon(self.go_back_icon)
-                list_widget.addItem(go_back_item)
-
             seasons_int = sorted([int(season) for season in seasons])
-            items = []
-            for season in seasons_int:
-                item = QListWidgetItem(f"Season {season}")
-                item.setData(Qt.UserRole, str(season))
-                item.setIcon(self.series_channel_icon)
-                items.append(item)
-
-            for item in items:
-                list_widget.addItem(item)
+            self.current_seasons = [str(season) for season in seasons_int]
+            self.set_list_model('Series', self.current_seasons, lambda season: f"Season {season}")
+            self.cache_level_view('Series')
 
             if restore_scroll_position:
                 QTimer.singleShot(0, lambda: list_widget.verticalScrollBar().setValue(scroll_position))
             else:
                 list_widget.verticalScrollBar().setValue(0)
-
-            self.current_seasons = [str(season) for season in seasons_int]
         except Exception as e:
             print(f"Error displaying seasons: {e}")
 
@@ -1289,20 +2747,15 @@ class IPTVPlayerApp(QMainWindow):
     def show_episodes(self, episodes, restore_scroll_position=False, scroll_position=0):
         try:
             list_widget = self.channel_list_series
-            list_widget.clear()
-            if self.navigation_stacks['Series']:
-                go_back_item = QListWidgetItem("Go Back")
-                go_back_item.setIcon(self.go_back_icon)
-                list_widget.addItem(go_back_item)
-
             episodes_sorted = sorted(episodes, key=lambda x: int(x.get('episode_num', 0)))
             stack = self.navigation_stacks['Series']
             if stack and len(stack) >= 2 and 'series_entry' in stack[-2]['data']:
-                series_title = stack[-2]['data']['series_entry'].get('name', '').strip()
+                series_title = stack[-2]['data']['series_entry'].name.strip()
             else:
                 series_title = "Unknown Series"
 
-            items = []
+            client = self.xtream_client()
+            episode_entries = []
             for episode in episodes_sorted:
                 raw_episode_title = str(episode.get('title', 'Untitled Episode')).strip()
                 season = str(episode.get('season', '1'))
@@ -1329,17 +2782,16 @@ class IPTVPlayerApp(QMainWindow):
                     "season": season,
                     "episode_num": episode_num,
                     "name": display_text,
-                    "url": f"{self.server}/series/{self.username}/{self.password}/{episode['id']}.{episode.get('container_extension', 'm3u8')}",
+                    "url": client.episode_url(episode),
                     "title": episode_title
                 }
+                episode_entries.append(episode_entry)
 
-                item = QListWidgetItem(display_text)
-                item.setData(Qt.UserRole, episode_entry)
-                item.setIcon(self.series_channel_icon)
-                items.append(item)
-
-            for item in items:
-                list_widget.addItem(item)
+            self.set_list_model(
+                'Series', episode_entries, lambda entry: entry["title"],
+                formatter=lambda entries: [(entry["name"], '') for entry in entries]
+            )
+            self.cache_level_view('Series')
 
             if restore_scroll_position:
                 QTimer.singleShot(0, lambda: list_widget.verticalScrollBar().setValue(scroll_position))
@@ -1352,7 +2804,10 @@ class IPTVPlayerApp(QMainWindow):
 
     def play_channel(self, entry):
         try:
-            stream_url = entry.get("url")
+            if isinstance(entry, StreamRecord):
+                stream_url = entry.play_url(self.server, self.username, self.password)
+            else:
+                stream_url = entry.get("url")
             if not stream_url:
                 self.animate_progress(0, 100, "Stream URL not found")
                 return
@@ -1367,6 +2822,8 @@ class IPTVPlayerApp(QMainWindow):
                         self.animate_progress(0, 100, "Selected player is not executable")
                         return
 
+                # The player needs a free connection more than a running stream check does
+                self.cancel_request('health')
                 subprocess.Popen(command)
             else:
                 self.animate_progress(0, 100, "No external player configured")
@@ -1385,45 +2842,17 @@ class IPTVPlayerApp(QMainWindow):
                     self.result_display.clear()
                     self.result_display.setText("Ready to fetch and display data.")
                     self.info_tab_initialized = True
+                self.update_timing_summary()
+                self.timing_timer.start()
                 return
+            self.timing_timer.stop()
 
-            if self.login_type == 'xtream':
-                stack = self.navigation_stacks.get(tab_name, [])
-                list_widget = self.get_list_widget(tab_name)
+            if tab_name in self.active_requests:
+                # Leave the loading placeholder up until the request completes
+                return
 
-                if not stack:
-                    self.update_category_lists(tab_name)
-                    list_widget.verticalScrollBar().setValue(
-                        self.top_level_scroll_positions.get(tab_name, 0)
-                    )
-                else:
-                    last_level = stack[-1]
-                    level = last_level['level']
-                    data = last_level['data']
-                    scroll_position = last_level.get('scroll_position', 0)
-
-                    if level == 'channels':
-                        self.entries_per_tab[tab_name] = data['entries']
-                        self.show_channels(list_widget, tab_name)
-                        list_widget.verticalScrollBar().setValue(scroll_position)
-                    elif level == 'series_categories':
-                        self.show_series_in_category(
-                            data['series_list'],
-                            restore_scroll_position=True,
-                            scroll_position=scroll_position
-                        )
-                    elif level == 'series':
-                        self.show_seasons(
-                            data['seasons'],
-                            restore_scroll_position=True,
-                            scroll_position=scroll_position
-                        )
-                    elif level == 'season':
-                        self.show_episodes(
-                            data['episodes'],
-                            restore_scroll_position=True,
-                            scroll_position=scroll_position
-                        )
+            if self.login_type:
+                self.show_current_level(tab_name)
 
         except Exception as e:
             print(f"Error while switching tabs: {e}")
@@ -1491,190 +2920,70 @@ class IPTVPlayerApp(QMainWindow):
 
     def sort_channel_list(self, list_widget):
         try:
-            items = []
-            for i in range(list_widget.count()):
-                item = list_widget.item(i)
-                if item.text() != "Go Back":
-                    items.append(item)
-
-            items.sort(key=lambda x: x.text())
-            list_widget.clear()
-
-            current_tab = self.tab_widget.tabText(self.tab_widget.currentIndex())
-            if self.navigation_stacks[current_tab]:
-                go_back_item = QListWidgetItem("Go Back")
-                go_back_item.setIcon(self.go_back_icon)
-                list_widget.addItem(go_back_item)
-
-            for item in items:
-                list_widget.addItem(item)
+            list_widget.model().sort(0)
         except Exception as e:
             print(f"Error sorting channel list: {e}")
 
     def search_in_list(self, tab_name, text):
         """
-        When the user types in the search bar for the given tab (LIVE, Movies, Series):
-          - If text is empty => revert to the original list in the current level
-          - If at top-level => search category names
-          - If inside a sub-level => search items in that sub-level (channels/movies/episodes)
+        When the user types in the search bar for the given tab (LIVE, Movies, Series),
+        filter the rows of the current level (categories, channels/movies, series,
+        seasons or episodes) by their label through the level's SearchIndex. An empty
+        query shows every row again.
 
         Displays "Not Found" if no results.
         """
 
         list_widget = self.get_list_widget(tab_name)
-        if not list_widget:
+        if not list_widget or tab_name in self.active_requests:
+            return
+        proxy = self.list_models.get(tab_name)
+        if proxy is None:
             return
 
-        # Trim leading/trailing spaces
-        text = text.strip()
-
-        # 1) If the search bar is cleared => revert to original view
-        if not text:
-            if self.navigation_stacks[tab_name]:
-                # We are inside a sub-level
-                last_level = self.navigation_stacks[tab_name][-1]
-                level = last_level['level']
-                data = last_level['data']
-                scroll_position = last_level.get('scroll_position', 0)
-
-                list_widget.clear()
-                go_back_item = QListWidgetItem("Go Back")
-                go_back_item.setIcon(self.go_back_icon)
-                list_widget.addItem(go_back_item)
-
-                if level == 'channels':
-                    # Re-show the channels for this category
-                    self.entries_per_tab[tab_name] = data['entries']
-                    self.show_channels(list_widget, tab_name)
-                    list_widget.verticalScrollBar().setValue(scroll_position)
-
-                elif level == 'series_categories':
-                    self.show_series_in_category(
-                        data['series_list'],
-                        restore_scroll_position=True,
-                        scroll_position=scroll_position
-                    )
-
-                elif level == 'series':
-                    self.show_seasons(
-                        data['seasons'],
-                        restore_scroll_position=True,
-                        scroll_position=scroll_position
-                    )
-
-                elif level == 'season':
-                    self.show_episodes(
-                        data['episodes'],
-                        restore_scroll_position=True,
-                        scroll_position=scroll_position
-                    )
+        with span('render.search', tab=tab_name, query_length=len(text)) as fields:
+            if not self.navigation_stacks[tab_name] and tab_name in self.catalogs:
+                self.show_global_search(tab_name, text)
+                fields['scope'] = 'catalog'
             else:
-                # No stack => top-level: show the categories again
-                self.update_category_lists(tab_name)
+                proxy.search(text)
+                fields['scope'] = 'level'
+            fields['items'] = self.list_models[tab_name].rowCount()
 
-            return  # Done reverting on empty text
-
-        # 2) The user typed something => do the search
-        list_widget.clear()
-
-        # If inside a sub-level, we add "Go Back" at the top
-        if self.navigation_stacks[tab_name]:
-            go_back_item = QListWidgetItem("Go Back")
-            go_back_item.setIcon(self.go_back_icon)
-            list_widget.addItem(go_back_item)
-
-        filtered_items = []
-
-        # 2A) If we are at TOP-LEVEL (stack is empty):
-        #     => Search among category names in self.groups[tab_name]
-        if not self.navigation_stacks[tab_name]:
-            group_list = self.groups.get(tab_name, [])
-            for group in group_list:
-                cat_name = group["category_name"]
-                if text.lower() in cat_name.lower():
-                    # We found a matching category
-                    item = QListWidgetItem(cat_name)
-                    if tab_name == 'LIVE':
-                        item.setIcon(self.live_channel_icon)
-                    elif tab_name == 'Movies':
-                        item.setIcon(self.movies_channel_icon)
-                    elif tab_name == 'Series':
-                        item.setIcon(self.series_channel_icon)
-                    else:
-                        item.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_FileIcon))
+    def show_global_search(self, tab_name, text):
+        """
+        Top-level search once the full catalog is loaded: matching categories first,
+        then matching entries from every category of the tab.
+        """
+        if not text.strip():
+            if tab_name in self.global_search_tabs:
+                self.show_current_level(tab_name)
+            return
 
-                    filtered_items.append(item)
+        query = fold_text(text.strip())
+        categories = sorted(
+            (group for group in self.groups[tab_name] if query in fold_text(group["category_name"])),
+            key=lambda group: group["category_name"]
+        )
+        entries = self.catalogs[tab_name].search(text)
+        category_names = {str(group["category_id"]): group["category_name"] for group in self.groups[tab_name]}
+
+        def format_results(results):
+            rows = []
+            for result in results:
+                if isinstance(result, dict):
+                    rows.append((result["category_name"], ''))
+                else:
+                    rows.append((f"{result.name} [{category_names.get(result.category_id, '')}]", ''))
+            return rows
 
-        # 2B) If we are INSIDE a sub-level (stack is not empty):
-        else:
-            # Look at the last level
-            last_level = self.navigation_stacks[tab_name][-1]
-            level = last_level['level']
-
-            if level == 'channels':
-                # We’re in a channel list => search channels in entries_per_tab[tab_name]
-                for entry in self.entries_per_tab[tab_name]:
-                    channel_name = entry.get('name', '')
-                    if text.lower() in channel_name.lower():
-                        item = QListWidgetItem(channel_name)
-                        item.setData(Qt.UserRole, entry)
-                        if tab_name == 'LIVE':
-                            item.setIcon(self.live_channel_icon)
-                        elif tab_name == 'Movies':
-                            item.setIcon(self.movies_channel_icon)
-                        else:
-                            item.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_FileIcon))
-                        filtered_items.append(item)
-
-            elif level == 'series_categories':
-                # We’re in a series-list => search in self.current_series_list
-                for series_info in self.current_series_list:
-                    series_name = series_info["name"]
-                    if text.lower() in series_name.lower():
-                        item = QListWidgetItem(series_name)
-                        item.setData(Qt.UserRole, series_info)
-                        item.setIcon(self.series_channel_icon)
-                        filtered_items.append(item)
-
-            elif level == 'series':
-                # We’re listing the seasons => let's see if user typed "Season 1", "Season 2", etc.
-                for season in self.current_seasons:
-                    label = f"Season {season}"
-                    if text.lower() in label.lower():
-                        item = QListWidgetItem(label)
-                        item.setData(Qt.UserRole, season)
-                        item.setIcon(self.series_channel_icon)
-                        filtered_items.append(item)
-
-            elif level == 'season':
-                # We’re listing episodes => search by episode title
-                for episode in self.current_episodes:
-                    ep_title = episode.get('title', '')
-                    if text.lower() in ep_title.lower():
-                        display_text = f"Episode {episode['episode_num']}: {ep_title}"
-                        episode_entry = {
-                            "season": episode.get('season'),
-                            "episode_num": episode['episode_num'],
-                            "name": display_text,
-                            "url": f"{self.server}/series/{self.username}/{self.password}/{episode['id']}.{episode.get('container_extension', 'm3u8')}",
-                            "title": ep_title
-                        }
-                        item = QListWidgetItem(display_text)
-                        item.setData(Qt.UserRole, episode_entry)
-                        item.setIcon(self.series_channel_icon)
-                        filtered_items.append(item)
-
-        # 3) After building 'filtered_items', decide what to show
-        if not filtered_items:
-            # No results => show "Not Found"
-            not_found_item = QListWidgetItem("Not Found")
-            not_found_item.setFlags(not_found_item.flags() & ~Qt.ItemIsSelectable & ~Qt.ItemIsEnabled)
-            list_widget.addItem(not_found_item)
-        else:
-            # Sort them by text if you like
-            filtered_items.sort(key=lambda x: x.text().lower())
-            for item in filtered_items:
-                list_widget.addItem(item)
+        self.set_list_model(
+            tab_name, categories + entries,
+            lambda result: result["category_name"] if isinstance(result, dict) else result.name,
+            formatter=format_results,
+            empty_text="Not Found"
+        )
+        self.global_search_tabs.add(tab_name)
 
 
     def get_list_widget(self, tab_name):
@@ -1686,8 +2995,107 @@ class IPTVPlayerApp(QMainWindow):
         if 'ExternalPlayer' in config:
             self.external_player_command = config['ExternalPlayer'].get('Command', '')
 
+    def load_network_settings(self):
+        """
+        Apply the optional [Network] section of config.ini (PoolSize, Retries,
+        BackoffFactor) to the shared per-host HTTP clients.
+        """
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        if 'Network' in config:
+            section = config['Network']
+            configure_http_clients(
+                pool_size=section.getint('PoolSize', fallback=DEFAULT_POOL_SIZE),
+                retries=section.getint('Retries', fallback=DEFAULT_RETRIES),
+                backoff_factor=section.getfloat('BackoffFactor', fallback=DEFAULT_BACKOFF_FACTOR),
+            )
+
+    def load_tracing_settings(self):
+        """
+        Apply the optional [Tracing] section of config.ini: Enabled (default yes) turns
+        the timing spans and their trace.jsonl log on or off, LogFile moves the log.
+        """
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        if 'Tracing' in config:
+            section = config['Tracing']
+            configure_tracing(
+                enabled=section.getboolean('Enabled', fallback=True),
+                path=section.get('LogFile') or None,
+            )
+
+    def update_timing_summary(self):
+        """Redraw the Info tab's per-operation latency table, slowest p95 first."""
+        summary = tracer.summary()
+        if not summary:
+            self.timing_display.setPlainText("No timings recorded yet." if tracer.enabled else "Tracing is disabled.")
+            return
+        lines = [f"{'Operation':<24}{'Count':>7}{'p50':>10}{'p95':>10}{'Max':>10}"]
+        for name, stats in sorted(summary.items(), key=lambda item: item[1]['p95'], reverse=True):
+            lines.append(
+                f"{name:<24}{stats['count']:>7}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['max']:>10.1f}"
+            )
+        scroll_position = self.timing_display.verticalScrollBar().value()
+        self.timing_display.setPlainText("\n".join(lines))
+        self.timing_display.verticalScrollBar().setValue(scroll_position)
+
+    def load_epg_cache_ttl(self):
+        """
+        How long (in seconds) a cached EPG is used before it is downloaded again.
+        Configurable through the CacheTTL key of the [EPG] section in config.ini.
+        """
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        if 'EPG' in config:
+            return config['EPG'].getint('CacheTTL', fallback=DEFAULT_EPG_CACHE_TTL)
+        return DEFAULT_EPG_CACHE_TTL
+
+    def load_api_cache_ttls(self):
+        """
+        Per-kind TTLs (in seconds) of the player_api.php response cache, from the
+        CategoriesTTL, StreamsTTL and SeriesInfoTTL keys of the [Cache] section.
+        """
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        ttls = dict(DEFAULT_API_CACHE_TTLS)
+        if 'Cache' in config:
+            section = config['Cache']
+            ttls['categories'] = section.getint('CategoriesTTL', fallback=ttls['categories'])
+            ttls['streams'] = section.getint('StreamsTTL', fallback=ttls['streams'])
+            ttls['series_info'] = section.getint('SeriesInfoTTL', fallback=ttls['series_info'])
+        return ttls
+
+    def load_health_settings(self):
+        """
+        Stream check settings from the optional [Health] section of config.ini: TTL (in
+        seconds) a result is trusted for, SlowAfter (in seconds) to the first bytes of a
+        slow stream, and DeadStreams, what to do with dead ones (mark, last or hide).
+        """
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        self.health_ttl = DEFAULT_HEALTH_TTL
+        self.health_slow_after = DEFAULT_SLOW_AFTER
+        self.dead_streams = 'mark'
+        if 'Health' in config:
+            section = config['Health']
+            self.health_ttl = section.getint('TTL', fallback=DEFAULT_HEALTH_TTL)
+            self.health_slow_after = section.getfloat('SlowAfter', fallback=DEFAULT_SLOW_AFTER)
+            mode = section.get('DeadStreams', 'mark').strip().lower()
+            if mode in DEAD_STREAM_MODES:
+                self.dead_streams = mode
+
+    def save_dead_streams_mode(self):
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        if 'Health' not in config:
+            config['Health'] = {}
+        config['Health']['DeadStreams'] = self.dead_streams
+        with open('config.ini', 'w') as config_file:
+            config.write(config_file)
+
     def save_external_player_command(self):
         config = configparser.ConfigParser()
+        config.read('config.ini')
         config['ExternalPlayer'] = {'Command': self.external_player_command}
         with open('config.ini', 'w') as config_file:
             config.write(config_file)
@@ -1695,10 +3103,10 @@ class IPTVPlayerApp(QMainWindow):
     def on_epg_checkbox_toggled(self, state):
         # If EPG is checked after we already logged in and no EPG data loaded, start it now.
         if state == Qt.Checked:
-            if self.login_type == 'xtream' and self.server and self.username and self.password and not self.epg_data:
+            if self.login_type and self.epg_source() and not self.epg_data:
                 # Reset progress and load EPG
                 self.reset_progress_bar()
-                self.animate_progress(0, 50, "Loading EPG data...")
+                self.animate_progress(0, 5, "Loading EPG data...")
                 self.load_epg_data_async()
 
     def open_address_book(self):
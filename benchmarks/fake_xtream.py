@@ -0,0 +1,180 @@
+"""
+Local stand-in for an Xtream Codes provider: answers the player_api.php actions the
+player uses and serves get.php (m3u_plus) and xmltv.php (with ETag revalidation and
+gzip), from synthetic data
+of a chosen size, optionally adding a fixed latency to every request.
+
+    python benchmarks/fake_xtream.py --port 8765 --live 10000 --vod 200000 --series 20000 --programmes 1000000
+
+Log in with any username and password at http://127.0.0.1:PORT.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+
+SERVER_PLACEHOLDER = '{server}'
+
+class Dataset:
+    """Pre-encoded response bodies, so serving measures the client rather than the server."""
+
+    def __init__(self, live=10000, vod=200000, series=20000, programmes=1000000, categories=(200, 400, 200), xmltv_path=None):
+        live_categories, vod_categories, series_categories = categories
+        self.counts = {'live': live, 'vod': vod, 'series': series}
+        live_category_list = synthetic.category_list("Live", live_categories)
+        vod_category_list = synthetic.category_list("Movies", vod_categories)
+        self.categories = {
+            'get_live_categories': json.dumps(live_category_list).encode(),
+            'get_vod_categories': json.dumps(vod_category_list).encode(),
+            'get_series_categories': json.dumps(synthetic.category_list("Series", series_categories)).encode(),
+        }
+        self.live = synthetic.live_streams(live, live_categories)
+        vod_streams = synthetic.vod_streams(vod, vod_categories)
+        self.streams = {
+            'get_live_streams': self.by_category(self.live),
+            'get_vod_streams': self.by_category(vod_streams),
+            'get_series': self.by_category(synthetic.series_list(series, series_categories)),
+        }
+        # Stream URLs carry a placeholder for the address the client used
+        self.m3u_plus = synthetic.m3u_plus(
+            SERVER_PLACEHOLDER, 'bench', 'bench', self.live, live_category_list, vod_streams, vod_category_list
+        ).encode()
+        if xmltv_path is None:
+            handle, xmltv_path = tempfile.mkstemp(prefix='iptv-bench-', suffix='.xml')
+            os.close(handle)
+        self.xmltv_path = xmltv_path
+        self.programmes = synthetic.write_xmltv(xmltv_path, self.live, programmes)
+        with open(xmltv_path, 'rb') as f:
+            self.xmltv = f.read()
+        self.xmltv_gzip = gzip.compress(self.xmltv, 1)
+        self.xmltv_etag = '"%s"' % hashlib.sha1(self.xmltv).hexdigest()[:16]
+
+    @staticmethod
+    def by_category(entries):
+        """Body of the full list under None and of every category under its id."""
+        groups = {}
+        for entry in entries:
+            groups.setdefault(entry['category_id'], []).append(entry)
+        bodies = {category_id: json.dumps(group).encode() for category_id, group in groups.items()}
+        bodies[None] = json.dumps(entries).encode()
+        return bodies
+
+    def close(self):
+        try:
+            os.remove(self.xmltv_path)
+        except OSError:
+            pass
+
+    def answer(self, params):
+        action = params.get('action')
+        if action in self.categories:
+            return self.categories[action]
+        if action in self.streams:
+            return self.streams[action].get(params.get('category_id'), b'[]')
+        if action == 'get_series_info':
+            return json.dumps(synthetic.series_info(params.get('series_id'))).encode()
+        return json.dumps({
+            'user_info': {
+                'username': params.get('username'), 'password': params.get('password'), 'status': 'Active',
+                'exp_date': str(int(time.time()) + 365 * 86400), 'is_trial': '0', 'active_cons': '0',
+                'created_at': '1700000000', 'max_connections': '2',
+            },
+            'server_info': {'url': '127.0.0.1', 'port': '', 'timezone': 'UTC', 'timestamp_now': int(time.time())},
+        }).encode()
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.respond(url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        self.respond(urlsplit(self.path).path, dict(parse_qsl(body)))
+
+    def respond(self, path, params):
+        dataset = self.server.dataset
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if path == '/get.php':
+            body = dataset.m3u_plus.replace(SERVER_PLACEHOLDER.encode(), f"http://{self.headers['Host']}".encode())
+            headers = {'Content-Type': 'audio/x-mpegurl'}
+        elif path == '/xmltv.php':
+            if self.headers.get('If-None-Match') == dataset.xmltv_etag:
+                self.send_response(304)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = dataset.xmltv
+            headers = {'Content-Type': 'application/xml', 'ETag': dataset.xmltv_etag}
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = dataset.xmltv_gzip
+                headers['Content-Encoding'] = 'gzip'
+        elif path == '/player_api.php':
+            body = dataset.answer(params)
+            headers = {'Content-Type': 'application/json'}
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class FakeXtreamServer:
+    """The stand-in server on a background thread; `url` is its base address."""
+
+    def __init__(self, dataset, latency=0.0, port=0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.dataset = dataset
+        self.httpd.latency = latency
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic Xtream Codes data.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--live', type=int, default=10000)
+    parser.add_argument('--vod', type=int, default=200000)
+    parser.add_argument('--series', type=int, default=20000)
+    parser.add_argument('--programmes', type=int, default=1000000)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args()
+    dataset = Dataset(args.live, args.vod, args.series, args.programmes)
+    try:
+        with FakeXtreamServer(dataset, args.latency, args.port) as server:
+            print(f"Serving {dataset.counts} and {dataset.programmes} programmes at {server.url}")
+            server.thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dataset.close()
+
+if __name__ == '__main__':
+    main()
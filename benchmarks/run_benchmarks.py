@@ -0,0 +1,296 @@
+"""
+End-to-end benchmarks against a local stand-in provider (fake_xtream.py) under the
+offscreen Qt platform. Measures login with an empty and a warm cache, EPG download
+and parse inside the player, XMLTV parse time and peak RSS in a separate process,
+show_channels render time for the LIVE (with guide) and Movies lists, search latency
+per keystroke, and parsing and logging in with the m3u_plus playlist. Prints one JSON document; keep them to track changes over time.
+
+    python benchmarks/run_benchmarks.py                          # 10k live, 200k VOD, 20k series, 1M programmes
+    python benchmarks/run_benchmarks.py --scale 0.1 --latency 0.05 --output results.json
+
+Nothing outside a temporary directory is read or written: caches and config files of
+the real player are left alone.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS_DIR)
+PLAYER_PATH = os.path.join(ROOT, 'IPTV M3U_Plus PLAYER by MY-1.py')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+USERNAME = PASSWORD = 'bench'
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, or None where it cannot be read."""
+    try:
+        # Unlike ru_maxrss, VmHWM is not inherited from the parent process across exec
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def epg_parse_child(path):
+    """Run in a fresh interpreter so the peak RSS belongs to the parse alone."""
+    from iptv_core import parse_xmltv
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    store, channel_id_to_names = parse_xmltv(path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'epg_parse_s': round(elapsed, 3),
+        'epg_programmes': store.programme_count(),
+        'epg_channels': len(channel_id_to_names),
+        'epg_parse_peak_rss_mb': peak_rss_mb(),
+        'epg_parse_baseline_rss_mb': baseline,
+    }))
+
+def measure_epg_parse(path):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--epg-parse-child', path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def load_player():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    spec = importlib.util.spec_from_file_location('iptv_player', PLAYER_PATH)
+    player = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(player)
+    return player
+
+class Session:
+    """One QApplication and helpers to drive player windows without a user."""
+
+    def __init__(self, player, server_url):
+        from PyQt5.QtWidgets import QApplication
+        self.player = player
+        self.server_url = server_url
+        self.app = QApplication.instance() or QApplication([sys.argv[0]])
+
+    def wait(self, condition, timeout=600):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("benchmark step did not finish in time")
+            self.app.processEvents()
+            time.sleep(0.001)
+        self.app.processEvents()
+
+    def window(self):
+        window = self.player.IPTVPlayerApp()
+        window.server_entry.setText(self.server_url)
+        window.username_entry.setText(USERNAME)
+        window.password_entry.setText(PASSWORD)
+        window.show()
+        return window
+
+    def paint(self, window, tab_name):
+        """Let the tab's list lay out its first rows, then paint it, which formats the visible rows."""
+        from PyQt5.QtCore import QPoint
+        view = window.get_list_widget(tab_name)
+        if view.model() is not None and view.model().rowCount():
+            # Long lists are laid out from the event loop (QListView.Batched)
+            self.wait(lambda: view.indexAt(QPoint(1, 1)).isValid(), timeout=60)
+        view.viewport().repaint()
+
+    def login(self, window):
+        start = time.perf_counter()
+        window.login()
+        self.wait(lambda: not window.pending_category_tabs and 'info' not in window.active_requests)
+        self.paint(window, 'LIVE')
+        return time.perf_counter() - start
+
+    def login_m3u(self, window):
+        start = time.perf_counter()
+        window.login_m3u_plus(f"{self.server_url}/get.php?username={USERNAME}&password={PASSWORD}&type=m3u_plus")
+        self.wait(lambda: 'playlist' not in window.active_requests)
+        if window.login_type != 'm3u':
+            raise RuntimeError(f"playlist login failed: {window.progress_bar.format()}")
+        self.paint(window, 'LIVE')
+        return time.perf_counter() - start
+
+    def load_epg(self, window):
+        start = time.perf_counter()
+        window.load_epg_data_async()
+        self.wait(lambda: bool(window.epg_data))
+        return time.perf_counter() - start
+
+    def show_channels(self, window, tab_name, records):
+        """Time show_channels for `records` up to the first painted screenful."""
+        window.entries_per_tab[tab_name] = records
+        window.navigation_stacks[tab_name] = [
+            {'level': 'channels', 'data': {'tab_name': tab_name, 'entries': records}, 'scroll_position': 0}
+        ]
+        window.tab_widget.setCurrentIndex(list(window.list_widgets).index(tab_name))
+        start = time.perf_counter()
+        window.show_channels(window.get_list_widget(tab_name), tab_name)
+        self.paint(window, tab_name)
+        return time.perf_counter() - start
+
+    def type_search(self, window, tab_name, query):
+        """Latency of each keystroke of `query` on the tab's current level, in ms."""
+        proxy = window.list_models[tab_name]
+        proxy.build_search_index()
+        latencies = []
+        for length in range(1, len(query) + 1):
+            start = time.perf_counter()
+            proxy.search(query[:length])
+            self.paint(window, tab_name)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+def keystroke_summary(latencies, query):
+    return {
+        'query': query,
+        'keystroke_ms': [round(latency, 2) for latency in latencies],
+        'p50_ms': round(statistics.median(latencies), 2),
+        'max_ms': round(max(latencies), 2),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args, work_dir):
+    import iptv_core.cache
+    from iptv_core import Catalog, XtreamClient, parse_m3u
+    from fake_xtream import Dataset, FakeXtreamServer
+
+    iptv_core.cache.CACHE_DIR = Path(work_dir) / 'cache'
+    sizes = {
+        'live': int(args.live * args.scale),
+        'vod': int(args.vod * args.scale),
+        'series': int(args.series * args.scale),
+        'programmes': int(args.programmes * args.scale),
+    }
+    results = {}
+
+    start = time.perf_counter()
+    dataset = Dataset(sizes['live'], sizes['vod'], sizes['series'], sizes['programmes'],
+                      xmltv_path=os.path.join(work_dir, 'guide.xml'))
+    setup_s = time.perf_counter() - start
+
+    results.update(measure_epg_parse(dataset.xmltv_path))
+
+    with FakeXtreamServer(dataset, args.latency) as server:
+        player = load_player()
+        session = Session(player, server.url)
+
+        window = session.window()
+        results['login_cold_s'] = round(session.login(window), 3)
+        results['epg_load_s'] = round(session.load_epg(window), 3)
+
+        client = XtreamClient(server.url, USERNAME, PASSWORD)
+        live = client.catalog('LIVE').entries
+        vod = client.catalog('Movies').entries
+        results['show_channels_live_s'] = round(session.show_channels(window, 'LIVE', live), 3)
+        # Guide matches are remembered, so a second render only formats
+        results['show_channels_live_warm_s'] = round(session.show_channels(window, 'LIVE', live), 3)
+        results['show_channels_vod_s'] = round(session.show_channels(window, 'Movies', vod), 3)
+
+        query = vod[len(vod) // 2].name.lower()[:16] if vod else 'movie'
+        results['search_vod'] = keystroke_summary(session.type_search(window, 'Movies', query), query)
+
+        catalog = Catalog(vod)
+        latencies = []
+        for length in range(1, len(query) + 1):
+            start = time.perf_counter()
+            catalog.search(query[:length])
+            latencies.append((time.perf_counter() - start) * 1000)
+        results['search_catalog_vod'] = keystroke_summary(latencies, query)
+
+        warm_window = session.window()
+        results['login_warm_s'] = round(session.login(warm_window), 3)
+
+        playlist_text = dataset.m3u_plus.decode('utf-8')
+        start = time.perf_counter()
+        playlist = parse_m3u(playlist_text)
+        results['m3u_parse_s'] = round(time.perf_counter() - start, 3)
+        results['m3u_lines'] = playlist_text.count('\n')
+        results['m3u_entries'] = len(playlist)
+        del playlist, playlist_text
+
+        m3u_window = session.window()
+        m3u_window.epg_checkbox.setChecked(False)
+        results['login_m3u_s'] = round(session.login_m3u(m3u_window), 3)
+        results['peak_rss_mb'] = peak_rss_mb()
+        window.close()
+        warm_window.close()
+        m3u_window.close()
+
+    dataset.close()
+    from PyQt5.QtCore import QT_VERSION_STR
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'platform': platform.platform(),
+            'latency_s': args.latency,
+            'dataset_setup_s': round(setup_s, 3),
+        },
+        'dataset': dict(sizes, programmes=dataset.programmes),
+        'results': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the player benchmarks and print JSON results.")
+    parser.add_argument('--live', type=int, default=10000)
+    parser.add_argument('--vod', type=int, default=200000)
+    parser.add_argument('--series', type=int, default=20000)
+    parser.add_argument('--programmes', type=int, default=1000000)
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every dataset size")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the server waits per request")
+    parser.add_argument('--output', help="also write the JSON to this file")
+    parser.add_argument('--epg-parse-child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.epg_parse_child:
+        epg_parse_child(args.epg_parse_child)
+        return
+
+    work_dir = tempfile.mkdtemp(prefix='iptv-bench-')
+    previous_dir = os.getcwd()
+    # The player reads and writes config.ini and credentials.ini in the working directory
+    os.chdir(work_dir)
+    try:
+        report = run(args, work_dir)
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+if __name__ == '__main__':
+    main()
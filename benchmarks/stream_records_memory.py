@@ -0,0 +1,85 @@
+"""
+Memory held by a large VOD list: the provider's JSON dicts with a formatted play URL
+added to each (the old representation) against the compact StreamRecord objects.
+
+    python benchmarks/stream_records_memory.py [entry count]
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from iptv_core import make_records
+
+SERVER = "http://provider.example:8080"
+
+
+def vod_body(count):
+    """A get_vod_streams response shaped like a real provider's, 20 fields per entry."""
+    entries = [
+        {
+            "num": i,
+            "name": f"Movie title number {i} (2019)",
+            "title": f"Movie title number {i}",
+            "year": "2019",
+            "stream_type": "movie",
+            "stream_id": 100000 + i,
+            "stream_icon": f"http://images.example/posters/{i}.jpg",
+            "rating": "6.4",
+            "rating_5based": 3.2,
+            "added": "1700000000",
+            "is_adult": 0,
+            "category_id": str(i % 250),
+            "category_ids": [i % 250],
+            "container_extension": ("mkv", "mp4", "avi")[i % 3],
+            "custom_sid": None,
+            "direct_source": "",
+            "plot": "",
+            "genre": "Drama",
+            "tmdb": str(50000 + i),
+            "trailer": "",
+        }
+        for i in range(count)
+    ]
+    return json.dumps(entries).encode()
+
+
+def old_representation(body):
+    entries = json.loads(body)
+    for entry in entries:
+        entry["url"] = f"{SERVER}/movie/user/pass/{entry['stream_id']}.{entry.get('container_extension', 'm3u8')}"
+        entry["epg_channel_id"] = None
+    return entries
+
+
+def new_representation(body):
+    return make_records(json.loads(body), 'movie')
+
+
+def retained(build, body):
+    gc.collect()
+    tracemalloc.start()
+    result = build(body)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    body = vod_body(count)
+    print(f"{count} VOD entries, {len(body) / 1e6:.1f} MB of JSON")
+    results = {}
+    for label, build in (("dicts + url", old_representation), ("StreamRecord", new_representation)):
+        current, peak = retained(build, body)
+        results[label] = current
+        print(f"{label:>14}: {current / 1e6:7.1f} MB retained, {peak / 1e6:7.1f} MB peak")
+    print(f"reduction: {results['dicts + url'] / results['StreamRecord']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Deterministic synthetic provider data: player_api.php style category and stream lists,
+the same streams as a get.php m3u_plus playlist, and an XMLTV guide for the live channels. The same sizes always give the same data,
+so runs of the benchmark suite can be compared with each other.
+"""
+import random
+import time
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "news", "sport", "movie", "world", "family", "kids", "music", "drama", "comedy", "action",
+    "nature", "history", "science", "travel", "food", "classic", "premium", "cinema", "arena", "one",
+)
+COUNTRIES = ("UK", "US", "FR", "DE", "ES", "IT", "NL", "PT")
+PROGRAMME_MINUTES = (15, 30, 30, 60, 60, 90, 120)
+
+def category_list(prefix, count):
+    return [
+        {"category_id": str(i), "category_name": f"{prefix} {WORDS[i % len(WORDS)].title()} {i}", "parent_id": 0}
+        for i in range(count)
+    ]
+
+def live_streams(count, categories):
+    rng = random.Random(1)
+    streams = []
+    for i in range(count):
+        country = COUNTRIES[i % len(COUNTRIES)]
+        name = f"{country}: {rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}"
+        streams.append({
+            "num": i + 1, "name": name + rng.choice(("", " HD", " FHD")), "stream_type": "live",
+            "stream_id": 10000 + i, "stream_icon": f"http://images.example/live/{i}.png",
+            # Every third channel has no guide id and has to be matched by name
+            "epg_channel_id": f"ch{i}.{country.lower()}" if i % 3 else "",
+            "added": "1700000000", "category_id": str(i % categories), "custom_sid": "",
+            "tv_archive": 0, "direct_source": "", "tv_archive_duration": 0,
+        })
+    return streams
+
+def vod_streams(count, categories):
+    rng = random.Random(2)
+    return [
+        {
+            "num": i + 1, "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i} ({1970 + i % 55})",
+            "stream_type": "movie", "stream_id": 500000 + i,
+            "stream_icon": f"http://images.example/posters/{i}.jpg", "rating": "6.4", "rating_5based": 3.2,
+            "added": "1700000000", "is_adult": 0, "category_id": str(i % categories),
+            "container_extension": ("mkv", "mp4", "avi")[i % 3], "custom_sid": None, "direct_source": "",
+        }
+        for i in range(count)
+    ]
+
+def series_list(count, categories):
+    rng = random.Random(3)
+    return [
+        {
+            "num": i + 1, "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Show {i}",
+            "series_id": 900000 + i, "cover": f"http://images.example/series/{i}.jpg", "plot": "",
+            "cast": "", "director": "", "genre": "Drama", "releaseDate": "2019-01-01", "rating": "7",
+            "category_id": str(i % categories),
+        }
+        for i in range(count)
+    ]
+
+def series_info(series_id, seasons=3, episodes=10):
+    return {
+        "info": {"name": f"Show {series_id}"},
+        "episodes": {
+            str(season): [
+                {
+                    "id": f"{series_id}{season:02d}{episode:02d}", "episode_num": episode,
+                    "title": f"Show {series_id} - S{season:02d}E{episode:02d} - Episode {episode}",
+                    "container_extension": "mkv", "season": season,
+                }
+                for episode in range(1, episodes + 1)
+            ]
+            for season in range(1, seasons + 1)
+        },
+    }
+
+def m3u_plus(server, username, password, live, live_categories, vod, vod_categories):
+    """get.php?type=m3u_plus playlist of the live and VOD streams, grouped like the API lists."""
+    lines = ['#EXTM3U']
+    for kind, streams, categories in (('live', live, live_categories), ('movie', vod, vod_categories)):
+        names = {category["category_id"]: category["category_name"] for category in categories}
+        for stream in streams:
+            lines.append(
+                f'#EXTINF:-1 tvg-id="{stream.get("epg_channel_id", "")}" tvg-name="{stream["name"]}" '
+                f'tvg-logo="{stream["stream_icon"]}" group-title="{names[stream["category_id"]]}",{stream["name"]}'
+            )
+            extension = stream.get("container_extension", "ts")
+            lines.append(f'{server}/{kind}/{username}/{password}/{stream["stream_id"]}.{extension}')
+    return '\r\n'.join(lines) + '\r\n'
+
+def xmltv_channel_ids(streams):
+    """Guide ids for the live streams, including the ones the streams do not carry."""
+    return [f"ch{i}.{COUNTRIES[i % len(COUNTRIES)].lower()}" for i in range(len(streams))]
+
+def write_xmltv(path, streams, programmes, start=None):
+    """
+    Write an XMLTV guide with about `programmes` programmes spread over the channels of
+    `streams`, starting a day before `start` (default now). Returns the programme count.
+    """
+    rng = random.Random(4)
+    channel_ids = xmltv_channel_ids(streams)
+    per_channel = max(1, programmes // max(1, len(channel_ids)))
+    start = int((start or time.time()) // 3600 * 3600) - 86400
+    stamps = {}
+
+    def stamp(moment):
+        # Programmes start on quarter hours, so the same stamps come back again and again
+        value = stamps.get(moment)
+        if value is None:
+            value = stamps[moment] = time.strftime("%Y%m%d%H%M%S +0000", time.gmtime(moment))
+        return value
+
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<tv generator-info-name="iptv-benchmarks">\n')
+        for channel_id, stream in zip(channel_ids, streams):
+            display_name = stream["name"].split(": ", 1)[-1]
+            f.write(
+                f'<channel id="{channel_id}"><display-name>{escape(display_name)}</display-name>'
+                f'<display-name>{escape(stream["name"])}</display-name></channel>\n'
+            )
+        for channel_id in channel_ids:
+            moment = start
+            for p in range(per_channel):
+                stop = moment + 60 * rng.choice(PROGRAMME_MINUTES)
+                f.write(
+                    f'<programme start="{stamp(moment)}" stop="{stamp(stop)}" channel="{channel_id}">'
+                    f'<title>{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {p}</title>'
+                    f'<desc>Episode {p} of a {rng.choice(WORDS)} programme about {rng.choice(WORDS)} '
+                    f'and {rng.choice(WORDS)}.</desc></programme>\n'
+                )
+                moment = stop
+                written += 1
+        f.write('</tv>\n')
+    return written
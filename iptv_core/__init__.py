@@ -0,0 +1,49 @@
+"""
+Qt-free core of the player: the Xtream Codes client, the M3U playlist reader, XMLTV
+guide parsing and store, the per-tab catalog and search, stream health probes, saved
+account status checks, and the per-account caches.
+The window in "IPTV M3U_Plus PLAYER by MY-1.py" drives these from its thread pool;
+`python -m iptv_core` drives them from the command line.
+"""
+from .accounts import AccountStatus, AccountStatusCache, account_key, check_account, check_accounts
+from .cache import (
+    CACHE_DIR, DEFAULT_API_CACHE_TTLS, API_ACTION_KINDS, ApiCache, ApiFetch, UsageStats, account_cache_dir
+)
+from .catalog import StreamRecord, SeriesRecord, make_records, Catalog
+from .epg import (
+    DEFAULT_EPG_CACHE_TTL, EPGProgramme, EPGMatcher, EPGChannelMap, EPGStore, normalize_channel_name,
+    channel_tokens, parse_xmltv_time, parse_xmltv, load_epg, load_epg_file, resolve_epg_channel_ids
+)
+from .files import local_path, file_signature, map_file
+from .health import (
+    DEFAULT_HEALTH_TTL, DEFAULT_SLOW_AFTER, StreamHealth, HealthCache, probe_concurrency, probe_stream, probe_streams
+)
+from .http_client import (
+    CUSTOM_USER_AGENT, DEFAULT_HEADERS, DEFAULT_POOL_SIZE, DEFAULT_RETRIES, DEFAULT_BACKOFF_FACTOR,
+    HttpClient, configure_http_clients, get_http_client, iter_json_array
+)
+from .m3u import PLAYLIST_TABS, PlaylistRecord, M3UPlaylist, M3UParser, parse_m3u, load_m3u, load_m3u_file
+from .search import fold_text, SearchIndex
+from .tracing import Tracer, tracer, span, configure_tracing
+from .xtream import (
+    CATEGORY_ACTIONS, STREAM_ACTIONS, XtreamClient, parse_m3u_plus_url, fetch_json, stream_json_array
+)
+
+__all__ = [
+    'AccountStatus', 'AccountStatusCache', 'account_key', 'check_account', 'check_accounts',
+    'CACHE_DIR', 'DEFAULT_API_CACHE_TTLS', 'API_ACTION_KINDS', 'ApiCache', 'ApiFetch', 'UsageStats',
+    'account_cache_dir',
+    'StreamRecord', 'SeriesRecord', 'make_records', 'Catalog',
+    'DEFAULT_EPG_CACHE_TTL', 'EPGProgramme', 'EPGMatcher', 'EPGChannelMap', 'EPGStore',
+    'normalize_channel_name', 'channel_tokens', 'parse_xmltv_time', 'parse_xmltv', 'load_epg', 'load_epg_file',
+    'resolve_epg_channel_ids',
+    'local_path', 'file_signature', 'map_file',
+    'DEFAULT_HEALTH_TTL', 'DEFAULT_SLOW_AFTER', 'StreamHealth', 'HealthCache', 'probe_concurrency', 'probe_stream',
+    'probe_streams',
+    'CUSTOM_USER_AGENT', 'DEFAULT_HEADERS', 'DEFAULT_POOL_SIZE', 'DEFAULT_RETRIES', 'DEFAULT_BACKOFF_FACTOR',
+    'HttpClient', 'configure_http_clients', 'get_http_client', 'iter_json_array',
+    'PLAYLIST_TABS', 'PlaylistRecord', 'M3UPlaylist', 'M3UParser', 'parse_m3u', 'load_m3u', 'load_m3u_file',
+    'fold_text', 'SearchIndex',
+    'Tracer', 'tracer', 'span', 'configure_tracing',
+    'CATEGORY_ACTIONS', 'STREAM_ACTIONS', 'XtreamClient', 'parse_m3u_plus_url', 'fetch_json', 'stream_json_array',
+]
@@ -0,0 +1,119 @@
+"""
+Status of saved accounts: each account's user_info is fetched from player_api.php,
+all accounts at once, with the round trip timed. The last result of every account
+is kept in account_status.json in the cache directory so it can be shown at once.
+"""
+import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+
+from . import cache
+from .cache import write_atomic
+from .xtream import XtreamClient
+
+ACCOUNT_STATUS_FILE_NAME = 'account_status.json'
+
+# Accounts checked at once; each usually lives on its own server
+MAX_ACCOUNT_CHECKS = 8
+
+# status is user_info's (Active, Expired, Banned, Disabled...) or why there is none
+# (Invalid login, Unreachable, HTTP 5xx, Invalid response) with the reason in error;
+# expires is an epoch time or None for no expiry, latency the round trip in seconds
+AccountStatus = namedtuple(
+    'AccountStatus', ['status', 'expires', 'active_connections', 'max_connections', 'latency', 'checked', 'error']
+)
+
+def account_key(server, username):
+    return f"{server.rstrip('/').lower()}|{username}"
+
+def optional_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def check_account(server, username, password):
+    """AccountStatus of one account, from the same user_info request the player makes at login."""
+    if not server.startswith("http://") and not server.startswith("https://"):
+        server = f"http://{server}"
+    start = time.perf_counter()
+    try:
+        info = XtreamClient(server, username, password).account_info()
+    except requests.HTTPError as e:
+        code = e.response.status_code
+        status = "Invalid login" if code in (401, 403) else f"HTTP {code}"
+        return AccountStatus(status, None, None, None, round(time.perf_counter() - start, 3), time.time(), str(e))
+    except requests.RequestException as e:
+        return AccountStatus("Unreachable", None, None, None, None, time.time(), str(e))
+    except ValueError as e:
+        return AccountStatus("Invalid response", None, None, None, round(time.perf_counter() - start, 3), time.time(), str(e))
+    latency = round(time.perf_counter() - start, 3)
+
+    user_info = info.get('user_info') if isinstance(info, dict) else None
+    if not isinstance(user_info, dict) or str(user_info.get('auth', 1)) == '0':
+        return AccountStatus("Invalid login", None, None, None, latency, time.time(), "The server did not accept the credentials")
+    return AccountStatus(
+        str(user_info.get('status') or "Unknown"),
+        optional_int(user_info.get('exp_date')),
+        optional_int(user_info.get('active_cons')),
+        optional_int(user_info.get('max_connections')),
+        latency,
+        time.time(),
+        None,
+    )
+
+class AccountStatusCache:
+    """
+    Last AccountStatus of each account, by server and username (never the password),
+    kept in a JSON file. Safe to fill from a worker while the GUI reads it.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else cache.CACHE_DIR / ACCOUNT_STATUS_FILE_NAME
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.statuses = {key: AccountStatus(*value) for key, value in json.load(f)['accounts'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            self.statuses = {}
+
+    def get(self, server, username):
+        return self.statuses.get(account_key(server, username))
+
+    def put(self, server, username, status):
+        with self._lock:
+            self.statuses[account_key(server, username)] = status
+
+    def save(self):
+        with self._lock:
+            accounts = {key: list(status) for key, status in self.statuses.items()}
+        try:
+            write_atomic(self.path, json.dumps({'accounts': accounts}).encode('utf-8'))
+        except OSError as e:
+            print(f"Error saving account status: {e}")
+
+def check_accounts(accounts, status_cache, concurrency=MAX_ACCOUNT_CHECKS):
+    """
+    Generator: checks every account of `accounts` ({name: (server, username,
+    password)}) concurrently, yielding a list with one (name, AccountStatus) as each
+    check finishes. Results go into `status_cache`, which is saved at the end.
+    """
+    if not accounts:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(accounts)), thread_name_prefix='account')
+    try:
+        futures = {executor.submit(check_account, *credentials): name for name, credentials in accounts.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            status = future.result()
+            server, username, _ = accounts[name]
+            status_cache.put(server, username, status)
+            yield [(name, status)]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        status_cache.save()
@@ -0,0 +1,151 @@
+"""Per-account on-disk state: cached player_api.php responses and category usage."""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Per-account caches (EPG, ...) live under here. Created by the first write, not on
+# import, so importing the package never touches the home directory
+CACHE_DIR = Path.home() / '.iptv'
+
+# Seconds a cached player_api.php response is used before it is revalidated in the
+# background, per kind of action. Overridable from the [Cache] section of config.ini
+DEFAULT_API_CACHE_TTLS = {
+    'categories': 86400,
+    'streams': 3600,
+    'series_info': 3600,
+}
+
+API_ACTION_KINDS = {
+    'get_live_categories': 'categories',
+    'get_vod_categories': 'categories',
+    'get_series_categories': 'categories',
+    'get_live_streams': 'streams',
+    'get_vod_streams': 'streams',
+    'get_series': 'streams',
+    'get_series_info': 'series_info',
+}
+
+def write_atomic(path, data):
+    """
+    Replace the file at `path` with the bytes `data` in one step. Each call writes a
+    temp file of its own next to `path` and renames it over `path`, so concurrent
+    writers of the same file never share a temp file and readers never see half of one.
+    """
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class ApiCache:
+    """
+    Raw player_api.php response bodies of one account, one file per action and
+    parameters (credentials excluded). The file's mtime is when it was last fetched or
+    revalidated; an entry older than its action's TTL is stale but still served.
+    """
+
+    def __init__(self, directory, ttls=None):
+        self.directory = Path(directory)
+        self.ttls = dict(DEFAULT_API_CACHE_TTLS, **(ttls or {}))
+
+    def path(self, params):
+        key = {name: value for name, value in params.items() if name not in ('username', 'password')}
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+        return self.directory / f"{params.get('action', 'info')}-{digest}.json"
+
+    def ttl(self, params):
+        return self.ttls.get(API_ACTION_KINDS.get(params.get('action')), 0)
+
+    def read(self, params):
+        """Return (body, fresh) for a cached response, or None."""
+        path = self.path(params)
+        try:
+            age = time.time() - path.stat().st_mtime
+            body = path.read_bytes()
+        except OSError:
+            return None
+        return body, age < self.ttl(params)
+
+    def write(self, params, body):
+        """
+        Store a freshly fetched body. Returns True if it differs from the cached one. A
+        failed write is only logged: the caller still has the body it downloaded.
+        """
+        path = self.path(params)
+        try:
+            if path.read_bytes() == body:
+                os.utime(path)
+                return False
+        except OSError:
+            pass
+        try:
+            write_atomic(path, body)
+        except OSError as e:
+            print(f"Error caching response: {e}")
+        return True
+
+class ApiFetch:
+    """
+    Cache policy for one background request. On the first pass any cached response is
+    served as is and `stale` records whether one was past its TTL; a `revalidate` pass
+    only serves fresh entries, refetches the rest and records whether any `changed`.
+    """
+
+    def __init__(self, cache, revalidate=False):
+        self.cache = cache
+        self.revalidate = revalidate
+        self.stale = False
+        self.changed = False
+
+class UsageStats:
+    """How often and when each category of one account was opened, kept in a JSON file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.categories = json.load(f)['categories']
+        except (OSError, ValueError, KeyError, TypeError):
+            self.categories = {}
+
+    def record_category(self, tab_name, category_id):
+        entry = self.categories.setdefault(f"{tab_name}:{category_id}", {'count': 0, 'last': 0})
+        entry['count'] += 1
+        entry['last'] = time.time()
+        self.save()
+
+    def top_categories(self, count):
+        """
+        The `count` categories most likely to be opened next as (tab_name, category_id):
+        the one opened last, then the most opened ones.
+        """
+        ranked = sorted(self.categories, key=lambda key: self.categories[key]['count'], reverse=True)
+        if ranked:
+            latest = max(self.categories, key=lambda key: self.categories[key]['last'])
+            ranked.remove(latest)
+            ranked.insert(0, latest)
+        return [tuple(key.split(':', 1)) for key in ranked[:count]]
+
+    def save(self):
+        try:
+            write_atomic(self.path, json.dumps({'categories': self.categories}).encode('utf-8'))
+        except OSError as e:
+            print(f"Error saving usage stats: {e}")
+
+def account_cache_dir(server, username):
+    """Cache directory for one account, keyed by server and username."""
+    key = hashlib.sha1(f"{server.rstrip('/').lower()}|{username}".encode('utf-8')).hexdigest()[:16]
+    path = CACHE_DIR / 'accounts' / key
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,89 @@
+"""Compact stream and series records and the per-tab full catalog."""
+import sys
+
+from .search import SearchIndex
+
+class StreamRecord:
+    """
+    One live channel or movie, keeping only the fields the player uses rather than
+    the provider's whole JSON object. Strings shared by many entries are interned and
+    the play URL is built on demand by play_url().
+    """
+
+    __slots__ = ('name', 'stream_id', 'stream_type', 'category_id', 'epg_channel_id', 'container_extension')
+
+    def __init__(self, name, stream_id, stream_type, category_id, epg_channel_id, container_extension):
+        self.name = name
+        self.stream_id = stream_id
+        self.stream_type = stream_type
+        self.category_id = category_id
+        self.epg_channel_id = epg_channel_id
+        self.container_extension = container_extension
+
+    @classmethod
+    def from_json(cls, entry, stream_type):
+        epg_channel_id = entry.get("epg_channel_id")
+        return cls(
+            str(entry.get("name") or "Unnamed Channel"),
+            entry.get("stream_id"),
+            stream_type,
+            sys.intern(str(entry.get("category_id"))),
+            epg_channel_id.strip().lower() if epg_channel_id else None,
+            sys.intern(entry.get("container_extension") or "m3u8"),
+        )
+
+    def play_url(self, server, username, password):
+        if not self.stream_id:
+            return None
+        return f"{server}/{self.stream_type}/{username}/{password}/{self.stream_id}.{self.container_extension}"
+
+class SeriesRecord:
+    """One series of a get_series list; its seasons come from get_series_info."""
+
+    __slots__ = ('name', 'series_id', 'category_id')
+
+    def __init__(self, name, series_id, category_id):
+        self.name = name
+        self.series_id = series_id
+        self.category_id = category_id
+
+    @classmethod
+    def from_json(cls, entry):
+        return cls(
+            str(entry.get("name") or "Unnamed Series"),
+            entry.get("series_id"),
+            sys.intern(str(entry.get("category_id"))),
+        )
+
+def make_records(entries, stream_type):
+    """StreamRecords for a live/movie list, or SeriesRecords when `stream_type` is None."""
+    if stream_type is None:
+        return [SeriesRecord.from_json(entry) for entry in entries]
+    return [StreamRecord.from_json(entry, stream_type) for entry in entries]
+
+class Catalog:
+    """
+    Every entry of one tab fetched in a single request (no category_id), grouped
+    locally by category_id so opening a category needs no round trip, with a
+    SearchIndex over the whole catalog for cross-category search.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.by_category = {}
+        for entry in entries:
+            self.by_category.setdefault(entry.category_id, []).append(entry)
+        self.search_index = SearchIndex([entry.name for entry in entries])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def category_entries(self, category_id):
+        return self.by_category.get(str(category_id), [])
+
+    def search(self, query):
+        positions = self.search_index.search(query)
+        if positions is None:
+            return []
+        entries = self.entries
+        return [entries[position] for position in positions]
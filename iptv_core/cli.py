@@ -0,0 +1,190 @@
+"""
+Command line access to an Xtream account, without a display:
+
+    python -m iptv_core --server http://host:8080 --username USER --password PASS categories LIVE
+    python -m iptv_core ... streams Movies --category 12
+    python -m iptv_core ... search LIVE "bbc one"
+    python -m iptv_core ... url LIVE 1234
+    python -m iptv_core ... episodes 567
+    python -m iptv_core ... now-next --category 3
+
+The account can also come from IPTV_SERVER, IPTV_USERNAME and IPTV_PASSWORD. Answers
+go through the same per-account caches as the window: a response or guide still within
+its TTL is served from disk, anything older is fetched again.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .cache import ApiCache, ApiFetch, account_cache_dir
+from .catalog import SeriesRecord
+from .epg import DEFAULT_EPG_CACHE_TTL, EPGChannelMap, load_epg, resolve_epg_channel_ids
+from .search import SearchIndex
+from .xtream import STREAM_ACTIONS, XtreamClient
+
+def tab_name(value):
+    """Accept tab names in any case ("live", "movies", ...)."""
+    for name in STREAM_ACTIONS:
+        if name.lower() == value.lower():
+            return name
+    raise argparse.ArgumentTypeError(f"unknown tab {value!r}, expected one of {', '.join(STREAM_ACTIONS)}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m iptv_core', description="Query an Xtream Codes account.")
+    parser.add_argument('--server', default=os.environ.get('IPTV_SERVER'), help="e.g. http://host:8080")
+    parser.add_argument('--username', default=os.environ.get('IPTV_USERNAME'))
+    parser.add_argument('--password', default=os.environ.get('IPTV_PASSWORD'))
+    parser.add_argument('--post', action='store_true', help="send requests as POST instead of GET")
+    parser.add_argument('--no-cache', action='store_true', help="always ask the server, leave the cache alone")
+    parser.add_argument('--json', action='store_true', help="print JSON instead of tab-separated lines")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('info', help="account and server info")
+
+    command = commands.add_parser('categories', help="list a tab's categories")
+    command.add_argument('tab', type=tab_name)
+
+    command = commands.add_parser('streams', help="list a tab's entries")
+    command.add_argument('tab', type=tab_name)
+    command.add_argument('--category', help="only this category id")
+
+    command = commands.add_parser('search', help="entries of a tab whose name contains a text")
+    command.add_argument('tab', type=tab_name)
+    command.add_argument('query')
+
+    command = commands.add_parser('url', help="play URL of a live channel or movie")
+    command.add_argument('tab', type=tab_name)
+    command.add_argument('stream_id')
+
+    command = commands.add_parser('episodes', help="episodes of a series with their play URLs")
+    command.add_argument('series_id')
+
+    command = commands.add_parser('now-next', help="programme airing now and next on live channels")
+    command.add_argument('--category', help="only this category id")
+    command.add_argument('--channel', help="only channels whose name contains this text")
+    return parser
+
+def list_records(client, tab, category_id, api):
+    """A tab's records: one category's, or the whole catalog's when `category_id` is None."""
+    if category_id is None:
+        return client.catalog(tab, api=api).entries
+    return list(itertools.chain.from_iterable(client.streams(tab, category_id, api=api)))
+
+def search_records(records, query):
+    positions = SearchIndex([record.name for record in records]).search(query)
+    return [records[position] for position in positions or ()]
+
+def stream_rows(records):
+    return [
+        {
+            'id': record.series_id if isinstance(record, SeriesRecord) else record.stream_id,
+            'name': record.name,
+            'category_id': record.category_id,
+        }
+        for record in records
+    ]
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+def now_next(client, args, api):
+    if args.no_cache:
+        # The guide and its channel matches go to a scratch directory, leaving the
+        # account's cache as it was
+        with tempfile.TemporaryDirectory(prefix='iptv-epg-') as cache_dir:
+            return guide_now_next(client, args, api, Path(cache_dir))
+    return guide_now_next(client, args, api, account_cache_dir(client.server, client.username) / 'epg')
+
+def guide_now_next(client, args, api, cache_dir):
+    records = list_records(client, 'LIVE', args.category, api)
+    if args.channel:
+        records = search_records(records, args.channel)
+
+    store, channel_id_to_names = load_epg(client.epg_url(), cache_dir, client.http_method, DEFAULT_EPG_CACHE_TTL)
+    channel_map = EPGChannelMap(cache_dir / 'matches.json', store.generation, channel_id_to_names)
+    channel_ids = resolve_epg_channel_ids(store, channel_map, records)
+    channel_map.save()
+
+    now = time.time()
+    rows = []
+    for record, channel_id in zip(records, channel_ids):
+        programmes = store.programmes_between(channel_id, now, now + 2 * 86400)[:2] if channel_id else []
+        if programmes and programmes[0].start > now:
+            # Nothing airing right now, only what comes next
+            programmes.insert(0, None)
+        current, following = (programmes + [None, None])[:2]
+        rows.append({
+            'name': record.name,
+            'epg_channel_id': channel_id,
+            'now': current and {'title': current.title, 'start': current.start, 'stop': current.stop},
+            'next': following and {'title': following.title, 'start': following.start, 'stop': following.stop},
+        })
+    return rows
+
+def run(args):
+    client = XtreamClient(args.server, args.username, args.password, 'POST' if args.post else 'GET')
+    api = None if args.no_cache else ApiFetch(ApiCache(account_cache_dir(args.server, args.username) / 'api'), revalidate=True)
+
+    if args.command == 'info':
+        return client.account_info()
+    if args.command == 'categories':
+        return [{'id': group.get('category_id'), 'name': group.get('category_name')}
+                for group in client.categories(args.tab, api=api)]
+    if args.command in ('streams', 'search', 'url'):
+        records = list_records(client, args.tab, getattr(args, 'category', None), api)
+        if args.command == 'streams':
+            return stream_rows(records)
+        if args.command == 'search':
+            return stream_rows(search_records(records, args.query))
+        if args.tab == 'Series':
+            raise ValueError("series have no single URL, use: episodes SERIES_ID")
+        for record in records:
+            if str(record.stream_id) == args.stream_id:
+                return client.stream_url(record)
+        raise ValueError(f"no {args.tab} stream with id {args.stream_id}")
+    if args.command == 'episodes':
+        series_info = client.series_info(args.series_id, api=api)
+        return [
+            {'season': str(season), 'episode': str(episode.get('episode_num', '')),
+             'title': str(episode.get('title', '')), 'url': client.episode_url(episode)}
+            for season, episodes in (series_info.get('episodes') or {}).items()
+            for episode in episodes
+        ]
+    if args.command == 'now-next':
+        return now_next(client, args, api)
+    raise ValueError(f"unknown command {args.command}")
+
+def print_result(result, as_json):
+    if as_json or isinstance(result, dict):
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif isinstance(result, str):
+        print(result)
+    else:
+        for row in result:
+            fields = []
+            for value in row.values():
+                if isinstance(value, dict):
+                    value = f"{value['title']} ({format_time(value['start'])} - {format_time(value['stop'])})"
+                fields.append('' if value is None else str(value))
+            print('\t'.join(fields))
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not (args.server and args.username and args.password):
+        parser.error("--server, --username and --password (or IPTV_SERVER, IPTV_USERNAME, IPTV_PASSWORD) are required")
+    if not args.server.startswith(("http://", "https://")):
+        args.server = f"http://{args.server}"
+    try:
+        result = run(args)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print_result(result, args.json)
+    return 0
@@ -0,0 +1,637 @@
+"""XMLTV download and parsing, the indexed programme store and stream-to-guide matching."""
+import calendar
+import gzip
+import io
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from pathlib import Path
+
+from dateutil import parser
+from lxml import etree
+
+from .cache import write_atomic
+from .files import file_signature, local_path, map_file
+from .http_client import get_http_client
+from .tracing import span
+from .search import fold_text
+
+DEFAULT_EPG_CACHE_TTL = 3600
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_NOISE_WORDS_RE = re.compile(r'\b(hd|sd|channel|tv)\b')
+
+def normalize_channel_name(name):
+    name = name.lower().strip()
+    name = _WHITESPACE_RE.sub(' ', name)
+    name = _PUNCTUATION_RE.sub('', name)
+    name = _NOISE_WORDS_RE.sub('', name)
+    name = name.strip()
+    return name
+
+# Channel name tokenizing for EPG matching: "UK: BBC One FHD" and "BBC 1 HD" both become
+# ['bbc', '1']. Country prefixes, quality tags and filler words are dropped and number
+# words become digits.
+_COUNTRY_PREFIX_RE = re.compile(r'^\s*[a-z]{2,3}\s*[:|]\s*')
+_TOKEN_SEPARATOR_RE = re.compile(r'[\W_]+')
+_LETTER_DIGIT_RE = re.compile(r'(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])')
+CHANNEL_NOISE_TOKENS = frozenset({
+    'hd', 'fhd', 'uhd', 'sd', 'hq', '4k', '8k', 'hevc', 'h264', 'h265', '1080p', '720p',
+    '50fps', '60fps', 'tv', 'channel', 'live', 'backup',
+})
+CHANNEL_NUMBER_WORDS = {
+    'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
+}
+
+def channel_tokens(name):
+    text = _COUNTRY_PREFIX_RE.sub('', fold_text(name))
+    tokens = []
+    for word in _TOKEN_SEPARATOR_RE.sub(' ', text).split():
+        if word in CHANNEL_NOISE_TOKENS:
+            continue
+        for token in _LETTER_DIGIT_RE.sub(' ', word).split():
+            if token not in CHANNEL_NOISE_TOKENS:
+                tokens.append(CHANNEL_NUMBER_WORDS.get(token, token))
+    return tokens
+
+def parse_xmltv_time(value):
+    """
+    Convert an XMLTV timestamp such as "20240101183000 +0100" to epoch seconds.
+    Falls back to dateutil for anything that isn't in the standard layout.
+    """
+    value = value.strip()
+    try:
+        epoch = calendar.timegm((
+            int(value[0:4]), int(value[4:6]), int(value[6:8]),
+            int(value[8:10]), int(value[10:12]), int(value[12:14] or 0)
+        ))
+        offset = value[14:].strip()
+        if offset:
+            sign = -1 if offset[0] == '-' else 1
+            digits = offset.lstrip('+-')
+            epoch -= sign * (int(digits[0:2]) * 3600 + int(digits[2:4]) * 60)
+        return epoch
+    except (ValueError, IndexError):
+        return int(parser.parse(value).timestamp())
+
+EPGProgramme = namedtuple('EPGProgramme', ['start', 'stop', 'title', 'description'])
+
+class EPGMatcher:
+    """
+    Finds the guide channel for a stream name among the guide's display names. A
+    name whose normalize_channel_name() equals a display name's matches first, then
+    names with the same channel_tokens(); otherwise the guide names sharing the
+    name's rarest tokens are scored by token overlap (Dice coefficient), and the best
+    one wins if it scores at least MIN_SCORE and carries the same numbers ("Sky
+    Sports 1" never matches "Sky Sports 2").
+    """
+
+    MIN_SCORE = 0.75
+    CANDIDATE_TOKENS = 2
+
+    def __init__(self, channel_id_to_names):
+        self._normalized = {}
+        self._exact = {}
+        self._index = {}
+        for channel_id, names in channel_id_to_names.items():
+            for name in names:
+                normalized = normalize_channel_name(name)
+                if normalized:
+                    self._normalized.setdefault(normalized, channel_id)
+                # Tokenized from the raw name: the country prefix is only recognised by its ':' or '|'
+                tokens = frozenset(channel_tokens(name))
+                if not tokens:
+                    continue
+                self._exact.setdefault(' '.join(sorted(tokens)), channel_id)
+                for token in tokens:
+                    self._index.setdefault(token, []).append((channel_id, tokens))
+
+    def match(self, name):
+        normalized = normalize_channel_name(name)
+        if normalized in self._normalized:
+            return self._normalized[normalized]
+
+        tokens = frozenset(channel_tokens(name))
+        if not tokens:
+            return None
+        channel_id = self._exact.get(' '.join(sorted(tokens)))
+        if channel_id is not None:
+            return channel_id
+
+        numbers = {token for token in tokens if token.isdigit()}
+        known = sorted((token for token in tokens if token in self._index), key=lambda token: len(self._index[token]))
+        best, best_score = None, self.MIN_SCORE
+        for token in known[:self.CANDIDATE_TOKENS]:
+            for channel_id, candidate in self._index[token]:
+                if {t for t in candidate if t.isdigit()} != numbers:
+                    continue
+                score = 2 * len(tokens & candidate) / (len(tokens) + len(candidate))
+                if score > best_score or (score == best_score and best is None):
+                    best, best_score = channel_id, score
+        return best
+
+class EPGChannelMap:
+    """
+    Stream name -> guide channel id for one account and one guide generation. Names
+    are matched once by an EPGMatcher (built on the first miss) and the results are
+    kept in a JSON file, so later renders and later sessions do plain dict lookups.
+    """
+
+    def __init__(self, path, generation, channel_id_to_names):
+        self.path = Path(path)
+        self.generation = generation
+        self.channel_id_to_names = channel_id_to_names
+        self.matches = {}
+        self.dirty = False
+        self._matcher = None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if generation is not None and saved.get('generation') == generation:
+                self.matches = saved['matches']
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    def lookup(self, name):
+        try:
+            return self.matches[name]
+        except KeyError:
+            pass
+        if self._matcher is None:
+            self._matcher = EPGMatcher(self.channel_id_to_names)
+        channel_id = self.matches[name] = self._matcher.match(name)
+        self.dirty = True
+        return channel_id
+
+    def save(self):
+        if not self.dirty or self.generation is None:
+            return
+        try:
+            write_atomic(self.path, json.dumps({'generation': self.generation, 'matches': self.matches}).encode('utf-8'))
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving EPG matches: {e}")
+
+class _MappedText:
+    """Read-only string column decoded on demand from a memory-mapped UTF-8 blob."""
+
+    def __init__(self, blob, offsets, field, count):
+        self._blob = blob
+        self._offsets = offsets
+        self._field = field
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        i = 2 * index + self._field
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].decode('utf-8')
+
+class EPGStore:
+    """
+    Programme guide indexed for fast lookups. Timestamps are parsed once at ingest
+    and each channel's programmes are kept as a sorted run of epoch seconds in
+    shared column arrays, so finding the current show is a bisect.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._epochs = {}
+        self._ranges = {}
+        # Set once the store is saved or loaded; names the guide version on disk
+        self.generation = None
+        self._starts = array('q')
+        self._stops = array('q')
+        self._titles = []
+        self._descriptions = []
+
+    def _epoch(self, value):
+        # Guides repeat the same slot boundaries across channels, so memoize per ingest
+        epoch = self._epochs.get(value)
+        if epoch is None:
+            epoch = self._epochs[value] = parse_xmltv_time(value)
+        return epoch
+
+    def add_programme(self, channel_id, start, stop, title, description):
+        if not channel_id:
+            # A programme of no channel could only ever show up for unmatched streams
+            return
+        try:
+            start_epoch = self._epoch(start)
+            stop_epoch = self._epoch(stop)
+        except (ValueError, OverflowError, AttributeError):
+            return
+        self._pending.setdefault(channel_id, []).append(
+            (start_epoch, stop_epoch, sys.intern(title), description)
+        )
+
+    def finalize(self):
+        """Sort the ingested programmes per channel and pack them into the column arrays."""
+        for channel_id, programmes in self._pending.items():
+            programmes.sort(key=lambda p: p[0])
+            lo = len(self._starts)
+            for start, stop, title, description in programmes:
+                self._starts.append(start)
+                self._stops.append(stop)
+                self._titles.append(title)
+                self._descriptions.append(description)
+            self._ranges[channel_id] = (lo, len(self._starts))
+        self._pending = {}
+        self._epochs = {}
+        return self
+
+    def __contains__(self, channel_id):
+        return channel_id in self._ranges
+
+    # 2: channel_names holds the display names as written rather than normalized
+    CACHE_VERSION = 2
+
+    def save(self, directory, channel_id_to_names, meta=None):
+        """
+        Persist the store to `directory`: epoch columns and text offsets as raw arrays,
+        titles and descriptions as one UTF-8 blob that load() memory-maps. Files are
+        written under a fresh generation name and meta.json is swapped in last, so a
+        reader never sees a half-written cache.
+        """
+        os.makedirs(directory, exist_ok=True)
+        generation = f"{int(time.time() * 1000):x}"
+        offsets = array('q', [0])
+        with open(os.path.join(directory, f"text-{generation}.bin"), 'wb') as f:
+            position = 0
+            for title, description in zip(self._titles, self._descriptions):
+                for value in (title, description):
+                    encoded = value.encode('utf-8')
+                    f.write(encoded)
+                    position += len(encoded)
+                    offsets.append(position)
+        with open(os.path.join(directory, f"index-{generation}.bin"), 'wb') as f:
+            self._starts.tofile(f)
+            self._stops.tofile(f)
+            offsets.tofile(f)
+
+        cache_meta = dict(meta or {})
+        cache_meta.update({
+            'version': self.CACHE_VERSION,
+            'generation': generation,
+            'created': time.time(),
+            'programmes': len(self._starts),
+            'channels': self._ranges,
+            'channel_names': channel_id_to_names,
+        })
+        write_atomic(os.path.join(directory, 'meta.json'), json.dumps(cache_meta).encode('utf-8'))
+        self.generation = generation
+
+        # Drop older generations; a file still mapped by a live store (Windows) is left for next time
+        for name in os.listdir(directory):
+            if name.endswith('.bin') and generation not in name:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def touch(directory, **updates):
+        """Mark a cached store as fresh again, e.g. after the server answered 304."""
+        meta_path = os.path.join(directory, 'meta.json')
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        meta.update(updates)
+        meta['created'] = time.time()
+        write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Load a store written by save(). Returns (store, channel_id_to_names, meta),
+        or None if there is no usable cache in `directory`.
+        """
+        meta_path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != cls.CACHE_VERSION:
+                return None
+            generation = meta['generation']
+            count = meta['programmes']
+
+            store = cls()
+            with open(os.path.join(directory, f"index-{generation}.bin"), 'rb') as f:
+                store._starts.fromfile(f, count)
+                store._stops.fromfile(f, count)
+                offsets = array('q')
+                offsets.fromfile(f, 2 * count + 1)
+            with open(os.path.join(directory, f"text-{generation}.bin"), 'rb') as f:
+                if offsets[-1]:
+                    blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    blob = b''
+            store._titles = _MappedText(blob, offsets, 0, count)
+            store._descriptions = _MappedText(blob, offsets, 1, count)
+            store._ranges = {cid: tuple(bounds) for cid, bounds in meta['channels'].items()}
+            store.generation = generation
+            return store, meta['channel_names'], meta
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            print(f"Error loading EPG cache: {e}")
+            return None
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def programme_count(self):
+        return len(self._starts)
+
+    def _programme(self, index):
+        return EPGProgramme(
+            self._starts[index], self._stops[index],
+            self._titles[index], self._descriptions[index]
+        )
+
+    def _locate(self, channel_id, now):
+        """Index of the programme airing at `now`, else the next one to start, else None."""
+        bounds = self._ranges.get(channel_id)
+        if not bounds:
+            return None
+        lo, hi = bounds
+        i = bisect_right(self._starts, now, lo, hi)
+        if i > lo and self._stops[i - 1] >= now:
+            return i - 1
+        if i < hi:
+            return i
+        return None
+
+    def current_or_next(self, channel_id, now=None):
+        if now is None:
+            now = time.time()
+        index = self._locate(channel_id, now)
+        return self._programme(index) if index is not None else None
+
+    def programmes_between(self, channel_id, start, stop):
+        """Programmes of `channel_id` that overlap [start, stop), in airing order."""
+        bounds = self._ranges.get(channel_id)
+        if not bounds:
+            return []
+        lo, hi = bounds
+        i = bisect_right(self._starts, start, lo, hi)
+        if i > lo and self._stops[i - 1] > start:
+            i -= 1
+        programmes = []
+        while i < hi and self._starts[i] < stop:
+            programmes.append(self._programme(i))
+            i += 1
+        return programmes
+
+    def time_span(self, channel_ids):
+        """(earliest start, latest stop) over the guides of `channel_ids`, or None if none has one."""
+        first = last = None
+        for channel_id in channel_ids:
+            bounds = self._ranges.get(channel_id)
+            if not bounds or bounds[0] == bounds[1]:
+                continue
+            lo, hi = bounds
+            if first is None or self._starts[lo] < first:
+                first = self._starts[lo]
+            if last is None or self._stops[hi - 1] > last:
+                last = self._stops[hi - 1]
+        return (first, last) if first is not None else None
+
+    def now_playing(self, channel_ids, now=None):
+        """
+        Bulk lookup used when rendering a channel list: maps every channel id to the
+        programme airing now (or the next one), or None when the guide has nothing.
+        """
+        if now is None:
+            now = time.time()
+        result = {}
+        for channel_id in channel_ids:
+            if channel_id in result:
+                continue
+            index = self._locate(channel_id, now)
+            result[channel_id] = self._programme(index) if index is not None else None
+        return result
+
+def resolve_epg_channel_ids(store, channel_map, entries):
+    """Guide channel id of each stream entry: its own when the guide has it, else a name match."""
+    channel_ids = []
+    for entry in entries:
+        epg_channel_id = entry.epg_channel_id
+        if not epg_channel_id or epg_channel_id not in store:
+            epg_channel_id = channel_map.lookup(entry.name)
+        channel_ids.append(epg_channel_id)
+    return channel_ids
+
+# Report parse progress at most once per this many programmes
+PARSE_PROGRESS_INTERVAL = 5000
+# First bytes of a gzip stream; url-tvg guides are often served as .xml.gz
+GZIP_MAGIC = b'\x1f\x8b'
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+# (connect, read) - the read timeout applies between chunks, not to the whole guide
+DOWNLOAD_TIMEOUT = (10, 60)
+
+def parse_xmltv(epg_source, progress=None):
+    """
+    Stream-parse XMLTV data with lxml's iterparse, clearing every <channel> and
+    <programme> element once it has been consumed so memory stays bounded no
+    matter how large the guide is. `epg_source` is a file path, raw XML bytes or a
+    memory-mapped file, any of them optionally gzip-compressed (.xml.gz guides);
+    `progress(percent, text)` is called now and then while parsing.
+    Returns an EPGStore and a map of each channel id to its display names as written
+    in the guide (stripped, not normalized; EPGMatcher normalizes them).
+    """
+    epg_store = EPGStore()
+    channel_id_to_names = {}
+    try:
+        if isinstance(epg_source, (bytes, bytearray)):
+            source = io.BytesIO(epg_source)
+            total_size = len(epg_source)
+        elif isinstance(epg_source, mmap.mmap):
+            # Read in place from the mapped file
+            source = epg_source
+            total_size = len(epg_source)
+        else:
+            source = open(epg_source, 'rb')
+            total_size = os.path.getsize(epg_source)
+
+        with source:
+            xml_source = source
+            if source.read(2) == GZIP_MAGIC:
+                xml_source = gzip.GzipFile(fileobj=source, mode='rb')
+            source.seek(0)
+            # Progress is still measured on `source`, the compressed bytes read so far
+            context = etree.iterparse(
+                xml_source, events=('end',), tag=('channel', 'programme'),
+                recover=True, huge_tree=True
+            )
+            programme_count = 0
+            last_percent = -1
+            for _, elem in context:
+                if elem.tag == 'channel':
+                    channel_id = elem.get('id')
+                    if channel_id:
+                        channel_id = channel_id.strip().lower()
+                        # Kept as written; EPGMatcher normalizes and tokenizes them itself
+                        channel_id_to_names[channel_id] = [
+                            display_name_elem.text.strip()
+                            for display_name_elem in elem.iterfind('display-name')
+                            if display_name_elem.text
+                        ]
+                else:
+                    channel_id = elem.get('channel')
+                    if channel_id:
+                        channel_id = channel_id.strip().lower()
+                    title = elem.findtext('title')
+                    description = elem.findtext('desc')
+                    epg_store.add_programme(
+                        channel_id,
+                        elem.get('start'),
+                        elem.get('stop'),
+                        title.strip() if title else '',
+                        description.strip() if description else ''
+                    )
+
+                    programme_count += 1
+                    if progress is not None and programme_count % PARSE_PROGRESS_INTERVAL == 0 and total_size:
+                        percent = min(99, int(source.tell() * 100 / total_size))
+                        if percent != last_percent:
+                            last_percent = percent
+                            progress(percent, f"Parsing EPG data... {programme_count} programmes")
+
+                # Free the element and any already-processed siblings
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            del context
+
+        return epg_store.finalize(), channel_id_to_names
+
+    except Exception as e:
+        print(f"Error parsing EPG data: {e}")
+        return EPGStore(), {}
+
+def download_xmltv(response, path, download_progress=None):
+    """
+    Stream the (possibly gzip/deflate encoded) response body to `path` in chunks,
+    calling `download_progress(received, total)` against the Content-Length when the
+    server sends one.
+    """
+    total_bytes = int(response.headers.get('Content-Length') or 0)
+    received = 0
+    last_report = 0.0
+    with open(path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            f.write(chunk)
+            # Count bytes on the wire so progress matches a compressed Content-Length
+            received = response.raw.tell() or received + len(chunk)
+            now = time.monotonic()
+            if download_progress is not None and now - last_report >= 0.2:
+                last_report = now
+                download_progress(received, total_bytes)
+    if download_progress is not None:
+        download_progress(received, total_bytes or received)
+
+def parse_xmltv_traced(epg_source, progress, source, size):
+    with span('epg.parse', source=source, bytes=size) as fields:
+        epg_data, channel_id_to_names = parse_xmltv(epg_source, progress)
+        fields['items'] = epg_data.programme_count()
+        fields['channels'] = len(channel_id_to_names)
+    return epg_data, channel_id_to_names
+
+def load_epg_cache(cache_dir):
+    with span('epg.cache_load') as fields:
+        cached = EPGStore.load(cache_dir)
+        fields['items'] = cached[0].programme_count() if cached is not None else 0
+    return cached
+
+def load_epg_file(path, cache_dir, progress=None):
+    """
+    The guide in the local XMLTV file `path` as (EPGStore, channel_id_to_names). The
+    store cached in `cache_dir` is reused while the file's mtime and size match the
+    ones it was parsed from; otherwise the file is parsed again through a read-only
+    memory map and cached with its new signature.
+    """
+    signature = list(file_signature(path))
+    cached = load_epg_cache(cache_dir)
+    if cached is not None:
+        epg_data, channel_id_to_names, meta = cached
+        if meta.get('source_signature') == signature:
+            return epg_data, channel_id_to_names
+
+    with map_file(path) as mapped:
+        epg_data, channel_id_to_names = parse_xmltv_traced(mapped, progress, 'file', signature[1])
+    if epg_data:
+        epg_data.save(cache_dir, channel_id_to_names, {'source_signature': signature})
+    return epg_data, channel_id_to_names
+
+def load_epg(epg_url, cache_dir, http_method='GET', cache_ttl=DEFAULT_EPG_CACHE_TTL,
+             download_progress=None, progress=None):
+    """
+    The guide at `epg_url` as (EPGStore, channel_id_to_names). A store cached in
+    `cache_dir` younger than `cache_ttl` is used as is; an older one is revalidated
+    with the server's ETag/Last-Modified and only downloaded and parsed again when the
+    guide changed. A local path or file:// URL is read with load_epg_file. Network and
+    HTTP errors are raised.
+    """
+    path = local_path(epg_url)
+    if path is not None:
+        return load_epg_file(path, cache_dir, progress)
+
+    cached = load_epg_cache(cache_dir)
+    if cached is not None:
+        epg_data, channel_id_to_names, meta = cached
+        if time.time() - meta['created'] < cache_ttl:
+            return epg_data, channel_id_to_names
+
+    headers = {}
+    if cached is not None:
+        # Revalidate so an unchanged guide costs a 304 instead of a full download
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    with span('epg.download', method=http_method) as fields:
+        response = get_http_client(epg_url).request(
+            http_method, epg_url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT
+        )
+        fields['status'] = response.status_code
+
+        with response:
+            if response.status_code == 304 and cached is not None:
+                EPGStore.touch(cache_dir)
+                return epg_data, channel_id_to_names
+            response.raise_for_status()
+            validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
+            os.makedirs(cache_dir, exist_ok=True)
+            # A file of its own: another load of the same account's guide may be running
+            fd, download_file = tempfile.mkstemp(dir=cache_dir, prefix='download.', suffix='.xml')
+            os.close(fd)
+            try:
+                download_xmltv(response, download_file, download_progress)
+            except BaseException:
+                os.remove(download_file)
+                raise
+            fields['bytes'] = response.raw.tell()
+
+    try:
+        epg_data, channel_id_to_names = parse_xmltv_traced(
+            download_file, progress, 'network', os.path.getsize(download_file)
+        )
+    finally:
+        os.remove(download_file)
+    if epg_data:
+        epg_data.save(cache_dir, channel_id_to_names, validators)
+    return epg_data, channel_id_to_names
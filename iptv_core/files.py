@@ -0,0 +1,37 @@
+"""Local playlist and guide files: telling them from URLs, change signatures and read-only maps."""
+import contextlib
+import mmap
+import os
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+def local_path(source):
+    """Filesystem path of a source given as a path or file:// URL, or None for a network URL."""
+    source = str(source)
+    if source.startswith('file://'):
+        return url2pathname(urlsplit(source).path)
+    if '://' in source:
+        return None
+    return source
+
+def file_signature(path):
+    """(mtime in ns, size) of `path`; a parsed result is reused only while this is unchanged."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+@contextlib.contextmanager
+def map_file(path):
+    """
+    Read-only memory map of `path` (b'' for an empty file, which cannot be mapped).
+    Pages are read in from the OS cache on demand instead of copying the whole file
+    into the process, and are hinted as read front to back so they can be dropped.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            sequential = getattr(mmap, 'MADV_SEQUENTIAL', None)
+            if sequential is not None:
+                mapped.madvise(sequential)
+            yield mapped
@@ -0,0 +1,192 @@
+"""
+Stream health checks: each stream URL of a category is probed with a short ranged
+GET (or, for HLS, a fetch of its playlist) a few at a time, and the result is kept
+per account with a TTL so reopening the category shows it without probing again.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import requests
+
+from .cache import write_atomic
+from .http_client import HttpClient
+from .m3u import url_extension
+from .tracing import span
+
+# (connect, read) timeouts of one probe; a stream that has not sent data by then is dead
+PROBE_TIMEOUT = (4, 6)
+# Bytes asked for with the Range header, and read before the connection is dropped
+PROBE_READ_BYTES = 4096
+# A stream whose first bytes take longer than this (in seconds) is marked slow
+DEFAULT_SLOW_AFTER = 2.0
+# How long (in seconds) a probe result is trusted, overridable from the [Health] section
+DEFAULT_HEALTH_TTL = 30 * 60
+
+# Probes run at once when the account's free connections are unknown or unlimited, and
+# the most ever run at once
+DEFAULT_PROBE_CONCURRENCY = 2
+MAX_PROBE_CONCURRENCY = 8
+
+HLS_EXTENSIONS = frozenset(('m3u8', 'm3u'))
+
+# How often (in seconds) a running check looks at its cancellation flag between results
+CANCEL_POLL_INTERVAL = 0.1
+
+# Result of one probe: 'ok', 'slow' or 'dead', seconds to the first bytes, and when (epoch)
+StreamHealth = namedtuple('StreamHealth', ['status', 'latency', 'checked'])
+
+def probe_concurrency(max_connections, active_connections=0):
+    """
+    Probes to run at once for an account with these user_info values: its free
+    connections, capped at MAX_PROBE_CONCURRENCY, or 0 when every connection is in
+    use (a probe would then be refused and the stream wrongly marked dead).
+    """
+    try:
+        max_connections = int(max_connections)
+    except (TypeError, ValueError):
+        return DEFAULT_PROBE_CONCURRENCY
+    if max_connections <= 0:
+        return DEFAULT_PROBE_CONCURRENCY
+    try:
+        active_connections = int(active_connections or 0)
+    except (TypeError, ValueError):
+        active_connections = 0
+    return max(0, min(MAX_PROBE_CONCURRENCY, max_connections - active_connections))
+
+def probe_stream(url, client, slow_after=DEFAULT_SLOW_AFTER, timeout=PROBE_TIMEOUT):
+    """
+    StreamHealth of the stream at `url`. Only the first few KB are read: a stream is
+    dead if the request fails, the answer is an HTTP error or empty, or an HLS URL
+    does not answer with a playlist; it is slow if those bytes took over `slow_after`.
+    """
+    hls = url_extension(url) in HLS_EXTENSIONS
+    headers = {} if hls else {'Range': f"bytes=0-{PROBE_READ_BYTES - 1}"}
+    start = time.perf_counter()
+    with span('health.probe', hls=hls) as fields:
+        try:
+            with client.request('GET', url, headers=headers, stream=True, timeout=timeout) as response:
+                fields['status'] = response.status_code
+                data = b''
+                if response.status_code < 400:
+                    data = next(response.iter_content(PROBE_READ_BYTES), b'')
+            alive = bool(data) and (not hls or data.lstrip(b'\xef\xbb\xbf \r\n\t').startswith(b'#EXTM3U'))
+        except requests.RequestException as e:
+            fields['error'] = type(e).__name__
+            alive = False
+        latency = time.perf_counter() - start
+        if not alive:
+            status = 'dead'
+        elif latency > slow_after:
+            status = 'slow'
+        else:
+            status = 'ok'
+        fields['health'] = status
+    return StreamHealth(status, round(latency, 3), time.time())
+
+class HealthCache:
+    """
+    Probe results of one account's streams, kept in a JSON file keyed by a hash of the
+    stream URL (so no credentials end up in it). A result is returned by get() for
+    `ttl` seconds after its probe. Safe to fill from a worker while the GUI reads it.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_HEALTH_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.results = {key: StreamHealth(*value) for key, value in json.load(f)['streams'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            self.results = {}
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+    def get(self, url, now=None):
+        """Fresh StreamHealth of `url`, or None if it was never probed or is past the TTL."""
+        result = self.results.get(self.key(url))
+        if result is None or (now or time.time()) - result.checked > self.ttl:
+            return None
+        return result
+
+    def put(self, url, result):
+        with self._lock:
+            self.results[self.key(url)] = result
+
+    def save(self):
+        """Write the results still within the TTL; expired ones are dropped."""
+        now = time.time()
+        with self._lock:
+            self.results = {key: result for key, result in self.results.items() if now - result.checked <= self.ttl}
+            streams = {key: list(result) for key, result in self.results.items()}
+        try:
+            write_atomic(self.path, json.dumps({'streams': streams}).encode('utf-8'))
+        except OSError as e:
+            print(f"Error saving stream health: {e}")
+
+def probe_streams(urls, cache, concurrency, slow_after=DEFAULT_SLOW_AFTER, cancelled=None):
+    """
+    Generator: the health of every URL in `urls`, yielding lists of (url, StreamHealth).
+    Results still fresh in `cache` come first, in one list; the other URLs are then
+    probed in the given order, at most `concurrency` at a time, and each result is
+    yielded as its probe finishes. New results go into `cache`, which is saved at the
+    end.
+
+    Setting the threading.Event `cancelled` (or closing the generator) stops the
+    check: probes that have not started are dropped, and the generator only returns
+    once the running ones have finished, within PROBE_TIMEOUT, so none of them still
+    holds a provider connection afterwards.
+    """
+    if cancelled is None:
+        cancelled = threading.Event()
+    pending = []
+    fresh = []
+    now = time.time()
+    for url in dict.fromkeys(urls):
+        result = cache.get(url, now)
+        if result is None:
+            pending.append(url)
+        else:
+            fresh.append((url, result))
+    if fresh:
+        yield fresh
+    if not pending:
+        return
+
+    # A client of its own: probes must not queue behind or hold the provider's API
+    # connections, and a dead stream is not worth retrying
+    client = HttpClient(pool_size=concurrency, retries=0)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='probe')
+
+    def probe(url):
+        # A probe queued before the check was cancelled must not open a connection
+        if cancelled.is_set():
+            return None
+        return probe_stream(url, client, slow_after)
+
+    try:
+        futures = {executor.submit(probe, url): url for url in pending}
+        remaining = set(futures)
+        while remaining and not cancelled.is_set():
+            done, remaining = wait(remaining, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            batch = []
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    cache.put(futures[future], result)
+                    batch.append((futures[future], result))
+            if batch:
+                yield batch
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Kept-alive probe connections would still count against the account's limit
+        client.session.close()
+        cache.save()
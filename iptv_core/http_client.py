@@ -0,0 +1,142 @@
+"""Shared keep-alive HTTP clients and incremental JSON decoding of response bodies."""
+import codecs
+import itertools
+import json
+import re
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CUSTOM_USER_AGENT = "okhttp/5.0.0-alpha.2"
+
+DEFAULT_HEADERS = {
+    'User-Agent': CUSTOM_USER_AGENT,
+    'Connection': 'Keep-Alive',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# Stream lists are decoded as they download, in chunks of this many bytes
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Network defaults, overridable from the [Network] section of config.ini
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters that can continue a number raw_decode has already stopped at: '1.' or
+# '1e' at the end of a chunk decodes as 1 before the rest of it has arrived
+JSON_NUMBER_CONTINUATION = frozenset('.eE+-')
+
+def iter_json_array(chunks):
+    """
+    Decode a JSON array incrementally from an iterable of byte chunks, yielding the
+    list of elements completed by each chunk so they can be used before the rest of
+    the document has arrived. Raises ValueError if the document is not an array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    started = False
+    # A trailing None flushes the text decoder and marks the end of the body
+    for chunk in itertools.chain(chunks, (None,)):
+        final = chunk is None
+        buffer = buffer[position:] + text_decoder.decode(chunk or b'', final=final)
+        position = 0
+        items = []
+        bulk = True
+        while True:
+            position = JSON_WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if not started:
+                if char != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                position += 1
+            elif char == ']':
+                if items:
+                    yield items
+                return
+            elif char == ',':
+                position += 1
+            else:
+                if bulk:
+                    # Usually every element up to the chunk's last '}' is complete: decode them
+                    # all in one call. A cut inside a string or a nested value cannot parse,
+                    # in which case the elements are decoded one at a time below.
+                    bulk = False
+                    end = buffer.rfind('}', position) + 1
+                    if end:
+                        try:
+                            items.extend(json.loads('[' + buffer[position:end] + ']'))
+                            position = end
+                            continue
+                        except ValueError:
+                            pass
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if final:
+                        raise
+                    break
+                if not final and (end == len(buffer) or buffer[end] in JSON_NUMBER_CONTINUATION):
+                    # A number or literal may continue in the next chunk
+                    break
+                items.append(item)
+                position = end
+        if items:
+            yield items
+    raise ValueError("Truncated JSON array")
+
+class HttpClient:
+    """
+    Keep-alive HTTP client for one provider host. A single requests.Session with a
+    sized urllib3 connection pool is shared by every thread talking to that host, so
+    category clicks reuse warm TCP/TLS connections. Transient connection errors and
+    502/503/504 answers are retried with exponential backoff.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, retries=DEFAULT_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR):
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, params=None, timeout=10, **kwargs):
+        """GET with `params` as the query string, or POST with them as the form body."""
+        if method == 'POST':
+            return self.session.post(url, data=params, timeout=timeout, **kwargs)
+        return self.session.get(url, params=params, timeout=timeout, **kwargs)
+
+_http_clients = {}
+_http_clients_lock = threading.Lock()
+_http_client_settings = {}
+
+def configure_http_clients(**settings):
+    """Set the pool size/retry settings used for clients created from now on."""
+    with _http_clients_lock:
+        _http_client_settings.update(settings)
+
+def get_http_client(url):
+    """Shared HttpClient for the scheme and host of `url`."""
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc}".lower()
+    with _http_clients_lock:
+        client = _http_clients.get(key)
+        if client is None:
+            client = _http_clients[key] = HttpClient(**_http_client_settings)
+        return client
@@ -0,0 +1,290 @@
+"""
+M3U / M3U_plus playlists (get.php?type=m3u_plus and plain #EXTM3U files), read
+without player_api.php: the playlist is tokenized in a single pass while it
+downloads, or straight from a local file, and its entries are sorted into the LIVE,
+Movies and Series tabs, grouped by their group-title.
+"""
+import codecs
+import sys
+import threading
+from collections import OrderedDict
+
+from .catalog import Catalog, StreamRecord
+from .files import file_signature, local_path, map_file
+from .http_client import get_http_client
+from .tracing import span
+
+PLAYLIST_CHUNK_SIZE = 256 * 1024
+PLAYLIST_TIMEOUT = (10, 60)
+
+# Parsed local playlists kept for reopening, keyed by path and checked against the file's signature
+PARSED_FILES_KEPT = 2
+
+# Tab of an entry by the path of its URL (Xtream playlists), and the stream type it gets
+PLAYLIST_TABS = {
+    'LIVE': 'live',
+    'Movies': 'movie',
+    'Series': 'series',
+}
+
+# Files with these extensions are movies even when the URL path does not say so
+VOD_EXTENSIONS = frozenset(('mp4', 'mkv', 'avi', 'mov', 'wmv', 'flv', 'mpg', 'mpeg', 'm4v', 'webm'))
+
+UNCATEGORIZED = "Uncategorized"
+
+class PlaylistRecord(StreamRecord):
+    """A StreamRecord from a playlist: it carries its own URL instead of a stream_id."""
+
+    __slots__ = ('url', 'logo')
+
+    def __init__(self, name, stream_type, category_id, epg_channel_id, container_extension, url, logo):
+        super().__init__(name, None, stream_type, category_id, epg_channel_id, container_extension)
+        self.url = url
+        self.logo = logo
+
+    def play_url(self, server=None, username=None, password=None):
+        return self.url
+
+def parse_attributes(line, position):
+    """
+    key="value" pairs of an #EXTINF or #EXTM3U line from `position` on, scanned with
+    str.find, and the position of the comma that ends them (-1 if there is none).
+    Quoted values may contain commas and spaces.
+    """
+    attributes = {}
+    length = len(line)
+    while position < length:
+        equals = line.find('=', position)
+        comma = line.find(',', position)
+        if equals == -1 or (comma != -1 and comma < equals):
+            return attributes, comma
+        key = line[position:equals].strip().lower()
+        if line.startswith('"', equals + 1):
+            end = line.find('"', equals + 2)
+            if end == -1:
+                end = length
+            attributes[key] = line[equals + 2:end]
+            position = end + 1
+        else:
+            end = line.find(' ', equals + 1)
+            if end == -1 or (comma != -1 and comma < end):
+                end = comma if comma != -1 else length
+            attributes[key] = line[equals + 1:end]
+            position = end
+    return attributes, -1
+
+def parse_extinf(line):
+    """(attributes, title) of '#EXTINF:-1 tvg-id="..." group-title="...",Title'."""
+    # Fast path for the usual all-quoted form: splitting on quotes leaves the keys at
+    # even and the values at odd positions, and the title after the last quote
+    parts = line.split('"')
+    if len(parts) > 1 and len(parts) % 2:
+        attributes = {}
+        for i in range(1, len(parts), 2):
+            key = parts[i - 1]
+            if key[-1:] != '=' or ',' in key or key.count('=') != 1:
+                break
+            attributes[key[key.rfind(' ') + 1:-1].lower()] = parts[i]
+        else:
+            tail = parts[-1]
+            comma = tail.find(',')
+            if comma != -1:
+                return attributes, tail[comma + 1:].strip()
+
+    comma = line.find(',', 8)
+    space = line.find(' ', 8)
+    if space != -1 and (comma == -1 or space < comma):
+        # Attributes follow the duration
+        attributes, comma = parse_attributes(line, space)
+    else:
+        attributes = {}
+    title = line[comma + 1:].strip() if comma != -1 else ''
+    return attributes, title
+
+def url_extension(url):
+    end = url.find('?')
+    if end == -1:
+        end = len(url)
+    dot = url.rfind('.', 0, end)
+    if dot == -1 or url.rfind('/', 0, end) > dot:
+        return ''
+    return url[dot + 1:end].lower()
+
+def playlist_tab(url, extension):
+    if '/movie/' in url:
+        return 'Movies'
+    if '/series/' in url:
+        return 'Series'
+    if extension in VOD_EXTENSIONS:
+        return 'Movies'
+    return 'LIVE'
+
+class M3UPlaylist:
+    """
+    Entries of one playlist per tab, and each tab's groups as the category dicts the
+    window lists (category_id and category_name are both the group-title).
+    """
+
+    def __init__(self, url=None):
+        self.url = url
+        self.epg_url = None
+        self.entries = {tab_name: [] for tab_name in PLAYLIST_TABS}
+        self.groups = {tab_name: [] for tab_name in PLAYLIST_TABS}
+        self._group_names = {tab_name: set() for tab_name in PLAYLIST_TABS}
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.entries.values())
+
+    def add(self, tab_name, record):
+        self.entries[tab_name].append(record)
+        group_names = self._group_names[tab_name]
+        if record.category_id not in group_names:
+            group_names.add(record.category_id)
+            self.groups[tab_name].append({'category_id': record.category_id, 'category_name': record.category_id})
+
+    def catalogs(self):
+        """A Catalog per tab, so opening and searching groups needs no further parsing."""
+        return {tab_name: Catalog(entries) for tab_name, entries in self.entries.items()}
+
+class M3UParser:
+    """
+    Incremental playlist tokenizer: feed() takes decoded text in chunks of any size
+    (a line may be split across chunks) and each line is looked at once, by its first
+    characters, with no regular expressions. An #EXTINF line is held until the URL line
+    that follows it.
+    """
+
+    def __init__(self, url=None):
+        self.playlist = M3UPlaylist(url)
+        self._tail = ''
+        self._info = None
+        self._group = None
+        self._extensions = {}
+
+    def feed(self, text):
+        lines = (self._tail + text).split('\n')
+        self._tail = lines.pop()
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if line[0] != '#':
+                self._entry(line)
+            elif line.startswith('#EXTINF:'):
+                self._info = parse_extinf(line)
+            elif line.startswith('#EXTGRP:'):
+                self._group = line[8:].strip() or None
+            elif line.startswith('#EXTM3U'):
+                attributes = parse_attributes(line, 7)[0]
+                epg_url = attributes.get('url-tvg') or attributes.get('x-tvg-url')
+                if epg_url:
+                    # Some playlists list several guides; the first one is used
+                    self.playlist.epg_url = epg_url.split(',', 1)[0].strip()
+
+    def close(self):
+        """Parse whatever is left and return the M3UPlaylist."""
+        if self._tail:
+            tail, self._tail = self._tail, ''
+            self.feed(tail + '\n')
+        return self.playlist
+
+    def _entry(self, url):
+        """The URL line ending an entry, with the #EXTINF (and #EXTGRP) lines before it."""
+        attributes, title = self._info or ({}, '')
+        group = attributes.get('group-title') or self._group or UNCATEGORIZED
+        extension = url_extension(url)
+        tab_name = playlist_tab(url, extension)
+        epg_channel_id = attributes.get('tvg-id')
+        container_extension = self._extensions.get(extension)
+        if container_extension is None:
+            container_extension = self._extensions[extension] = sys.intern(extension or 'm3u8')
+        self.playlist.add(tab_name, PlaylistRecord(
+            title or attributes.get('tvg-name') or url,
+            PLAYLIST_TABS[tab_name],
+            sys.intern(group),
+            epg_channel_id.strip().lower() or None if epg_channel_id else None,
+            container_extension,
+            url,
+            attributes.get('tvg-logo') or None,
+        ))
+        self._info = None
+        self._group = None
+
+def parse_m3u(chunks, url=None):
+    """M3UPlaylist from an iterable of text chunks (or one string)."""
+    parser = M3UParser(url)
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+_parsed_files = OrderedDict()
+_parsed_files_lock = threading.Lock()
+
+def load_m3u_file(path):
+    """
+    Generator counterpart of load_m3u for a local playlist. The file is read through
+    a read-only memory map and decoded a chunk at a time from memoryview slices, so a
+    multi-hundred-MB playlist is never held whole as bytes or text. The parsed
+    playlist is kept and returned again while the file's mtime and size are unchanged.
+    """
+    signature = file_signature(path)
+    with _parsed_files_lock:
+        cached = _parsed_files.get(path)
+        if cached is not None and cached[0] == signature:
+            _parsed_files.move_to_end(path)
+            return cached[1]
+
+    parser = M3UParser(path)
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    with span('m3u.load', source='file', bytes=signature[1]) as fields, map_file(path) as mapped:
+        view = memoryview(mapped)
+        try:
+            for position in range(0, len(view), PLAYLIST_CHUNK_SIZE):
+                parser.feed(decoder.decode(view[position:position + PLAYLIST_CHUNK_SIZE]))
+                yield len(parser.playlist)
+        finally:
+            # The map cannot be closed while a view of it is alive
+            view.release()
+        parser.feed(decoder.decode(b'', final=True))
+        playlist = parser.close()
+        fields['items'] = len(playlist)
+    if not len(playlist):
+        raise ValueError("The playlist has no entries")
+
+    with _parsed_files_lock:
+        _parsed_files[path] = (signature, playlist)
+        _parsed_files.move_to_end(path)
+        while len(_parsed_files) > PARSED_FILES_KEPT:
+            _parsed_files.popitem(last=False)
+    return playlist
+
+def load_m3u(url):
+    """
+    Generator: downloads the playlist at `url` and parses it as it arrives, yielding
+    the number of entries parsed so far after each chunk, and returns the M3UPlaylist.
+    A local path or file:// URL is read with load_m3u_file. Network and HTTP errors
+    are raised.
+    """
+    path = local_path(url)
+    if path is not None:
+        return (yield from load_m3u_file(path))
+
+    parser = M3UParser(url)
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    with span('m3u.load', source='network') as fields:
+        response = get_http_client(url).request('GET', url, stream=True, timeout=PLAYLIST_TIMEOUT)
+        fields['status'] = response.status_code
+        with response:
+            response.raise_for_status()
+            for chunk in response.iter_content(PLAYLIST_CHUNK_SIZE):
+                parser.feed(decoder.decode(chunk))
+                yield len(parser.playlist)
+            fields['bytes'] = response.raw.tell()
+        parser.feed(decoder.decode(b'', final=True))
+        playlist = parser.close()
+        fields['items'] = len(playlist)
+    if not len(playlist):
+        raise ValueError("The playlist has no entries")
+    return playlist
@@ -0,0 +1,37 @@
+"""Accent- and case-insensitive substring search over row labels."""
+import unicodedata
+
+def fold_text(text):
+    """Case- and accent-fold text for searching, e.g. "Télé ÉTÉ" -> "tele ete"."""
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+class SearchIndex:
+    """
+    Folded labels of one navigation level, built once. search() remembers its last
+    query and result, so extending the query (typing another character) only rescans
+    the previous matches instead of the whole level.
+    """
+
+    def __init__(self, labels):
+        self.labels = [fold_text(label) for label in labels]
+        self._last_query = ''
+        self._last_matches = None
+
+    def search(self, query):
+        """Positions of labels containing `query`, in label order, or None for an empty query."""
+        query = fold_text(query.strip())
+        if not query:
+            self._last_query, self._last_matches = '', None
+            return None
+
+        if self._last_matches is not None and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self.labels))
+        labels = self.labels
+        matches = [i for i in candidates if query in labels[i]]
+        self._last_query, self._last_matches = query, matches
+        return matches
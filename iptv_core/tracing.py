@@ -0,0 +1,122 @@
+"""
+Timing spans around network calls, parsing and rendering. Each finished span is
+appended as one JSON line to trace.jsonl in the cache directory (~/.iptv) and its
+duration is kept per operation name for a live p50/p95 summary.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import cache
+
+TRACE_FILE_NAME = 'trace.jsonl'
+# The log is rotated to trace.jsonl.1 once it grows past this size
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+# Durations kept per operation for the percentile summary
+TRACE_SAMPLES = 500
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+class Tracer:
+    """
+    Thread-safe span recorder. span() is a context manager yielding a dict the caller
+    may add fields to (bytes, items, ...); on exit the span's duration in ms, its
+    start time, its fields and the name of an exception that escaped it are recorded.
+    """
+
+    def __init__(self, path=None, enabled=True, max_bytes=TRACE_MAX_BYTES):
+        self.path = Path(path) if path is not None else None
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.samples = {}
+        self.counts = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **fields):
+        if not self.enabled:
+            yield fields
+            return
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            yield fields
+        except BaseException as e:
+            fields['error'] = type(e).__name__
+            raise
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, started, fields)
+
+    def record(self, name, duration_ms, started, fields):
+        line = json.dumps(dict({'ts': round(started, 3), 'op': name, 'ms': round(duration_ms, 3)}, **fields), default=str)
+        with self._lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=TRACE_SAMPLES)
+            samples.append(duration_ms)
+            self.counts[name] = self.counts.get(name, 0) + 1
+            try:
+                self._write(line)
+            except Exception as e:
+                # The log is a side channel: failing to write it must never break the traced code
+                print(f"Error writing trace log: {e}")
+                self.enabled = False
+
+    def log_path(self):
+        """File the spans are appended to: `path`, or trace.jsonl in the cache directory."""
+        # Resolved when asked for, so a CACHE_DIR set at startup is honoured
+        return self.path if self.path is not None else cache.CACHE_DIR / TRACE_FILE_NAME
+
+    def _write(self, line):
+        if self._file is None:
+            self.path = self.log_path()
+            os.makedirs(self.path.parent, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+        self._file.write(line + '\n')
+        if self._file.tell() > self.max_bytes:
+            self._file.close()
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+
+    def summary(self):
+        """
+        {operation: {'count', 'p50', 'p95', 'max'}}: spans recorded so far, and
+        percentiles in ms over the most recent TRACE_SAMPLES of them.
+        """
+        with self._lock:
+            snapshot = {name: (self.counts[name], sorted(samples)) for name, samples in self.samples.items() if samples}
+        return {
+            name: {
+                'count': count,
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95),
+                'max': values[-1],
+            }
+            for name, (count, values) in snapshot.items()
+        }
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+tracer = Tracer()
+
+def span(name, **fields):
+    """tracer.span for the shared tracer: `with span('epg.parse') as s: ...; s['items'] = n`."""
+    return tracer.span(name, **fields)
+
+def configure_tracing(enabled=True, path=None):
+    tracer.close()
+    tracer.enabled = enabled
+    if path is not None:
+        tracer.path = Path(path).expanduser()
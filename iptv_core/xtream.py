@@ -0,0 +1,170 @@
+"""Xtream Codes player_api.php client."""
+import json
+import re
+
+from .catalog import Catalog, make_records
+from .http_client import STREAM_CHUNK_SIZE, get_http_client, iter_json_array
+from .tracing import span
+
+CATEGORY_ACTIONS = {
+    'LIVE': 'get_live_categories',
+    'Movies': 'get_vod_categories',
+    'Series': 'get_series_categories',
+}
+
+# player_api.php action listing a tab's entries, and the stream type used in play URLs
+STREAM_ACTIONS = {
+    'LIVE': ('get_live_streams', 'live'),
+    'Movies': ('get_vod_streams', 'movie'),
+    'Series': ('get_series', None),
+}
+
+M3U_PLUS_URL_RE = re.compile(r'(http[s]?://[^/]+)/get\.php\?username=([^&]*)&password=([^&]*)&type=(m3u_plus|m3u|&output=m3u8)')
+
+def parse_m3u_plus_url(url):
+    """(server, username, password) of an m3u_plus/m3u playlist URL, or None."""
+    match = M3U_PLUS_URL_RE.match(url)
+    if not match:
+        return None
+    return match.group(1), match.group(2), match.group(3)
+
+def span_action(params):
+    """Operation name recorded on the spans of a player_api.php request."""
+    return (params or {}).get('action', 'account_info')
+
+def decode_json(body, action, source):
+    with span('json.decode', action=action, source=source, bytes=len(body)) as fields:
+        data = json.loads(body)
+        fields['items'] = len(data) if isinstance(data, (list, dict)) else None
+    return data
+
+def fetch_json(method, url, params=None, timeout=10, api=None):
+    """
+    Blocking request and JSON decode. With an ApiFetch, the response is served from
+    and stored in the account's cache.
+    """
+    action = span_action(params)
+    if api is not None:
+        cached = api.cache.read(params)
+        if cached is not None:
+            body, fresh = cached
+            if fresh or not api.revalidate:
+                api.stale = api.stale or not fresh
+                return decode_json(body, action, 'cache')
+
+    with span('http.request', action=action, method=method) as fields:
+        response = get_http_client(url).request(method, url, params, timeout=timeout)
+        fields['status'] = response.status_code
+        response.raise_for_status()
+        body = response.content
+        fields['bytes'] = len(body)
+    data = decode_json(body, action, 'network')
+    if api is not None and api.cache.write(params, body):
+        api.changed = True
+    return data
+
+def stream_json_array(method, url, params=None, timeout=10, api=None):
+    """
+    Generator counterpart of fetch_json for responses that are JSON arrays: yields
+    lists of decoded elements while the body downloads and returns the whole array.
+    """
+    action = span_action(params)
+    if api is not None:
+        cached = api.cache.read(params)
+        if cached is not None:
+            body, fresh = cached
+            if fresh or not api.revalidate:
+                api.stale = api.stale or not fresh
+                data = decode_json(body, action, 'cache')
+                if not isinstance(data, list):
+                    raise ValueError("Expected a JSON array")
+                yield data
+                return data
+
+    # Download and decode overlap, so one span covers both
+    body = []
+    entries = []
+    with span('http.stream', action=action, method=method) as fields:
+        response = get_http_client(url).request(method, url, params, timeout=timeout, stream=True)
+        fields['status'] = response.status_code
+        try:
+            response.raise_for_status()
+
+            def chunks():
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    body.append(chunk)
+                    yield chunk
+
+            for items in iter_json_array(chunks()):
+                entries.extend(items)
+                yield items
+        finally:
+            response.close()
+            fields['bytes'] = sum(map(len, body))
+            fields['items'] = len(entries)
+    if api is not None and api.cache.write(params, b''.join(body)):
+        api.changed = True
+    return entries
+
+class XtreamClient:
+    """
+    player_api.php client for one account. Every call blocks; the window runs them on
+    its thread pool. Reads take an optional `api` (an ApiFetch) to go through the
+    account's response cache. `tab_name` is one of the keys of STREAM_ACTIONS.
+    """
+
+    def __init__(self, server, username, password, http_method='GET'):
+        self.server = server
+        self.username = username
+        self.password = password
+        self.http_method = http_method
+
+    @property
+    def api_url(self):
+        return f"{self.server}/player_api.php"
+
+    def epg_url(self):
+        return f"{self.server}/xmltv.php?username={self.username}&password={self.password}"
+
+    def params(self, action, **extra):
+        return dict({'username': self.username, 'password': self.password, 'action': action}, **extra)
+
+    def account_info(self):
+        return fetch_json('POST', self.api_url, {'username': self.username, 'password': self.password}, timeout=10)
+
+    def categories(self, tab_name, api=None):
+        categories = fetch_json(self.http_method, self.api_url, self.params(CATEGORY_ACTIONS[tab_name]), timeout=10, api=api)
+        if not isinstance(categories, list):
+            raise ValueError("Expected a list of categories")
+        return categories
+
+    def streams(self, tab_name, category_id, api=None):
+        """
+        Generator over one category's entries as StreamRecords (SeriesRecords on the
+        Series tab): yields each decoded batch as it downloads and returns them all.
+        """
+        action, stream_type = STREAM_ACTIONS[tab_name]
+        entries = []
+        for batch in stream_json_array(self.http_method, self.api_url, self.params(action, category_id=category_id), api=api):
+            records = make_records(batch, stream_type)
+            entries.extend(records)
+            yield records
+        return entries
+
+    def catalog(self, tab_name, api=None):
+        """Every entry of the tab in one request (no category_id), as a Catalog."""
+        action, stream_type = STREAM_ACTIONS[tab_name]
+        entries = fetch_json(self.http_method, self.api_url, self.params(action), timeout=60, api=api)
+        if not isinstance(entries, list):
+            raise ValueError("Expected a list of entries")
+        with span('catalog.build', tab=tab_name, items=len(entries)):
+            return Catalog(make_records(entries, stream_type))
+
+    def series_info(self, series_id, api=None):
+        return fetch_json(self.http_method, self.api_url, self.params('get_series_info', series_id=series_id), api=api)
+
+    def stream_url(self, record):
+        return record.play_url(self.server, self.username, self.password)
+
+    def episode_url(self, episode):
+        return f"{self.server}/series/{self.username}/{self.password}/{episode['id']}.{episode.get('container_extension', 'm3u8')}"
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from iptv_core.cache import ApiCache, write_atomic
+
+def test_concurrent_writes_of_the_same_entry(tmp_path):
+    cache = ApiCache(tmp_path / 'api')
+    params = {'action': 'get_live_streams'}
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(50):
+                cache.write(params, f'[{n}, {i}]'.encode())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert cache.path(params).read_bytes().startswith(b'[')
+    assert [p.name for p in (tmp_path / 'api').iterdir()] == [cache.path(params).name]
+
+def test_failed_write_returns_instead_of_raising(tmp_path):
+    blocker = tmp_path / 'api'
+    blocker.write_bytes(b'')  # a file where the cache directory should be
+    assert ApiCache(blocker).write({'action': 'get_vod_streams'}, b'[]') is True
+
+def test_write_atomic_creates_the_directory(tmp_path):
+    path = tmp_path / 'a' / 'b' / 'data.json'
+    write_atomic(path, b'{}')
+    assert path.read_bytes() == b'{}'
+    assert list(path.parent.iterdir()) == [path]
+
+def test_import_does_not_create_the_cache_directory(tmp_path):
+    home = tmp_path / 'home'
+    home.mkdir()
+    env = {'HOME': str(home), 'USERPROFILE': str(home), 'PATH': ''}
+    subprocess.run([sys.executable, '-c', 'import iptv_core'], env=env, check=True, cwd=Path(__file__).parent.parent)
+    assert not (home / '.iptv').exists()
@@ -0,0 +1,162 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from iptv_core.epg import EPGStore, load_epg, parse_xmltv
+from iptv_core.files import map_file
+
+def xmltv(channels=50):
+    now = int(time.time())
+    stamp = lambda t: time.strftime('%Y%m%d%H%M%S +0000', time.gmtime(t))
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<tv>']
+    for n in range(channels):
+        parts.append(f'<channel id="c{n}"><display-name>Channel {n}</display-name></channel>')
+        parts.append(
+            f'<programme channel="c{n}" start="{stamp(now - 600)}" stop="{stamp(now + 600)}">'
+            f'<title>Show {n}</title></programme>'
+        )
+    parts.append('</tv>')
+    return '\n'.join(parts).encode('utf-8')
+
+@pytest.fixture
+def guide_server():
+    body = xmltv()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            # Slow enough for concurrent downloads to overlap
+            for start in range(0, len(body), 1024):
+                self.wfile.write(body[start:start + 1024])
+                time.sleep(0.002)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/xmltv.php"
+    server.shutdown()
+    server.server_close()
+
+def test_concurrent_loads_of_one_guide(guide_server, tmp_path):
+    results = []
+    errors = []
+
+    def load():
+        try:
+            results.append(load_epg(guide_server, tmp_path, cache_ttl=0))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert [len(names) for _, names in results] == [50] * 4
+    assert not list(tmp_path.glob('download*'))
+
+@pytest.mark.parametrize('kind', ['bytes', 'path', 'mmap'])
+def test_gzip_guide(kind, tmp_path):
+    body = gzip.compress(xmltv(5))
+    path = tmp_path / 'guide.xml.gz'
+    path.write_bytes(body)
+    if kind == 'bytes':
+        store, names = parse_xmltv(body)
+    elif kind == 'path':
+        store, names = parse_xmltv(str(path))
+    else:
+        with map_file(path) as mapped:
+            store, names = parse_xmltv(mapped)
+    assert store.programme_count() == 5
+    assert names['c3'] == ['Channel 3']
+
+def test_programme_without_channel_is_dropped():
+    guide = xmltv(2).replace(b'</tv>', b'<programme start="20200101000000 +0000" stop="20300101000000 +0000"><title>Orphan</title></programme></tv>')
+    store, _ = parse_xmltv(guide)
+    assert store.programme_count() == 2
+    assert None not in store
+    assert store.now_playing([None]) == {None: None}
+
+BASE = 1704067200  # 2024-01-01 00:00 UTC
+
+def stamp(hours):
+    return time.strftime('%Y%m%d%H%M%S +0000', time.gmtime(BASE + int(hours * 3600)))
+
+def sample_store():
+    store = EPGStore()
+    # Added out of order: finalize() sorts each channel's run
+    store.add_programme('a', stamp(13), stamp(14), 'One', 'After the gap')
+    store.add_programme('a', stamp(10), stamp(11), 'Ten', 'First')
+    store.add_programme('a', stamp(11), stamp(12), 'Eleven', '')
+    store.add_programme('b', stamp(9), stamp(12), 'Télé été ★', 'Déscription')
+    store.add_programme('b', 'not a time', stamp(12), 'Bad', '')
+    return store.finalize()
+
+def titles(programmes):
+    return [programme.title if programme else None for programme in programmes]
+
+@pytest.mark.parametrize('hours, title', [
+    (9, 'Ten'),          # before the first: the next one
+    (10, 'Ten'),         # at a start
+    (10.5, 'Ten'),
+    (11, 'Eleven'),      # back to back: the one starting wins
+    (12, 'Eleven'),      # at its stop, with a gap after it, a programme still counts
+    (12.5, 'One'),       # in the gap: the next one
+    (14, 'One'),
+    (15, None),          # after the last
+])
+def test_current_or_next(hours, title):
+    programme = sample_store().current_or_next('a', BASE + hours * 3600)
+    assert (programme.title if programme else None) == title
+
+def test_lookups():
+    store = sample_store()
+    assert len(store) == 2 and store.programme_count() == 4
+    assert 'a' in store and 'c' not in store
+    assert store.current_or_next('c', BASE) is None
+    assert titles(store.programmes_between('a', BASE + 10.5 * 3600, BASE + 13 * 3600)) == ['Ten', 'Eleven']
+    assert titles(store.programmes_between('a', BASE + 11.5 * 3600, BASE + 20 * 3600)) == ['Eleven', 'One']
+    assert store.programmes_between('a', BASE + 20 * 3600, BASE + 21 * 3600) == []
+    assert store.time_span(['a', 'b', 'c']) == (BASE + 9 * 3600, BASE + 14 * 3600)
+    assert store.time_span(['c']) is None
+    now = BASE + 11.5 * 3600
+    assert {cid: p.title for cid, p in store.now_playing(['a', 'b', 'a'], now).items()} == {'a': 'Eleven', 'b': 'Télé été ★'}
+
+def test_save_load_round_trip(tmp_path):
+    store = sample_store()
+    names = {'a': ['UK: Channel A'], 'b': ['Chaîne B']}
+    store.save(tmp_path, names, {'etag': '"v1"'})
+    loaded, loaded_names, meta = EPGStore.load(tmp_path)
+
+    assert loaded_names == names
+    assert meta['etag'] == '"v1"'
+    assert loaded.generation == store.generation
+    assert loaded.programme_count() == store.programme_count()
+    for hours in (9, 10.5, 11.5, 12.5, 15):
+        now = BASE + hours * 3600
+        for channel_id in ('a', 'b', 'c'):
+            assert loaded.current_or_next(channel_id, now) == store.current_or_next(channel_id, now)
+    assert loaded.programmes_between('a', BASE, BASE + 86400) == store.programmes_between('a', BASE, BASE + 86400)
+
+def test_save_replaces_the_previous_generation(tmp_path):
+    sample_store().save(tmp_path, {})
+    time.sleep(0.002)
+    store = sample_store()
+    store.save(tmp_path, {})
+    assert sorted(path.name for path in tmp_path.glob('*.bin')) == [
+        f"index-{store.generation}.bin", f"text-{store.generation}.bin"
+    ]
+    assert EPGStore.load(tmp_path)[0].generation == store.generation
+
+def test_load_without_cache(tmp_path):
+    assert EPGStore.load(tmp_path) is None
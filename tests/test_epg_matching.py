@@ -0,0 +1,37 @@
+from iptv_core.epg import EPGMatcher, parse_xmltv
+
+GUIDE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<tv>
+  <channel id="itv.uk"><display-name>UK: ITV</display-name></channel>
+  <channel id="de.ard"><display-name>DE: ARD</display-name></channel>
+  <channel id="bbc1.uk"><display-name>UK | BBC One HD</display-name></channel>
+  <channel id="sky1.uk"><display-name>Sky Sports 1</display-name></channel>
+  <channel id="sky2.uk"><display-name>Sky Sports 2</display-name></channel>
+</tv>
+"""
+
+def guide_matcher():
+    _, channel_id_to_names = parse_xmltv(GUIDE)
+    return EPGMatcher(channel_id_to_names)
+
+def test_display_names_are_kept_as_written():
+    _, channel_id_to_names = parse_xmltv(GUIDE)
+    assert channel_id_to_names['itv.uk'] == ['UK: ITV']
+    assert channel_id_to_names['bbc1.uk'] == ['UK | BBC One HD']
+
+def test_country_prefixed_names_on_both_sides():
+    matcher = guide_matcher()
+    assert matcher.match('UK: ITV') == 'itv.uk'
+    assert matcher.match('UK: ITV HD') == 'itv.uk'
+    assert matcher.match('DE: ARD') == 'de.ard'
+    assert matcher.match('UK: BBC 1 FHD') == 'bbc1.uk'
+
+def test_prefix_on_one_side_only():
+    matcher = guide_matcher()
+    assert matcher.match('ITV') == 'itv.uk'
+    assert matcher.match('UK: Sky Sports 1 HD') == 'sky1.uk'
+
+def test_numbers_must_agree():
+    matcher = guide_matcher()
+    assert matcher.match('Sky Sports 2') == 'sky2.uk'
+    assert matcher.match('Sky Sports 3') is None
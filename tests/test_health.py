@@ -0,0 +1,57 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from iptv_core.health import HealthCache, probe_streams
+
+@pytest.fixture
+def stream_server():
+    state = {'open': 0, 'requests': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.0'
+
+        def do_GET(self):
+            with lock:
+                state['open'] += 1
+                state['requests'] += 1
+            try:
+                time.sleep(0.3)
+                self.send_response(200)
+                self.send_header('Content-Length', '4')
+                self.end_headers()
+                self.wfile.write(b'\x47\x00\x00\x00')
+            finally:
+                with lock:
+                    state['open'] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+    server.server_close()
+
+def test_probes_every_stream(stream_server, tmp_path):
+    base, _ = stream_server
+    urls = [f"{base}/live/u/p/{n}.ts" for n in range(4)]
+    results = [result for batch in probe_streams(urls, HealthCache(tmp_path / 'health.json'), 2) for result in batch]
+    assert sorted(url for url, _ in results) == urls
+    assert {health.status for _, health in results} == {'ok'}
+
+def test_cancel_waits_for_running_probes(stream_server, tmp_path):
+    base, state = stream_server
+    urls = [f"{base}/live/u/p/{n}.ts" for n in range(20)]
+    cancelled = threading.Event()
+    checks = probe_streams(urls, HealthCache(tmp_path / 'health.json'), 2, cancelled=cancelled)
+    next(checks)
+    cancelled.set()
+    assert list(checks) == []
+    # Nothing is left connected once the generator has returned, and no probe started after the cancel
+    assert state['open'] == 0
+    assert state['requests'] <= 4
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from iptv_core.http_client import iter_json_array
+
+DOCUMENTS = [
+    [{"stream_id": 1, "name": "BBC One"}, {"stream_id": 2, "name": "Sky {News}", "tags": ["a", "b"]}],
+    [1, 2.5, -3, 4e10, 5.25E-3, 0, 0.5, 12345678901234567890],
+    [True, False, None, "x}", "é ü ★", [], {}, [1, [2]], {"a": {"b": 3}}],
+    [{"num": 1}, 1.5, "s", {"num": 2.75e3}, -0.125],
+]
+
+def decode(chunks):
+    return [item for items in iter_json_array(chunks) for item in items]
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_split_at_every_byte(document):
+    body = json.dumps(document, ensure_ascii=False).encode('utf-8')
+    for cut in range(len(body) + 1):
+        assert decode([body[:cut], body[cut:]]) == document, body[:cut]
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_one_byte_at_a_time(document):
+    body = json.dumps(document, ensure_ascii=False, indent=1).encode('utf-8')
+    assert decode([body[i:i + 1] for i in range(len(body))]) == document
+
+def test_number_cut_before_its_fraction():
+    assert decode([b'[1, 2.', b'5]']) == [1, 2.5]
+    assert decode([b'[1e', b'+3]']) == [1000.0]
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        decode([b'{"a": 1}'])
+
+def test_invalid_number_still_fails():
+    with pytest.raises(ValueError):
+        decode([b'[1.', b']'])
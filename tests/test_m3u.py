@@ -0,0 +1,79 @@
+import pytest
+
+from iptv_core.m3u import parse_attributes, parse_extinf, parse_m3u
+
+def parse_extinf_fallback(line):
+    """parse_extinf without its quote-split fast path: the parse_attributes scan alone."""
+    comma = line.find(',', 8)
+    space = line.find(' ', 8)
+    if space != -1 and (comma == -1 or space < comma):
+        attributes, comma = parse_attributes(line, space)
+    else:
+        attributes = {}
+    return attributes, line[comma + 1:].strip() if comma != -1 else ''
+
+EXTINF_LINES = [
+    (
+        '#EXTINF:-1 tvg-id="bbc1.uk" tvg-name="BBC One" tvg-logo="http://x/l.png" group-title="UK",BBC One HD',
+        {'tvg-id': 'bbc1.uk', 'tvg-name': 'BBC One', 'tvg-logo': 'http://x/l.png', 'group-title': 'UK'},
+        'BBC One HD',
+    ),
+    ('#EXTINF:-1 tvg-name="A" group-title="Films",Movie "Quoted" (2020)', {'tvg-name': 'A', 'group-title': 'Films'}, 'Movie "Quoted" (2020)'),
+    ('#EXTINF:-1 tvg-id="n" group-title="News, UK",Sky News, Live', {'tvg-id': 'n', 'group-title': 'News, UK'}, 'Sky News, Live'),
+    ('#EXTINF:-1 tvg-id=abc group-title="News",Plain Id', {'tvg-id': 'abc', 'group-title': 'News'}, 'Plain Id'),
+    ('#EXTINF:-1 tvg-id=abc group-title=News,Unquoted Both', {'tvg-id': 'abc', 'group-title': 'News'}, 'Unquoted Both'),
+    ('#EXTINF:0 TVG-ID="Up" Group-Title="Case" ,  Spaced Title  ', {'tvg-id': 'Up', 'group-title': 'Case'}, 'Spaced Title'),
+    ('#EXTINF:-1 tvg-id="" group-title="Empty",Empty Id', {'tvg-id': '', 'group-title': 'Empty'}, 'Empty Id'),
+    ('#EXTINF:-1,Just A Title', {}, 'Just A Title'),
+    ('#EXTINF:-1 group-title="No title"', {'group-title': 'No title'}, ''),
+]
+
+@pytest.mark.parametrize('line, attributes, title', EXTINF_LINES)
+def test_parse_extinf(line, attributes, title):
+    assert parse_extinf(line) == (attributes, title)
+    assert parse_extinf_fallback(line) == (attributes, title)
+
+PLAYLIST = (
+    '#EXTM3U url-tvg="http://guide/a.xml.gz,http://guide/b.xml" x-tvg-url="ignored"\r\n'
+    '#EXTINF:-1 tvg-id="BBC1.uk" tvg-name="BBC One" group-title="UK",BBC One\r\n'
+    'http://host/live/u/p/1.ts\r\n'
+    '\r\n'
+    '#EXTINF:-1 tvg-id="" group-title="Films, New",Movie "Quoted", Part 2\r\n'
+    'http://host/movie/u/p/2.mkv\r\n'
+    '#EXTINF:-1,Episode\r\n'
+    '#EXTGRP:Shows\r\n'
+    'http://host/series/u/p/3.mp4\r\n'
+    '#EXTINF:-1 tvg-id=plain group-title=Radio,Élan FM ★\r\n'
+    'http://radio/stream.m3u8?token=1\r\n'
+    'http://host/live/u/p/5.ts'
+)
+
+def records(playlist):
+    return {
+        tab_name: [(r.name, r.url, r.category_id, r.epg_channel_id, r.container_extension) for r in entries]
+        for tab_name, entries in playlist.entries.items()
+    }
+
+def test_parse_playlist():
+    playlist = parse_m3u(PLAYLIST)
+    assert playlist.epg_url == 'http://guide/a.xml.gz'
+    assert records(playlist) == {
+        'LIVE': [
+            ('BBC One', 'http://host/live/u/p/1.ts', 'UK', 'bbc1.uk', 'ts'),
+            ('Élan FM ★', 'http://radio/stream.m3u8?token=1', 'Radio', 'plain', 'm3u8'),
+            ('http://host/live/u/p/5.ts', 'http://host/live/u/p/5.ts', 'Uncategorized', None, 'ts'),
+        ],
+        'Movies': [('Movie "Quoted", Part 2', 'http://host/movie/u/p/2.mkv', 'Films, New', None, 'mkv')],
+        'Series': [('Episode', 'http://host/series/u/p/3.mp4', 'Shows', None, 'mp4')],
+    }
+    assert [group['category_name'] for group in playlist.groups['LIVE']] == ['UK', 'Radio', 'Uncategorized']
+
+def test_feed_split_at_every_position():
+    expected = records(parse_m3u(PLAYLIST))
+    for cut in range(len(PLAYLIST) + 1):
+        playlist = parse_m3u([PLAYLIST[:cut], PLAYLIST[cut:]])
+        assert records(playlist) == expected, cut
+        assert playlist.epg_url == 'http://guide/a.xml.gz'
+
+def test_feed_one_character_at_a_time():
+    assert records(parse_m3u(list(PLAYLIST))) == records(parse_m3u(PLAYLIST))
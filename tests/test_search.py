@@ -0,0 +1,49 @@
+import pytest
+
+from iptv_core.search import SearchIndex, fold_text
+
+LABELS = ['BBC One', 'Télé Été', 'TF1 HD', 'Das Erste', 'ÉTÉ Kids', 'Straße TV', 'ＢＢＣ Two']
+
+@pytest.mark.parametrize('text, folded', [
+    ('BBC One', 'bbc one'),
+    ('Télé ÉTÉ', 'tele ete'),
+    ('Straße', 'strasse'),
+    ('ＢＢＣ', 'bbc'),
+    ('', ''),
+])
+def test_fold_text(text, folded):
+    assert fold_text(text) == folded
+
+@pytest.mark.parametrize('query, positions', [
+    ('bbc', [0, 6]),
+    ('ete', [1, 4]),
+    ('ÉTÉ', [1, 4]),
+    ('  Tele  ', [1]),
+    ('strasse', [5]),
+    ('nothing', []),
+])
+def test_search(query, positions):
+    assert SearchIndex(LABELS).search(query) == positions
+
+def test_empty_query():
+    index = SearchIndex(LABELS)
+    assert index.search('') is None
+    assert index.search('   ') is None
+
+def test_extending_the_query_narrows_the_last_matches():
+    index = SearchIndex(LABELS)
+    assert index.search('t') == [1, 2, 3, 4, 5, 6]
+    # Only the previous matches are rescanned: a label that is not among them never comes back
+    index.labels[0] = 'te bbc'
+    assert index.search('te') == [1, 3, 4]
+    assert index.search('tel') == [1]
+    # A query that does not extend the last one scans every label again
+    assert index.search('te') == [0, 1, 3, 4]
+    assert index.search('') is None
+    assert index.search('bbc') == [0, 6]
+
+def test_typing_and_deleting_matches_fresh_searches():
+    index = SearchIndex(LABELS)
+    query = 'tele ete'
+    for end in list(range(1, len(query) + 1)) + list(range(len(query) - 1, 0, -1)):
+        assert index.search(query[:end]) == SearchIndex(LABELS).search(query[:end])
@@ -0,0 +1,30 @@
+import json
+
+from iptv_core import cache, tracing
+from iptv_core.tracing import Tracer
+
+def test_str_log_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, 'tracer', Tracer(enabled=False))
+    path = tmp_path / 'logs' / 'trace.jsonl'
+    tracing.configure_tracing(enabled=True, path=str(path))
+    with tracing.span('x') as fields:
+        fields['items'] = 3
+    tracing.tracer.close()
+    record = json.loads(path.read_text(encoding='utf-8'))
+    assert record['op'] == 'x' and record['items'] == 3
+
+def test_failed_log_write_does_not_break_the_span(tmp_path):
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('')
+    tracer = Tracer(path=blocker / 'trace.jsonl')
+    with tracer.span('x'):
+        pass
+    assert not tracer.enabled
+    assert tracer.summary()['x']['count'] == 1
+
+def test_log_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', tmp_path)
+    tracer = Tracer()
+    assert tracer.log_path() == tmp_path / 'trace.jsonl'
+    tracer.path = tmp_path / 'elsewhere.jsonl'
+    assert tracer.log_path() == tmp_path / 'elsewhere.jsonl'